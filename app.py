@@ -170,7 +170,9 @@ def list_services():
                     'health': 'GET /api/career/health',
                     'start_assessment': 'POST /api/career/start-assessment',
                     'submit_answers': 'POST /api/career/submit-answers',
-                    'get_recommendations': 'GET /api/career/recommendations/<session_id>'
+                    'get_recommendations': 'GET /api/career/recommendations/<session_id>',
+                    'match_careers': 'POST /api/career/careers/match',
+                    'analytics': 'GET /api/career/analytics'
                 }
             },
             'college_finder': {
@@ -179,6 +181,11 @@ def list_services():
                 'endpoints': {
                     'health': 'GET /api/college/health',
                     'search': 'GET /api/college/search',
+                    'suggest': 'GET /api/college/suggest',
+                    'fuzzy': 'GET /api/college/fuzzy',
+                    'degrees': 'GET /api/college/degrees',
+                    'by_degree': 'GET /api/college/degrees/<degree>',
+                    'nearby': 'GET /api/college/nearby',
                     'filter': 'POST /api/college/filter',
                     'statistics': 'GET /api/college/statistics'
                 }
@@ -189,7 +196,12 @@ def list_services():
                 'endpoints': {
                     'health': 'GET /api/course/health',
                     'recommend': 'POST /api/course/recommend',
-                    'search': 'GET /api/course/search'
+                    'recommend_batch': 'POST /api/course/recommend/batch',
+                    'search': 'GET /api/course/search',
+                    'suggest': 'GET /api/course/suggest',
+                    'nearby': 'GET /api/course/nearby',
+                    'professions': 'GET /api/course/professions',
+                    'by_profession': 'GET /api/course/professions/<profession>'
                 }
             },
             'news_recommender': {
@@ -197,8 +209,9 @@ def list_services():
                 'base_url': '/api/news',
                 'endpoints': {
                     'health': 'GET /api/news/health',
-                    'recommend': 'POST /api/news/recommend',
+                    'recommend': 'GET|POST /api/news/recommend',
                     'by_type': 'GET /api/news/news-by-type/<riasec_type>',
+                    'similar': 'GET /api/news/similar/<news_id>',
                     'search': 'GET /api/news/articles/search',
                     'all_articles': 'GET /api/news/articles',
                     'categories': 'GET /api/news/categories'
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Geo k-NN Benchmark
+Times GeoIndex nearest-k and within-radius lookups over synthetic points
+against a brute-force NumPy haversine scan, and checks both agree.
+
+Usage: python benchmarks/geo_knn.py [points] [queries]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.geo_index import GeoIndex, EARTH_RADIUS_KM
+
+# Jammu & Kashmir bounding box
+LATITUDE_RANGE = (32.2, 36.0)
+LONGITUDE_RANGE = (73.0, 80.5)
+K = 10
+RADIUS_KM = 25
+
+def brute_force_knn(points, latitude, longitude, k):
+    """Exact k nearest by haversine over every point"""
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(points[:, 0]), np.radians(points[:, 1])
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+    top = np.argpartition(distances, k - 1)[:k]
+    return top[np.argsort(distances[top])]
+
+def main():
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    rng = np.random.default_rng(42)
+
+    latitudes = rng.uniform(*LATITUDE_RANGE, n_points)
+    longitudes = rng.uniform(*LONGITUDE_RANGE, n_points)
+    queries = np.column_stack([rng.uniform(*LATITUDE_RANGE, n_queries), rng.uniform(*LONGITUDE_RANGE, n_queries)])
+
+    print(f"📍 Geo k-NN benchmark: {n_points:,} points, {n_queries:,} queries, k={K}")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    index = GeoIndex(range(n_points), latitudes, longitudes)
+    print(f"BallTree build:            {(time.perf_counter() - started) * 1000:10.1f} ms")
+
+    started = time.perf_counter()
+    tree_results = [[hit['item'] for hit in index.nearest(lat, lon, k=K)] for lat, lon in queries]
+    elapsed = time.perf_counter() - started
+    print(f"GeoIndex.nearest (k={K}):   {elapsed / n_queries * 1000:10.3f} ms/query")
+
+    started = time.perf_counter()
+    for lat, lon in queries:
+        index.nearest(lat, lon, k=K, radius_km=RADIUS_KM)
+    elapsed = time.perf_counter() - started
+    print(f"GeoIndex.nearest (r={RADIUS_KM}km): {elapsed / n_queries * 1000:10.3f} ms/query")
+
+    started = time.perf_counter()
+    brute_results = [list(brute_force_knn(index.points, lat, lon, K)) for lat, lon in queries]
+    elapsed = time.perf_counter() - started
+    print(f"Brute-force haversine:     {elapsed / n_queries * 1000:10.3f} ms/query")
+
+    # Equidistant neighbours may come back in either order, so compare as sets
+    agreement = np.mean([set(a) == set(b) for a, b in zip(tree_results, brute_results)])
+    print(f"Result agreement:          {agreement * 100:10.1f} %")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Query Plan Benchmark
+Compares the legacy unanchored $regex filters with the query builder's
+normalized-field filters: winning plan stages, keys/documents examined and
+server execution time, using explain("executionStats") against MONGODB_URI.
+
+Run after `python migrate_data.py` so the normalized fields and indexes exist.
+"""
+
+import os
+import sys
+import time
+from dotenv import load_dotenv
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database import init_database, get_collection, COLLECTIONS
+from services.query_builder import match_clause, any_field_clause
+
+def plan_stages(plan):
+    """Flatten the stage names of a winning plan"""
+    stages = [plan.get('stage')]
+    if 'inputStage' in plan:
+        stages.extend(plan_stages(plan['inputStage']))
+    for child in plan.get('inputStages', []):
+        stages.extend(plan_stages(child))
+    return [stage for stage in stages if stage]
+
+def explain(collection, query):
+    """Run a find through explain() and summarize it"""
+    started = time.perf_counter()
+    result = collection.database.command(
+        'explain', {'find': collection.name, 'filter': query}, verbosity='executionStats'
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    planner = result['queryPlanner']
+    stats = result['executionStats']
+    return {
+        'stages': ' > '.join(plan_stages(planner['winningPlan'])),
+        'keys_examined': stats['totalKeysExamined'],
+        'docs_examined': stats['totalDocsExamined'],
+        'returned': stats['nReturned'],
+        'server_ms': stats['executionTimeMillis'],
+        'round_trip_ms': round(elapsed_ms, 2)
+    }
+
+def legacy_regex(field, term):
+    return {field: {'$regex': term, '$options': 'i'}}
+
+# (label, collection key, legacy query, query builder query)
+CASES = [
+    ('college filter: district exact', 'colleges',
+     legacy_regex('District', 'Anantnag'),
+     match_clause('District', 'Anantnag', 'exact')),
+    ('college filter: college type exact', 'colleges',
+     legacy_regex('College_Type', 'Medical'),
+     match_clause('College_Type', 'Medical', 'exact')),
+    ('college search: name prefix', 'colleges',
+     legacy_regex('College_Name', 'Government Medical'),
+     match_clause('College_Name', 'Government Medical', 'prefix')),
+    ('college search: any field contains', 'colleges',
+     {'$or': [legacy_regex(f, 'baramulla') for f in ['College_Name', 'Location_City', 'District']]},
+     any_field_clause(['College_Name', 'Location_City', 'District'], 'baramulla', 'contains')),
+    ('course search: name prefix', 'courses',
+     legacy_regex('Course_Name', 'B.Tech'),
+     match_clause('Course_Name', 'B.Tech', 'prefix')),
+    ('news search: headline prefix', 'news_articles',
+     legacy_regex('Headline', 'J&K'),
+     match_clause('Headline', 'J&K', 'prefix')),
+    ('scholarship search: stream prefix', 'scholarships',
+     legacy_regex('eligibility_criteria.course_stream', 'Engineering'),
+     match_clause('eligibility_criteria.course_stream', 'Engineering', 'prefix')),
+]
+
+def main():
+    load_dotenv()
+    init_database()
+
+    print("📊 Query plan comparison: legacy $regex vs query builder")
+    print("=" * 100)
+    for label, collection_key, legacy_query, builder_query in CASES:
+        collection = get_collection(COLLECTIONS[collection_key])
+        print(f"\n{label}")
+        for name, query in (('legacy', legacy_query), ('builder', builder_query)):
+            summary = explain(collection, query)
+            print(
+                f"  {name:8} {summary['stages']:32} keys={summary['keys_examined']:<6} "
+                f"docs={summary['docs_examined']:<6} returned={summary['returned']:<5} "
+                f"server={summary['server_ms']}ms"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Caching Utilities
+In-process LRU cache and HTTP conditional response helpers
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Union
+
+from flask import current_app, request
+
+# Cache-Control values shared by cacheable endpoints
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+NO_STORE_CACHE_CONTROL = 'no-store'
+
+
+class LocalCache:
+    """Thread-safe in-process LRU cache with an optional time-to-live"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, stored_at = item
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def make_etag(body: Union[str, bytes]) -> str:
+    """Strong ETag value for a response body"""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def serialize_json(payload: Any) -> str:
+    """Serialize a payload exactly as jsonify would"""
+    return current_app.json.dumps(payload)
+
+
+def cached_json_response(body: str, etag: str, cache_control: str = IMMUTABLE_CACHE_CONTROL):
+    """Build a JSON response with ETag/Cache-Control, answering If-None-Match with 304"""
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response.make_conditional(request)
@@ -82,8 +82,14 @@ mongodb = None
 COLLECTIONS = {
     'career_sessions': 'career_sessions',
     'career_answers': 'career_answers',
+    'career_results': 'career_results',
+    'career_rollups': 'career_rollups',
     'colleges': 'colleges',
+    'content_indexes': 'content_indexes',
+    'content_index_chunks': 'content_index_chunks',
     'courses': 'courses',
+    'data_versions': 'data_versions',
+    'materialized_views': 'materialized_views',
     'news_articles': 'news_articles',
     'scholarships': 'scholarships',
     'users': 'users'
@@ -14,6 +14,9 @@ from dotenv import load_dotenv
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from database import get_collection, COLLECTIONS, init_database
+from services.query_builder import add_search_fields, ensure_search_indexes, backfill_search_fields
+from services.data_version import bump_data_version
+from services.keyword_matcher import add_keyword_traits, backfill_keyword_traits
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -44,17 +47,14 @@ def migrate_college_data():
             # Continue with migration
         
         # Load and migrate data
+        from services.college_finder import COLLEGES_DATASET, prepare_college_documents
         df = pd.read_csv(csv_path)
-        colleges = df.to_dict('records')
-        
-        # Add metadata
-        for college in colleges:
-            college['created_at'] = pd.Timestamp.now()
-            college['updated_at'] = pd.Timestamp.now()
+        colleges = prepare_college_documents(df)
         
         if len(colleges) > 0:
             collection.insert_many(colleges)
             logger.info(f"Migrated {len(colleges)} colleges to MongoDB")
+            bump_data_version(COLLEGES_DATASET)
             return True
         
     except Exception as e:
@@ -90,13 +90,13 @@ def migrate_course_data():
         courses = df.to_dict('records')
         
         # Add metadata
-        for course in courses:
-            course['created_at'] = pd.Timestamp.now()
-            course['updated_at'] = pd.Timestamp.now()
+        from services.course_suggestion import COURSES_DATASET, prepare_course_document
+        courses = [prepare_course_document(course) for course in courses]
         
         if len(courses) > 0:
             collection.insert_many(courses)
             logger.info(f"Migrated {len(courses)} courses to MongoDB")
+            bump_data_version(COURSES_DATASET)
             return True
         
     except Exception as e:
@@ -132,15 +132,19 @@ def migrate_news_data():
         articles = df.to_dict('records')
         
         # Add metadata
+        from services.news_recommender import NEWS_DATASET, prepare_news_document, build_news_index
         for article in articles:
             article['created_at'] = pd.Timestamp.now()
             article['updated_at'] = pd.Timestamp.now()
             article['views'] = 0
             article['likes'] = 0
+            prepare_news_document(article)
         
         if len(articles) > 0:
             collection.insert_many(articles)
             logger.info(f"Migrated {len(articles)} news articles to MongoDB")
+            bump_data_version(NEWS_DATASET)
+            build_news_index()
             return True
         
     except Exception as e:
@@ -180,21 +184,83 @@ def migrate_scholarship_data():
             scholarships = [scholarships]
         
         # Add metadata
+        from services.scholarship import (
+            SCHOLARSHIP_SEARCH_FIELDS, SCHOLARSHIP_KEYWORD_MATCHER, SCHOLARSHIP_KEYWORD_FIELD, SCHOLARSHIPS_DATASET
+        )
         for scholarship in scholarships:
             scholarship['created_at'] = pd.Timestamp.now()
             scholarship['updated_at'] = pd.Timestamp.now()
             scholarship['views'] = 0
             scholarship['applications'] = 0
+            add_search_fields(scholarship, SCHOLARSHIP_SEARCH_FIELDS.values())
+            add_keyword_traits(scholarship, SCHOLARSHIP_KEYWORD_MATCHER, SCHOLARSHIP_KEYWORD_FIELD)
         
         if len(scholarships) > 0:
             collection.insert_many(scholarships)
             logger.info(f"Migrated {len(scholarships)} scholarships to MongoDB")
+            bump_data_version(SCHOLARSHIPS_DATASET)
             return True
         
     except Exception as e:
         logger.error(f"Error migrating scholarship data: {e}")
         return False
 
+def searchable_fields():
+    """Normalized search fields per collection"""
+    from services.college_finder import COLLEGE_NORMALIZED_FIELDS
+    from services.course_suggestion import COURSE_NORMALIZED_FIELDS
+    from services.news_recommender import NEWS_SEARCH_FIELDS
+    from services.scholarship import SCHOLARSHIP_SEARCH_FIELDS
+    
+    return {
+        'colleges': COLLEGE_NORMALIZED_FIELDS,
+        'courses': COURSE_NORMALIZED_FIELDS,
+        'news_articles': NEWS_SEARCH_FIELDS,
+        'scholarships': list(SCHOLARSHIP_SEARCH_FIELDS.values())
+    }
+
+def backfill_search_data():
+    """Add normalized search fields, keyword traits and derived fields to documents loaded before they existed"""
+    try:
+        from services.college_finder import backfill_college_fields
+        from services.course_suggestion import COURSES_DATASET, COURSE_KEYWORD_MATCHER, backfill_course_fields
+        from services.news_recommender import backfill_news_fields
+        from services.scholarship import SCHOLARSHIP_KEYWORD_MATCHER, SCHOLARSHIP_KEYWORD_FIELD, SCHOLARSHIPS_DATASET
+        
+        logger.info("Backfilling normalized search fields...")
+        for collection_key, fields in searchable_fields().items():
+            backfill_search_fields(get_collection(COLLECTIONS[collection_key]), fields)
+        backfill_college_fields()
+        backfill_course_fields()
+        backfill_news_fields()
+        
+        logger.info("Backfilling RIASEC keyword traits...")
+        backfill_keyword_traits(get_collection(COLLECTIONS['courses']), COURSE_KEYWORD_MATCHER, 'Course_Name')
+        backfill_keyword_traits(
+            get_collection(COLLECTIONS['scholarships']), SCHOLARSHIP_KEYWORD_MATCHER, SCHOLARSHIP_KEYWORD_FIELD
+        )
+        bump_data_version(COURSES_DATASET)
+        bump_data_version(SCHOLARSHIPS_DATASET)
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error backfilling search fields: {e}")
+        return False
+
+def link_course_data():
+    """Resolve course rows to college ids and denormalize them onto colleges"""
+    try:
+        from services.college_linker import link_courses_to_colleges
+        
+        result = link_courses_to_colleges()
+        for name, resolution in sorted(result['resolutions'].items()):
+            logger.info(f"  {name} -> {resolution['college_id']} ({resolution['method']})")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error linking courses to colleges: {e}")
+        return False
+
 def create_indexes():
     """Create database indexes for better performance"""
     try:
@@ -209,6 +275,18 @@ def create_indexes():
         colleges.create_index("state")
         colleges.create_index("course_type")
         
+        # Fee range overlap filters
+        from services.college_finder import ensure_college_indexes
+        ensure_college_indexes()
+        
+        # Trait-indexed course candidate retrieval
+        from services.course_suggestion import ensure_course_indexes
+        ensure_course_indexes()
+        
+        # College locations and course -> college references
+        from services.college_linker import ensure_link_indexes
+        ensure_link_indexes()
+        
         # Course indexes
         courses = get_collection(COLLECTIONS['courses'])
         courses.create_index("course_name")
@@ -226,12 +304,20 @@ def create_indexes():
         scholarships.create_index("field")
         scholarships.create_index("location")
         
+        # Normalized search field indexes used by the query builder
+        for collection_key, fields in searchable_fields().items():
+            ensure_search_indexes(get_collection(COLLECTIONS[collection_key]), fields)
+        
         # Career session indexes
         sessions = get_collection(COLLECTIONS['career_sessions'])
         sessions.create_index("session_id")
         sessions.create_index("user_id")
         sessions.create_index("created_at")
         
+        # Career rollup indexes
+        rollups = get_collection(COLLECTIONS['career_rollups'])
+        rollups.create_index([("dimension", 1), ("value", 1), ("day", 1)])
+        
         logger.info("Database indexes created successfully")
         return True
         
@@ -294,6 +380,20 @@ def main():
         else:
             print(f"❌ {name} migration failed")
     
+    # Backfill normalized search fields for data loaded by older versions
+    print(f"\n🔤 Backfilling search fields...")
+    if backfill_search_data():
+        print("✅ Search fields backfilled")
+    else:
+        print("❌ Search field backfill failed")
+    
+    # Link course rows to colleges (coordinates and course lists on colleges)
+    print(f"\n🔗 Linking courses to colleges...")
+    if link_course_data():
+        print("✅ Courses linked to colleges")
+    else:
+        print("❌ Course linking failed")
+    
     # Create indexes
     print(f"\n🔍 Creating database indexes...")
     if create_indexes():
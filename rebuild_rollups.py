@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Career Rollup Rebuild Script
+Recomputes the career analytics rollups from completed sessions
+"""
+
+import os
+import sys
+import logging
+from dotenv import load_dotenv
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import init_database
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    """Rebuild all career rollups"""
+    print("🔁 Rebuilding career analytics rollups")
+    print("=" * 50)
+    
+    # Load environment variables
+    load_dotenv()
+    
+    # Initialize database
+    init_database()
+    
+    from services.career_analytics import rebuild_rollups
+    
+    try:
+        written = rebuild_rollups()
+        print(f"✅ Rebuilt {written} rollup documents")
+    except Exception as e:
+        logger.error(f"Rollup rebuild failed: {e}")
+        print("❌ Rollup rebuild failed. Check the logs above.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
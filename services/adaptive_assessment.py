@@ -0,0 +1,111 @@
+"""
+Adaptive Assessment
+Item selection and early stopping for the RIASEC assessment
+"""
+
+import math
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from services.question_bank import QuestionBank, RIASEC_TYPES, scores_to_dict
+
+DEFAULT_CONFIDENCE = 0.9
+DEFAULT_MIN_ITEMS_PER_TRAIT = 2
+
+# Prior on the per-trait response variance; a uniform answer on a 1-5 scale has variance 2.
+# It keeps the standard error honest while only one or two items per trait have been seen.
+PRIOR_VARIANCE = 2.0
+
+
+def adaptive_settings(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate adaptive options from a start-test request body"""
+    confidence = float(data.get('confidence', DEFAULT_CONFIDENCE))
+    min_items = int(data.get('min_items_per_trait', DEFAULT_MIN_ITEMS_PER_TRAIT))
+    if not 0.5 <= confidence < 1.0:
+        raise ValueError('confidence must be between 0.5 and 1.0')
+    if min_items < 1:
+        raise ValueError('min_items_per_trait must be at least 1')
+    return {'confidence': confidence, 'min_items_per_trait': min_items}
+
+
+def trait_estimates(bank: QuestionBank, responses: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-trait mean response, answered loading and response variance"""
+    answered = responses > 0
+    loads = np.abs(bank.weights) * answered[:, None]
+    load_totals = loads.sum(axis=0)
+
+    effective = np.where(answered & bank.reverse, (bank.scale_min + bank.scale_max) - responses, responses)
+    safe_totals = np.where(load_totals > 0, load_totals, 1.0)
+    neutral = (bank.scale_min + bank.scale_max) / 2.0
+    means = np.where(load_totals > 0, (effective @ loads) / safe_totals, neutral)
+
+    squared_dev = (effective[:, None] - means[None, :]) ** 2
+    variances = ((loads * squared_dev).sum(axis=0) + PRIOR_VARIANCE) / (load_totals + 1.0)
+    return means, load_totals, variances
+
+
+def projected_scores(bank: QuestionBank, responses: np.ndarray) -> Dict[str, float]:
+    """Scale per-trait means to full-length test scores so results stay comparable"""
+    means, _, _ = trait_estimates(bank, responses)
+    full_loads = np.abs(bank.weights).sum(axis=0)
+    return scores_to_dict(means * full_loads)
+
+
+def separation_confidence(bank: QuestionBank, responses: np.ndarray) -> float:
+    """Probability that the leading trait is truly ahead of the runner-up"""
+    means, loads, variances = trait_estimates(bank, responses)
+    if np.any(loads == 0):
+        return 0.0
+
+    top, second = np.argsort(-means)[:2]
+    standard_error = math.sqrt(variances[top] / loads[top] + variances[second] / loads[second])
+    z = (means[top] - means[second]) / standard_error
+    return 0.5 * (1.0 + math.erf(z / math.sqrt(2.0)))
+
+
+def next_question(bank: QuestionBank, responses: np.ndarray, settings: Dict[str, Any]) -> Optional[int]:
+    """Pick the most informative unanswered question, or None when the bank is exhausted.
+
+    Until every trait has ``min_items_per_trait`` loading, the least covered trait
+    is sampled. After that the item that most reduces the variance of the
+    top-vs-second difference is chosen.
+    """
+    unanswered = np.flatnonzero(responses == 0)
+    if unanswered.size == 0:
+        return None
+
+    means, loads, variances = trait_estimates(bank, responses)
+    candidate_loads = np.abs(bank.weights[unanswered])
+
+    under_covered = loads < settings['min_items_per_trait']
+    if np.any(under_covered):
+        # Coverage phase: favour items loading on the least covered traits
+        deficit = np.where(under_covered, settings['min_items_per_trait'] - loads, 0.0)
+        gains = candidate_loads @ deficit
+    else:
+        top, second = np.argsort(-means)[:2]
+        gains = np.zeros(unanswered.size)
+        for trait in (top, second):
+            gains += variances[trait] * (1.0 / loads[trait] - 1.0 / (loads[trait] + candidate_loads[:, trait]))
+
+    return int(unanswered[int(np.argmax(gains))])
+
+
+def should_stop(bank: QuestionBank, responses: np.ndarray, settings: Dict[str, Any]) -> bool:
+    """Whether the dominant type is separated from the runner-up with enough confidence"""
+    _, loads, _ = trait_estimates(bank, responses)
+    if np.any(loads < settings['min_items_per_trait']):
+        return False
+    return separation_confidence(bank, responses) >= settings['confidence']
+
+
+def describe_progress(bank: QuestionBank, responses: np.ndarray) -> Dict[str, Any]:
+    """Adaptive progress summary returned alongside answers"""
+    means, _, _ = trait_estimates(bank, responses)
+    leading = np.argsort(-means)[:2]
+    return {
+        'questions_answered': int(np.count_nonzero(responses)),
+        'leading_types': [RIASEC_TYPES[i] for i in leading],
+        'confidence': round(separation_confidence(bank, responses), 4)
+    }
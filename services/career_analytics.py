@@ -0,0 +1,206 @@
+"""
+Career Analytics
+Incrementally maintained RIASEC rollups by day and cohort tag
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+
+from database import get_collection, COLLECTIONS
+from services.question_bank import RIASEC_TYPES
+
+logger = logging.getLogger(__name__)
+
+# Session tags that get their own rollup series
+TAG_DIMENSIONS = ['school', 'cohort']
+DAY_FORMAT = '%Y-%m-%d'
+
+
+def session_tags(data: Dict[str, Any]) -> Dict[str, str]:
+    """Extract cohort tags from a start-test request body"""
+    tags = {}
+    for dimension in TAG_DIMENSIONS:
+        value = data.get(dimension)
+        if isinstance(value, str) and value.strip():
+            tags[dimension] = value.strip()
+    return tags
+
+
+def rollup_keys(tags: Dict[str, str]) -> List[Tuple[str, Any]]:
+    """(dimension, value) pairs a session contributes to; a school/cohort pair is keyed by both fields"""
+    keys = [('all', 'all')]
+    for dimension in TAG_DIMENSIONS:
+        if tags.get(dimension):
+            keys.append((dimension, tags[dimension]))
+    if tags.get('school') and tags.get('cohort'):
+        keys.append(('school_cohort', school_cohort_value(tags['school'], tags['cohort'])))
+    return keys
+
+
+def school_cohort_value(school: str, cohort: str) -> Dict[str, str]:
+    """Rollup value of a school/cohort pair"""
+    return {'school': school, 'cohort': cohort}
+
+
+def _rollup_id(dimension: str, value: Any, day: str) -> Dict[str, Any]:
+    return {'dimension': dimension, 'value': value, 'day': day}
+
+
+def _increments(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Counters one completed session adds to each of its rollups"""
+    increments = {'sessions': 1, f"dominant.{results['dominant_type']}": 1}
+    for trait in RIASEC_TYPES:
+        increments[f'score_sums.{trait}'] = results['riasec_scores'].get(trait, 0)
+    return increments
+
+
+def record_completed_session(session: Dict[str, Any]) -> None:
+    """Fold a newly completed session into its day/tag rollups"""
+    results = session['results']
+    day = results['completed_at'].strftime(DAY_FORMAT)
+    increments = _increments(results)
+
+    operations = [
+        UpdateOne(
+            {'_id': _rollup_id(dimension, value, day)},
+            {
+                '$inc': increments,
+                '$setOnInsert': {'dimension': dimension, 'value': value, 'day': day}
+            },
+            upsert=True
+        )
+        for dimension, value in rollup_keys(session.get('tags', {}))
+    ]
+    get_collection(COLLECTIONS['career_rollups']).bulk_write(operations, ordered=False)
+
+
+def query_rollups(dimension: str, value: Any, start_day: Optional[str] = None,
+                  end_day: Optional[str] = None) -> Dict[str, Any]:
+    """Merge the daily rollups of one cohort into a distribution summary"""
+    query = {'dimension': dimension, 'value': value}
+    day_range = {}
+    if start_day:
+        day_range['$gte'] = start_day
+    if end_day:
+        day_range['$lte'] = end_day
+    if day_range:
+        query['day'] = day_range
+
+    rollups = get_collection(COLLECTIONS['career_rollups']).find(query, {'_id': 0}).sort('day', 1)
+
+    total_sessions = 0
+    dominant = defaultdict(int)
+    score_sums = defaultdict(float)
+    daily = []
+    for rollup in rollups:
+        total_sessions += rollup.get('sessions', 0)
+        for trait, count in rollup.get('dominant', {}).items():
+            dominant[trait] += count
+        for trait, total in rollup.get('score_sums', {}).items():
+            score_sums[trait] += total
+        daily.append({
+            'day': rollup['day'],
+            'sessions': rollup.get('sessions', 0),
+            'dominant_types': rollup.get('dominant', {})
+        })
+
+    distribution = {}
+    average_scores = {}
+    for trait in RIASEC_TYPES:
+        distribution[trait] = {
+            'count': dominant[trait],
+            'percentage': round(dominant[trait] / total_sessions * 100, 2) if total_sessions else 0
+        }
+        average_scores[trait] = round(score_sums[trait] / total_sessions, 2) if total_sessions else 0
+
+    return {
+        'dimension': dimension,
+        'value': value,
+        'start_day': start_day,
+        'end_day': end_day,
+        'total_sessions': total_sessions,
+        'dominant_distribution': distribution,
+        'average_scores': average_scores,
+        'daily': daily
+    }
+
+
+def _rebuild_pipeline(dimension: str, cutoff: datetime) -> List[Dict[str, Any]]:
+    """Aggregation that recomputes one dimension's rollups from sessions completed before ``cutoff``"""
+    value = 'all' if dimension == 'all' else f'$tags.{dimension}'
+    match = {'completed': True, 'results.completed_at': {'$lt': cutoff}}
+    if dimension == 'school_cohort':
+        match.update({'tags.school': {'$exists': True}, 'tags.cohort': {'$exists': True}})
+        value = school_cohort_value('$tags.school', '$tags.cohort')
+    elif dimension != 'all':
+        match[f'tags.{dimension}'] = {'$exists': True}
+
+    group = {
+        '_id': {
+            'value': value,
+            'day': {'$dateToString': {'format': DAY_FORMAT, 'date': '$results.completed_at'}}
+        },
+        'sessions': {'$sum': 1}
+    }
+    for trait in RIASEC_TYPES:
+        group[f'dominant_{trait}'] = {'$sum': {'$cond': [{'$eq': ['$results.dominant_type', trait]}, 1, 0]}}
+        group[f'score_{trait}'] = {'$sum': f'$results.riasec_scores.{trait}'}
+
+    return [{'$match': match}, {'$group': group}]
+
+
+def rebuild_rollups() -> int:
+    """Recompute every rollup document from scratch; returns the number written"""
+    sessions_collection = get_collection(COLLECTIONS['career_sessions'])
+    cutoff = datetime.utcnow()
+    documents = []
+    for dimension in ['all'] + TAG_DIMENSIONS + ['school_cohort']:
+        for row in sessions_collection.aggregate(_rebuild_pipeline(dimension, cutoff), allowDiskUse=True):
+            value, day = row['_id']['value'], row['_id']['day']
+            documents.append({
+                '_id': _rollup_id(dimension, value, day),
+                'dimension': dimension,
+                'value': value,
+                'day': day,
+                'sessions': row['sessions'],
+                'dominant': {t: row[f'dominant_{t}'] for t in RIASEC_TYPES if row[f'dominant_{t}']},
+                'score_sums': {t: row[f'score_{t}'] for t in RIASEC_TYPES},
+                'rebuilt_at': cutoff
+            })
+
+    # Build into a staging collection and swap it in, so readers never see a partial set
+    rollups_collection = get_collection(COLLECTIONS['career_rollups'])
+    if documents:
+        staging = rollups_collection.database[f'{rollups_collection.name}_staging']
+        staging.drop()
+        staging.insert_many(documents)
+        ensure_rollup_indexes(staging)
+        staging.rename(rollups_collection.name, dropTarget=True)
+    else:
+        rollups_collection.delete_many({})
+        ensure_rollup_indexes()
+    swapped_at = datetime.utcnow()
+
+    # Sessions completed during the rebuild incremented the replaced collection; fold them in again.
+    # Sessions completed after the swap increment the new collection themselves.
+    replayed = 0
+    for session in sessions_collection.find(
+        {'completed': True, 'results.completed_at': {'$gte': cutoff, '$lt': swapped_at}},
+        {'results': 1, 'tags': 1}
+    ):
+        record_completed_session(session)
+        replayed += 1
+    logger.info(f"Rebuilt {len(documents)} career rollup documents and replayed {replayed} sessions")
+    return len(documents)
+
+
+def ensure_rollup_indexes(collection: Optional[Collection] = None) -> None:
+    """Index used by dashboard range reads"""
+    if collection is None:
+        collection = get_collection(COLLECTIONS['career_rollups'])
+    collection.create_index([('dimension', 1), ('value', 1), ('day', 1)])
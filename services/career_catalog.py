@@ -0,0 +1,102 @@
+"""
+Career Catalog
+Occupations with RIASEC interest profiles and a precomputed similarity index
+"""
+
+import csv
+import logging
+import os
+import threading
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from services.question_bank import RIASEC_TYPES, scores_to_vector
+
+logger = logging.getLogger(__name__)
+
+CAREER_CATALOG_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'career_catalog.csv')
+DEFAULT_TOP_K = 10
+
+
+class CareerCatalog:
+    """Occupation profiles indexed for nearest-neighbour matching.
+
+    Every profile is centred and L2-normalised at load time, so matching a
+    student is one (n x 6) @ (6,) product giving the Pearson correlation
+    between the student's scores and each occupation's interest profile.
+    """
+
+    def __init__(self, careers: List[str], profiles: np.ndarray):
+        if len(careers) != len(profiles):
+            raise ValueError("Career names and profiles must have the same length")
+        self.careers = careers
+        self.profiles = np.asarray(profiles, dtype=np.float64)
+        self.holland_codes = [
+            ''.join(RIASEC_TYPES[i][0].upper() for i in np.argsort(-row, kind='stable')[:3])
+            for row in self.profiles
+        ]
+        self.index = np.ascontiguousarray(_center_and_normalize(self.profiles), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.careers)
+
+    def match(self, scores: Dict[str, Any], top_k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+        """Top-k occupations by profile similarity to a trait score mapping"""
+        query = _center_and_normalize(scores_to_vector(scores)[None, :])[0].astype(np.float32)
+        if not query.any() or len(self.careers) == 0:
+            return []
+
+        similarities = self.index @ query
+        k = max(1, min(int(top_k), len(self.careers)))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top], kind='stable')]
+
+        return [
+            {
+                'career': self.careers[i],
+                'holland_code': self.holland_codes[i],
+                'similarity': round(float(similarities[i]), 4)
+            }
+            for i in top
+        ]
+
+
+def _center_and_normalize(matrix: np.ndarray) -> np.ndarray:
+    """Centre each row on its mean and scale it to unit length (flat rows become zero)"""
+    centered = matrix - matrix.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(centered, axis=1, keepdims=True)
+    return np.divide(centered, norms, out=np.zeros_like(centered), where=norms > 1e-9)
+
+
+_catalog: Optional[CareerCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def load_career_catalog(path: str = CAREER_CATALOG_PATH) -> CareerCatalog:
+    """Load occupation profiles from CSV and build the similarity index"""
+    global _catalog
+    careers = []
+    profiles = []
+    with open(path, 'r') as f:
+        for row in csv.DictReader(f):
+            careers.append(row['Career'].strip())
+            profiles.append([float(row[trait.capitalize()]) for trait in RIASEC_TYPES])
+
+    catalog = CareerCatalog(careers, np.array(profiles).reshape(-1, len(RIASEC_TYPES)))
+    with _catalog_lock:
+        _catalog = catalog
+    logger.info(f"Loaded career catalog with {len(catalog)} occupations")
+    return catalog
+
+
+def get_career_catalog() -> CareerCatalog:
+    """Get the loaded career catalog, loading it on first use"""
+    if _catalog is None:
+        load_career_catalog()
+    return _catalog
+
+
+def match_careers(scores: Dict[str, Any], top_k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+    """Match trait scores against the career catalog"""
+    return get_career_catalog().match(scores, top_k)
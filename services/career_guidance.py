@@ -7,50 +7,127 @@ from flask import Blueprint, request, jsonify
 import uuid
 import logging
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from urllib.parse import quote
 from database import get_collection, COLLECTIONS
+from cache import (
+    LocalCache, make_etag, serialize_json, cached_json_response, NO_STORE_CACHE_CONTROL
+)
+from services.question_bank import (
+    QuestionBank, RIASEC_TYPES, DEFAULT_BANK_VERSION, LEGACY_BANK_VERSION,
+    get_question_bank, available_versions
+)
+from services.career_catalog import get_career_catalog, match_careers
+from services.course_suggestion import profession_course_counts
+from services.career_analytics import (
+    session_tags, record_completed_session, query_rollups, school_cohort_value
+)
+from services.adaptive_assessment import (
+    adaptive_settings, next_question, should_stop, projected_scores, describe_progress
+)
 
 logger = logging.getLogger(__name__)
 
 career_guidance_bp = Blueprint('career_guidance', __name__)
 
-# RIASEC Questions Database (24 questions)
-QUESTIONS = [
-    {"question": "I enjoy working with my hands to build or repair things.", "riasec_type": "realistic"},
-    {"question": "I like to analyze data and solve complex problems.", "riasec_type": "investigative"},
-    {"question": "I enjoy creating original artwork or creative writing.", "riasec_type": "artistic"},
-    {"question": "I like to help others and work in teams.", "riasec_type": "social"},
-    {"question": "I enjoy leading projects and convincing others.", "riasec_type": "enterprising"},
-    {"question": "I prefer organized, structured work environments.", "riasec_type": "conventional"},
-    {"question": "I like working outdoors and with animals.", "riasec_type": "realistic"},
-    {"question": "I enjoy conducting research and experiments.", "riasec_type": "investigative"},
-    {"question": "I like to write stories, poems, or music.", "riasec_type": "artistic"},
-    {"question": "I enjoy teaching and mentoring others.", "riasec_type": "social"},
-    {"question": "I like to start new businesses or projects.", "riasec_type": "enterprising"},
-    {"question": "I prefer following clear procedures and guidelines.", "riasec_type": "conventional"},
-    {"question": "I enjoy physical activities and sports.", "riasec_type": "realistic"},
-    {"question": "I like to study scientific concepts and theories.", "riasec_type": "investigative"},
-    {"question": "I enjoy photography and visual design.", "riasec_type": "artistic"},
-    {"question": "I like to volunteer for community service.", "riasec_type": "social"},
-    {"question": "I enjoy sales and business negotiations.", "riasec_type": "enterprising"},
-    {"question": "I prefer working with numbers and data entry.", "riasec_type": "conventional"},
-    {"question": "I like to work with tools and machinery.", "riasec_type": "realistic"},
-    {"question": "I enjoy laboratory work and scientific analysis.", "riasec_type": "investigative"},
-    {"question": "I like to perform in front of audiences.", "riasec_type": "artistic"},
-    {"question": "I enjoy counseling and helping people with problems.", "riasec_type": "social"},
-    {"question": "I like to manage teams and coordinate projects.", "riasec_type": "enterprising"},
-    {"question": "I prefer organized filing and record keeping.", "riasec_type": "conventional"}
-]
+# Number of catalog matches stored with results
+CAREER_MATCH_COUNT = 7
 
-# Career recommendations based on RIASEC types
-CAREER_RECOMMENDATIONS = {
-    'realistic': ['Engineer', 'Carpenter', 'Mechanic', 'Farmer', 'Pilot', 'Electrician', 'Plumber'],
-    'investigative': ['Scientist', 'Doctor', 'Researcher', 'Analyst', 'Psychologist', 'Chemist', 'Programmer'],
-    'artistic': ['Artist', 'Writer', 'Designer', 'Musician', 'Actor', 'Photographer', 'Architect'],
-    'social': ['Teacher', 'Counselor', 'Social Worker', 'Nurse', 'Therapist', 'Coach', 'Librarian'],
-    'enterprising': ['Manager', 'Salesperson', 'Lawyer', 'Entrepreneur', 'Marketing Director', 'CEO', 'Banker'],
-    'conventional': ['Accountant', 'Administrator', 'Secretary', 'Bookkeeper', 'Data Analyst', 'Clerk', 'Auditor']
-}
+# Completed results never change, so they are cached per worker and shared
+# across workers through the career_results collection
+_results_cache = LocalCache(maxsize=4096)
+
+def _session_bank(session: Dict[str, Any]) -> QuestionBank:
+    """Get the question bank version a session is pinned to"""
+    return get_question_bank(session.get('question_bank_version', LEGACY_BANK_VERSION))
+
+def _current_question_index(session: Dict[str, Any]) -> Optional[int]:
+    """Bank index of the question the session should answer next (None when finished)"""
+    if session.get('mode') == 'adaptive':
+        return session.get('next_question_index')
+    return session['current_question']
+
+def _is_stale_answer(data: Dict[str, Any], session: Dict[str, Any], bank: QuestionBank,
+                     question_index: Optional[int]) -> bool:
+    """Whether an answer names a question_number or question_id other than the session's current question"""
+    question_number = data.get('question_number')
+    if question_number is not None and question_number != session['current_question'] + 1:
+        return True
+    question_id = data.get('question_id')
+    if question_id is None:
+        return False
+    if session['completed'] or question_index is None or question_index >= len(bank):
+        return True
+    return question_id != bank.questions[question_index]['id']
+
+def _cache_completed_results(session: Dict[str, Any]) -> Dict[str, str]:
+    """Serialize a completed session's results once and store them in both cache tiers"""
+    body = serialize_json({
+        'success': True,
+        'session_id': session['session_id'],
+        'results': session['results'],
+        'answers': session['answers'],
+        'message': 'Results retrieved successfully'
+    })
+    entry = {'body': body, 'etag': make_etag(body)}
+    _results_cache.set(session['session_id'], entry)
+    
+    try:
+        results_collection = get_collection(COLLECTIONS['career_results'])
+        results_collection.replace_one(
+            {'_id': session['session_id']},
+            {**entry, 'created_at': datetime.utcnow()},
+            upsert=True
+        )
+    except Exception as e:
+        logger.warning(f"Could not store cached results for {session['session_id']}: {e}")
+    
+    return entry
+
+def _get_shared_results(session_id: str) -> Optional[Dict[str, str]]:
+    """Look up serialized results of a completed session in the shared collection"""
+    try:
+        results_collection = get_collection(COLLECTIONS['career_results'])
+        document = results_collection.find_one({'_id': session_id}, {'body': 1, 'etag': 1})
+    except Exception as e:
+        logger.warning(f"Could not read cached results for {session_id}: {e}")
+        return None
+    
+    if document is None:
+        return None
+    entry = {'body': document['body'], 'etag': document['etag']}
+    _results_cache.set(session_id, entry)
+    return entry
+
+def _build_results(bank: QuestionBank, scores: Dict[str, float]) -> Dict[str, Any]:
+    """Build the final results document from trait scores"""
+    total_score = sum(scores.values())
+    percentages = {}
+    if total_score > 0:
+        percentages = {k: round((v / total_score) * 100, 2) for k, v in scores.items()}
+    
+    dominant_type = max(scores, key=scores.get)
+    
+    # Match the full score profile against the occupation catalog; the bank's
+    # per-type list is only a fallback when the catalog cannot be loaded
+    try:
+        career_matches = match_careers(scores, CAREER_MATCH_COUNT)
+    except Exception as e:
+        logger.warning(f"Career catalog matching failed: {e}")
+        career_matches = []
+    recommendations = [match['career'] for match in career_matches]
+    if not recommendations:
+        recommendations = bank.career_recommendations.get(dominant_type, [])
+    
+    return {
+        'riasec_scores': scores,
+        'percentages': percentages,
+        'dominant_type': dominant_type,
+        'total_score': total_score,
+        'career_recommendations': recommendations,
+        'career_matches': career_matches,
+        'completed_at': datetime.utcnow()
+    }
 
 @career_guidance_bp.route('/health', methods=['GET'])
 def health_check():
@@ -65,7 +142,10 @@ def health_check():
             'version': '1.0.0',
             'database': 'connected',
             'active_sessions': active_sessions,
-            'total_questions': len(QUESTIONS),
+            'total_questions': len(get_question_bank()),
+            'question_bank_version': DEFAULT_BANK_VERSION,
+            'question_bank_versions': available_versions(),
+            'career_catalog_size': len(get_career_catalog()),
             'timestamp': datetime.utcnow().isoformat()
         }), 200
     except Exception as e:
@@ -93,12 +173,127 @@ def recommendations_alias(session_id):
     """Alias for /results/<session_id>"""
     return get_results(session_id)
 
+@career_guidance_bp.route('/careers/match', methods=['POST'])
+def match_careers_endpoint():
+    """Match RIASEC scores against the occupation catalog"""
+    try:
+        data = request.get_json() or {}
+        riasec_scores = data.get('riasec_scores', {})
+        top_k = data.get('top_k', 10)
+        
+        if not riasec_scores or not isinstance(riasec_scores, dict):
+            return jsonify({
+                'success': False,
+                'error': 'riasec_scores is required'
+            }), 400
+        
+        try:
+            for value in riasec_scores.values():
+                float(value or 0)
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'riasec_scores values must be numbers'
+            }), 400
+        
+        if not isinstance(top_k, int) or top_k < 1 or top_k > 100:
+            return jsonify({
+                'success': False,
+                'error': 'top_k must be an integer between 1 and 100'
+            }), 400
+        
+        matches = match_careers(riasec_scores, top_k)
+        
+        # Link each occupation to the courses whose professions lead to it
+        try:
+            course_counts = profession_course_counts([match['career'] for match in matches])
+            for match in matches:
+                match['course_count'] = course_counts[match['career']]
+                if match['course_count']:
+                    match['courses_url'] = f"/api/course/professions/{quote(match['career'])}"
+        except Exception as e:
+            logger.warning(f"Profession course lookup failed: {e}")
+        
+        return jsonify({
+            'success': True,
+            'riasec_scores': riasec_scores,
+            'total_matches': len(matches),
+            'matches': matches
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error matching careers: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to match careers',
+            'details': str(e)
+        }), 500
+
+@career_guidance_bp.route('/analytics', methods=['GET'])
+def get_analytics():
+    """RIASEC distribution for a cohort over a date range, served from rollups"""
+    try:
+        school = request.args.get('school', '').strip()
+        cohort = request.args.get('cohort', '').strip()
+        start_day = request.args.get('start') or None
+        end_day = request.args.get('end') or None
+        
+        for day in (start_day, end_day):
+            if day:
+                try:
+                    datetime.strptime(day, '%Y-%m-%d')
+                except ValueError:
+                    return jsonify({
+                        'success': False,
+                        'error': 'Dates must use the YYYY-MM-DD format'
+                    }), 400
+        
+        if school and cohort:
+            dimension, value = 'school_cohort', school_cohort_value(school, cohort)
+        elif school:
+            dimension, value = 'school', school
+        elif cohort:
+            dimension, value = 'cohort', cohort
+        else:
+            dimension, value = 'all', 'all'
+        
+        analytics = query_rollups(dimension, value, start_day, end_day)
+        
+        return jsonify({
+            'success': True,
+            'analytics': analytics
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting analytics: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to get analytics',
+            'details': str(e)
+        }), 500
+
 @career_guidance_bp.route('/start-test', methods=['POST'])
 def start_test():
     """Start a new career assessment session"""
     try:
         data = request.get_json() or {}
         user_id = data.get('user_id', 'anonymous')
+        bank_version = data.get('question_bank_version') or DEFAULT_BANK_VERSION
+        mode = data.get('mode', 'standard')
+        
+        try:
+            bank = get_question_bank(bank_version)
+        except KeyError:
+            return jsonify({
+                'success': False,
+                'error': f'Unknown question bank version. Valid versions: {available_versions()}'
+            }), 400
+        
+        if mode not in ('standard', 'adaptive'):
+            return jsonify({
+                'success': False,
+                'error': "Mode must be 'standard' or 'adaptive'"
+            }), 400
         
         session_id = str(uuid.uuid4())
         
@@ -107,19 +302,28 @@ def start_test():
             'user_id': user_id,
             'created_at': datetime.utcnow(),
             'completed': False,
+            'question_bank_version': bank.version,
             'current_question': 0,
-            'scores': {
-                'realistic': 0,
-                'investigative': 0,
-                'artistic': 0,
-                'social': 0,
-                'enterprising': 0,
-                'conventional': 0
-            },
+            'scores': {trait: 0 for trait in RIASEC_TYPES},
             'answers': [],
-            'results': None
+            'results': None,
+            'mode': mode,
+            'tags': session_tags(data)
         }
         
+        if mode == 'adaptive':
+            try:
+                settings = adaptive_settings(data)
+            except (TypeError, ValueError) as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            session_document['adaptive'] = settings
+            session_document['next_question_index'] = next_question(
+                bank, bank.response_vector([]), settings
+            )
+        
         sessions_collection = get_collection(COLLECTIONS['career_sessions'])
         sessions_collection.insert_one(session_document)
         
@@ -128,7 +332,9 @@ def start_test():
         return jsonify({
             'success': True,
             'session_id': session_id,
-            'total_questions': len(QUESTIONS),
+            'question_bank_version': bank.version,
+            'mode': mode,
+            'total_questions': len(bank),
             'message': 'Test session started successfully'
         }), 200
         
@@ -153,25 +359,29 @@ def get_question(session_id):
                 'error': 'Session not found'
             }), 404
         
+        bank = _session_bank(session)
         current_question_num = session['current_question']
+        question_index = _current_question_index(session)
         
-        if current_question_num >= len(QUESTIONS):
+        if session['completed'] or question_index is None or question_index >= len(bank):
             return jsonify({
                 'success': False,
                 'error': 'No more questions',
                 'message': 'All questions have been answered'
             }), 400
         
-        question_data = QUESTIONS[current_question_num]
+        question_data = bank.questions[question_index]
         
         return jsonify({
             'success': True,
             'session_id': session_id,
+            'question_bank_version': bank.version,
+            'question_id': question_data['id'],
             'question_number': current_question_num + 1,
-            'total_questions': len(QUESTIONS),
+            'total_questions': len(bank),
             'question': question_data['question'],
             'riasec_type': question_data['riasec_type'],
-            'progress': (current_question_num / len(QUESTIONS)) * 100
+            'progress': (current_question_num / len(bank)) * 100
         }), 200
         
     except Exception as e:
@@ -196,10 +406,10 @@ def submit_answer():
                 'error': 'Missing session_id or answer'
             }), 400
         
-        if not isinstance(answer, int) or answer < 1 or answer > 5:
+        if not isinstance(answer, int) or isinstance(answer, bool):
             return jsonify({
                 'success': False,
-                'error': 'Answer must be an integer between 1 and 5'
+                'error': 'Answer must be an integer'
             }), 400
         
         sessions_collection = get_collection(COLLECTIONS['career_sessions'])
@@ -211,88 +421,120 @@ def submit_answer():
                 'error': 'Session not found'
             }), 404
         
+        bank = _session_bank(session)
         current_question_num = session['current_question']
+        question_index = _current_question_index(session)
+        
+        # A client retrying after a lost response names the question it already answered
+        if _is_stale_answer(data, session, bank, question_index):
+            return jsonify({
+                'success': False,
+                'error': 'Question was already answered'
+            }), 409
         
-        if current_question_num >= len(QUESTIONS):
+        if session['completed'] or question_index is None or question_index >= len(bank):
             return jsonify({
                 'success': False,
                 'error': 'All questions have been answered'
             }), 400
         
-        question_data = QUESTIONS[current_question_num]
+        if answer < bank.scale_min or answer > bank.scale_max:
+            return jsonify({
+                'success': False,
+                'error': f'Answer must be an integer between {bank.scale_min} and {bank.scale_max}'
+            }), 400
+        
+        question_data = bank.questions[question_index]
         
         # Create answer document
         answer_doc = {
-            'question_number': current_question_num + 1,
+            'question_number': question_index + 1,
+            'question_id': question_data['id'],
             'question': question_data['question'],
             'riasec_type': question_data['riasec_type'],
             'answer_value': answer,
             'timestamp': datetime.utcnow()
         }
         
-        # Update session with answer and scores
-        riasec_type = question_data['riasec_type']
+        # Rescore the whole response vector so multi-trait and reverse items are applied
+        answers = session['answers'] + [answer_doc]
+        new_scores = bank.score(answers)
         update_doc = {
             '$push': {'answers': answer_doc},
-            '$inc': {
-                f'scores.{riasec_type}': answer,
-                'current_question': 1
-            }
+            '$inc': {'current_question': 1},
+            '$set': {'scores': new_scores}
         }
         
+        assessment = None
+        if session.get('mode') == 'adaptive':
+            # Stop as soon as the dominant type is separated from the runner-up
+            responses = bank.response_vector(answers)
+            settings = session['adaptive']
+            next_index = None
+            if not should_stop(bank, responses, settings):
+                next_index = next_question(bank, responses, settings)
+            assessment = describe_progress(bank, responses)
+            assessment['stopped_early'] = next_index is None and len(answers) < len(bank)
+            update_doc['$set'].update({
+                'next_question_index': next_index,
+                'assessment': assessment
+            })
+            is_completed = next_index is None
+            final_scores = projected_scores(bank, responses)
+        else:
+            is_completed = current_question_num + 1 >= len(bank)
+            final_scores = new_scores
+        
         # Check if test is completed
-        if current_question_num + 1 >= len(QUESTIONS):
-            # Calculate final results
-            new_scores = session['scores'].copy()
-            new_scores[riasec_type] += answer
-            
-            total_score = sum(new_scores.values())
-            percentages = {}
-            if total_score > 0:
-                percentages = {k: round((v / total_score) * 100, 2) for k, v in new_scores.items()}
-            
-            dominant_type = max(new_scores, key=new_scores.get)
-            recommendations = CAREER_RECOMMENDATIONS.get(dominant_type, [])
-            
-            results = {
-                'riasec_scores': new_scores,
-                'percentages': percentages,
-                'dominant_type': dominant_type,
-                'total_score': total_score,
-                'career_recommendations': recommendations,
-                'completed_at': datetime.utcnow()
-            }
-            
-            update_doc['$set'] = {
+        if is_completed:
+            update_doc['$set'].update({
                 'completed': True,
-                'results': results
-            }
+                'results': _build_results(bank, final_scores)
+            })
         
-        sessions_collection.update_one(
-            {'session_id': session_id},
+        # Only applies while the session is still on this question, so a concurrent
+        # submit cannot overwrite the scores or push the answer twice
+        result = sessions_collection.update_one(
+            {'session_id': session_id, 'current_question': current_question_num},
             update_doc
         )
+        if result.matched_count == 0:
+            return jsonify({
+                'success': False,
+                'error': 'Question was already answered'
+            }), 409
         
         # Get updated session
         updated_session = sessions_collection.find_one({'session_id': session_id})
         
         if updated_session['completed']:
-            return jsonify({
+            _cache_completed_results(updated_session)
+            if is_completed:
+                try:
+                    record_completed_session(updated_session)
+                except Exception as e:
+                    logger.error(f"Failed to update career rollups for {session_id}: {e}")
+            response = {
                 'success': True,
                 'session_id': session_id,
                 'completed': True,
                 'results': updated_session['results'],
                 'message': 'Test completed successfully!'
-            }), 200
+            }
         else:
-            return jsonify({
+            response = {
                 'success': True,
                 'session_id': session_id,
                 'completed': False,
                 'next_question': updated_session['current_question'] + 1,
-                'progress': (updated_session['current_question'] / len(QUESTIONS)) * 100,
+                'progress': (updated_session['current_question'] / len(bank)) * 100,
                 'message': 'Answer recorded successfully'
-            }), 200
+            }
+        
+        if assessment is not None:
+            response['assessment'] = assessment
+        
+        return jsonify(response), 200
             
     except Exception as e:
         logger.error(f"Error submitting answer: {e}")
@@ -306,8 +548,14 @@ def submit_answer():
 def get_results(session_id):
     """Get test results for a session"""
     try:
+        cached = _results_cache.get(session_id)
+        if cached is not None:
+            return cached_json_response(cached['body'], cached['etag'])
+        
         sessions_collection = get_collection(COLLECTIONS['career_sessions'])
-        session = sessions_collection.find_one({'session_id': session_id})
+        session = sessions_collection.find_one({'session_id': session_id}, {
+            'completed': 1, 'current_question': 1, 'question_bank_version': 1
+        })
         
         if not session:
             return jsonify({
@@ -316,20 +564,21 @@ def get_results(session_id):
             }), 404
         
         if not session['completed']:
-            return jsonify({
+            # In-progress sessions change on every answer and must never be cached
+            response = jsonify({
                 'success': False,
                 'error': 'Test not completed yet',
                 'current_question': session['current_question'] + 1,
-                'total_questions': len(QUESTIONS)
-            }), 400
+                'total_questions': len(_session_bank(session))
+            })
+            response.headers['Cache-Control'] = NO_STORE_CACHE_CONTROL
+            return response, 400
         
-        return jsonify({
-            'success': True,
-            'session_id': session_id,
-            'results': session['results'],
-            'answers': session['answers'],
-            'message': 'Results retrieved successfully'
-        }), 200
+        # Only completed sessions can have shared results
+        cached = _get_shared_results(session_id)
+        if cached is None:
+            cached = _cache_completed_results(sessions_collection.find_one({'session_id': session_id}))
+        return cached_json_response(cached['body'], cached['etag'])
         
     except Exception as e:
         logger.error(f"Error getting results: {e}")
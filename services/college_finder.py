@@ -7,13 +7,394 @@ from flask import Blueprint, request, jsonify
 import logging
 from typing import Dict, List, Any, Optional
 from database import get_collection, COLLECTIONS
+from services.query_builder import (
+    add_search_fields, match_clause, any_field_clause, parse_match_mode, normalize_text, public_projection
+)
+from services.data_version import bump_data_version, get_data_version, get_materialized_view
+from services.geo_index import GeoIndex, parse_geo_query
+from services.text_search import (
+    TrigramIndex, PrefixIndex, DeletionDictionary, DEFAULT_LIMIT, DEFAULT_SUGGEST_LIMIT
+)
 import pandas as pd
 import os
+import re
+import threading
+from pymongo import UpdateOne
 
 logger = logging.getLogger(__name__)
 
 college_finder_bp = Blueprint('college_finder', __name__)
 
+# Data version key for the colleges collection
+COLLEGES_DATASET = 'colleges'
+
+# Fields searched by /colleges/search and their ranking weights
+COLLEGE_SEARCH_WEIGHTS = {
+    'College_Name': 1.0,
+    'Location_City': 0.8,
+    'District': 0.8,
+    'Affiliating_University': 0.6,
+    'Key_Degrees_Offered': 0.5
+}
+COLLEGE_SEARCH_FIELDS = list(COLLEGE_SEARCH_WEIGHTS)
+
+# Fields whose words feed the spelling dictionary for fuzzy lookups
+COLLEGE_FUZZY_FIELDS = ['College_Name', 'Location_City', 'District', 'Division']
+MAX_SEARCH_LIMIT = 100
+MAX_SUGGEST_LIMIT = 20
+
+# /colleges/filter criteria -> college fields
+COLLEGE_FILTER_FIELDS = {
+    'state': 'State',
+    'division': 'Division',
+    'district': 'District',
+    'city': 'Location_City',
+    'college_type': 'College_Type',
+    'university': 'Affiliating_University',
+    'course': 'Key_Degrees_Offered'
+}
+
+# /colleges/filter facets -> grouped fields
+COLLEGE_FACETS = {
+    'division': 'Division',
+    'district': 'District',
+    'college_type': 'College_Type',
+    'review_score': 'Review_Score_5'
+}
+REVIEW_SCORE_BOUNDARIES = [0, 3, 3.5, 4, 4.5, 5.01]
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Every field with a normalized search copy
+COLLEGE_NORMALIZED_FIELDS = sorted(set(COLLEGE_SEARCH_FIELDS) | set(COLLEGE_FILTER_FIELDS.values()))
+
+# Derived fields kept for queries only, hidden from responses
+COLLEGE_INTERNAL_FIELDS = ['fee_min', 'fee_max', 'fee_is_total']
+COLLEGE_PUBLIC_PROJECTION = public_projection(*COLLEGE_INTERNAL_FIELDS)
+
+# Fee ranges as written in the CSV: "10,000 - 12,500", "1,65,000", "46,000 - 67,000 (Total)"
+FEE_AMOUNT = re.compile(r'\d[\d,]*')
+# Smaller amounts are data-entry errors rather than fees
+MIN_PLAUSIBLE_FEE = 100
+
+def parse_fee_range(value: Any) -> Dict[str, Any]:
+    """Parse Estimated_Annual_Fee_INR text into numeric fee_min/fee_max fields"""
+    fees = {'fee_min': None, 'fee_max': None, 'fee_is_total': False}
+    if not isinstance(value, str):
+        return fees
+    
+    amounts = [int(a.replace(',', '')) for a in FEE_AMOUNT.findall(value)]
+    amounts = [a for a in amounts if a >= MIN_PLAUSIBLE_FEE]
+    if amounts:
+        fees['fee_min'] = min(amounts)
+        fees['fee_max'] = max(amounts)
+        fees['fee_is_total'] = 'total' in value.lower()
+    return fees
+
+# Canonical degree codes keyed by the letters of a degree's spelling, so
+# "B.Sc", "BSc" and "Bsc" all become BSC
+DEGREE_CODES = {
+    'ba': 'BA', 'bsc': 'BSC', 'bcom': 'BCOM', 'bca': 'BCA', 'bba': 'BBA',
+    'be': 'BE', 'btech': 'BTECH', 'barch': 'BARCH', 'diploma': 'DIPLOMA',
+    'ma': 'MA', 'msc': 'MSC', 'mcom': 'MCOM', 'mca': 'MCA', 'mba': 'MBA', 'mtech': 'MTECH',
+    'mbbs': 'MBBS', 'md': 'MD', 'ms': 'MS', 'phd': 'PHD'
+}
+DEGREE_NAMES = {
+    'BA': 'BA', 'BSC': 'B.Sc', 'BCOM': 'B.Com', 'BCA': 'BCA', 'BBA': 'BBA',
+    'BE': 'B.E.', 'BTECH': 'B.Tech', 'BARCH': 'B.Arch', 'DIPLOMA': 'Diploma',
+    'MA': 'MA', 'MSC': 'M.Sc', 'MCOM': 'M.Com', 'MCA': 'MCA', 'MBA': 'MBA', 'MTECH': 'M.Tech',
+    'MBBS': 'MBBS', 'MD': 'MD', 'MS': 'MS', 'PHD': 'PhD'
+}
+# Commas outside parentheses separate degrees: "B.E. (Civil, Mech), BCA"
+DEGREE_SEPARATOR = re.compile(r',\s*(?![^()]*\))')
+
+def degree_code(value: Any) -> Optional[str]:
+    """Canonical code for one degree spelling ("B.Sc IT" -> BSC), or None if unknown"""
+    if not isinstance(value, str) or not value.split():
+        return None
+    key = re.sub(r'[^a-z]', '', value.split()[0].lower())
+    return DEGREE_CODES.get(key)
+
+def parse_degrees(value: Any) -> List[str]:
+    """Explode a Key_Degrees_Offered list into unique canonical degree codes"""
+    if not isinstance(value, str):
+        return []
+    degrees = []
+    for part in DEGREE_SEPARATOR.split(value):
+        code = degree_code(part)
+        if code and code not in degrees:
+            degrees.append(code)
+    return degrees
+
+def college_derived_fields(college: Dict[str, Any]) -> Dict[str, Any]:
+    """Typed fields computed from a college's raw CSV columns"""
+    fields = parse_fee_range(college.get('Estimated_Annual_Fee_INR'))
+    fields['degrees'] = parse_degrees(college.get('Key_Degrees_Offered'))
+    return fields
+
+def backfill_college_fields(batch_size: int = 500) -> int:
+    """Recompute derived fields for colleges loaded before they existed"""
+    colleges_collection = get_collection(COLLECTIONS['colleges'])
+    operations = []
+    updated = 0
+    for college in colleges_collection.find({}, {'Estimated_Annual_Fee_INR': 1, 'Key_Degrees_Offered': 1}):
+        operations.append(UpdateOne({'_id': college['_id']}, {'$set': college_derived_fields(college)}))
+        if len(operations) >= batch_size:
+            updated += colleges_collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += colleges_collection.bulk_write(operations, ordered=False).modified_count
+    logger.info(f"Backfilled derived fields for {updated} colleges")
+    if updated:
+        bump_data_version(COLLEGES_DATASET)
+    return updated
+
+def parse_facets(value: Any) -> List[str]:
+    """Facets requested by a filter body: true for all, or a list of names"""
+    if value is True:
+        return list(COLLEGE_FACETS)
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    unknown = [facet for facet in value if facet not in COLLEGE_FACETS]
+    if unknown:
+        raise ValueError(f"Invalid facets {unknown}. Valid facets: {list(COLLEGE_FACETS)}")
+    return list(value)
+
+def facet_pipeline(query: Dict[str, Any], facets: List[str], skip: int = 0,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """One aggregation returning a page of hits, the total and the requested facet counts"""
+    hits = [{'$sort': {'College_Name': 1, '_id': 1}}]
+    if skip:
+        hits.append({'$skip': skip})
+    if limit:
+        hits.append({'$limit': limit})
+    hits.append({'$project': COLLEGE_PUBLIC_PROJECTION})
+    
+    branches = {'hits': hits, 'total': [{'$count': 'count'}]}
+    for facet in facets:
+        field = f'${COLLEGE_FACETS[facet]}'
+        if facet == 'review_score':
+            branches[facet] = [{'$bucket': {
+                # Missing scores fall outside the boundaries into the default bucket
+                'groupBy': {'$ifNull': [field, -1]},
+                'boundaries': REVIEW_SCORE_BOUNDARIES,
+                'default': 'unrated',
+                'output': {'count': {'$sum': 1}}
+            }}]
+        else:
+            branches[facet] = [
+                {'$group': {'_id': field, 'count': {'$sum': 1}}},
+                {'$sort': {'count': -1, '_id': 1}}
+            ]
+    
+    return [{'$match': query}, {'$facet': branches}]
+
+def _review_bucket_label(lower: Any) -> str:
+    if lower == 'unrated':
+        return lower
+    upper = REVIEW_SCORE_BOUNDARIES[REVIEW_SCORE_BOUNDARIES.index(lower) + 1]
+    return f'{lower}-{min(upper, 5)}'
+
+def format_facets(result: Dict[str, Any], facets: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Turn $facet branches into {facet: [{value, count}]}"""
+    formatted = {}
+    for facet in facets:
+        if facet == 'review_score':
+            formatted[facet] = [
+                {'value': _review_bucket_label(row['_id']), 'count': row['count']}
+                for row in result.get(facet, [])
+            ]
+        else:
+            formatted[facet] = [
+                {'value': row['_id'], 'count': row['count']}
+                for row in result.get(facet, [])
+            ]
+    return formatted
+
+def ensure_college_indexes() -> None:
+    """Indexes for typed college fields"""
+    colleges_collection = get_collection(COLLECTIONS['colleges'])
+    colleges_collection.create_index([('fee_min', 1), ('fee_max', 1)])
+    # Multikey index over the canonical degree array
+    colleges_collection.create_index('degrees')
+
+def prepare_college_documents(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Clean college CSV rows into documents ready for insertion"""
+    # Division header rows have an ID but no name; the CSV also repeats some colleges
+    df = df.dropna(subset=['College_ID', 'College_Name'])
+    df = df.drop_duplicates(subset=['College_ID']).reset_index(drop=True)
+    df = df.astype(object).where(pd.notna(df), None)
+    
+    colleges = df.to_dict('records')
+    now = pd.Timestamp.now()
+    for college in colleges:
+        college['_id'] = str(college['College_ID'])
+        college['created_at'] = now
+        college['updated_at'] = now
+        college.update(college_derived_fields(college))
+        add_search_fields(college, COLLEGE_NORMALIZED_FIELDS)
+    
+    return colleges
+
+# Current in-memory indexes and the colleges data version they were built from
+_indexes: Optional[Dict[str, Any]] = None
+_index_lock = threading.Lock()
+
+def build_college_indexes(colleges: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Build the in-memory search, typeahead, spelling and geo indexes, reading colleges from MongoDB by default"""
+    global _indexes
+    version = get_data_version(COLLEGES_DATASET)
+    if colleges is None:
+        colleges = list(get_collection(COLLECTIONS['colleges']).find({}, COLLEGE_PUBLIC_PROJECTION))
+    indexes = {
+        'version': version,
+        'search': TrigramIndex(COLLEGE_SEARCH_WEIGHTS).build(colleges),
+        'suggest': PrefixIndex().build(
+            (college.get('College_Name'), {
+                'id': college.get('College_ID'),
+                'name': college.get('College_Name'),
+                'district': college.get('District')
+            })
+            for college in colleges
+        ),
+        'spelling': DeletionDictionary().build(
+            college.get(field) for college in colleges for field in COLLEGE_FUZZY_FIELDS
+        )
+    }
+    located = [college for college in colleges if college.get('location')]
+    indexes['geo'] = GeoIndex(
+        located,
+        (college['location']['coordinates'][1] for college in located),
+        (college['location']['coordinates'][0] for college in located)
+    )
+    with _index_lock:
+        _indexes = indexes
+    return indexes
+
+def _college_indexes() -> Dict[str, Any]:
+    """In-memory indexes for the current colleges data version, rebuilt when it changes"""
+    indexes = _indexes
+    if indexes is None or indexes['version'] != get_data_version(COLLEGES_DATASET):
+        indexes = build_college_indexes()
+    return indexes
+
+def get_college_search_index() -> TrigramIndex:
+    """Get the college search index"""
+    return _college_indexes()['search']
+
+def get_college_suggest_index() -> PrefixIndex:
+    """Get the college name typeahead index"""
+    return _college_indexes()['suggest']
+
+def get_college_spelling_index() -> DeletionDictionary:
+    """Get the college/place spelling dictionary"""
+    return _college_indexes()['spelling']
+
+def get_college_geo_index() -> GeoIndex:
+    """Get the geo index over colleges with a known location"""
+    return _college_indexes()['geo']
+
+def fuzzy_search(search_term: str, limit: int) -> Dict[str, Any]:
+    """Spell-correct a query against college and place names, then run ranked search"""
+    corrected_query, corrections = get_college_spelling_index().correct(search_term)
+    hits = get_college_search_index().search(corrected_query, limit=limit)
+    return {
+        'corrected_query': corrected_query if corrections else None,
+        'corrections': corrections,
+        'colleges': [
+            dict(hit['document'], relevance_score=hit['score'], matched_field=hit['matched_field'])
+            for hit in hits
+        ]
+    }
+
+def compute_college_statistics() -> Dict[str, Any]:
+    """Aggregate college counts, fee figures and per-division/per-type breakdowns"""
+    colleges_collection = get_collection(COLLECTIONS['colleges'])
+    
+    pipeline = [
+        {
+            '$facet': {
+                'summary': [{
+                    '$group': {
+                        '_id': None,
+                        'total_colleges': {'$sum': 1},
+                        'divisions': {'$addToSet': '$Division'},
+                        'districts': {'$addToSet': '$District'},
+                        'cities': {'$addToSet': '$Location_City'},
+                        'college_types': {'$addToSet': '$College_Type'},
+                        'universities': {'$addToSet': '$Affiliating_University'},
+                        'colleges_with_fees': {'$sum': {'$cond': [{'$gt': ['$fee_min', None]}, 1, 0]}},
+                        'avg_fees': {'$avg': {'$divide': [{'$add': ['$fee_min', '$fee_max']}, 2]}},
+                        'avg_fee_min': {'$avg': '$fee_min'},
+                        'avg_fee_max': {'$avg': '$fee_max'},
+                        'lowest_fee': {'$min': '$fee_min'},
+                        'highest_fee': {'$max': '$fee_max'}
+                    }
+                }],
+                'breakdown': [
+                    {'$group': {
+                        '_id': {'division': '$Division', 'college_type': '$College_Type'},
+                        'count': {'$sum': 1}
+                    }},
+                    {'$sort': {'_id.division': 1, 'count': -1, '_id.college_type': 1}}
+                ],
+                'degrees': [
+                    {'$unwind': '$degrees'},
+                    {'$group': {'_id': '$degrees', 'count': {'$sum': 1}}},
+                    {'$sort': {'count': -1, '_id': 1}}
+                ]
+            }
+        }
+    ]
+    
+    result = next(colleges_collection.aggregate(pipeline), {})
+    stat = result['summary'][0] if result.get('summary') else {}
+    
+    def distinct_count(key):
+        return len([value for value in stat.get(key, []) if value is not None])
+    
+    by_division = {}
+    by_type = {}
+    for row in result.get('breakdown', []):
+        division = row['_id'].get('division') or 'Unknown'
+        college_type = row['_id'].get('college_type') or 'Unknown'
+        entry = by_division.setdefault(division, {'division': division, 'colleges': 0, 'college_types': []})
+        entry['colleges'] += row['count']
+        entry['college_types'].append({'value': college_type, 'count': row['count']})
+        by_type[college_type] = by_type.get(college_type, 0) + row['count']
+    
+    return {
+        'total_colleges': stat.get('total_colleges', 0),
+        'total_divisions': distinct_count('divisions'),
+        'total_districts': distinct_count('districts'),
+        'total_cities': distinct_count('cities'),
+        'total_college_types': distinct_count('college_types'),
+        'total_universities': distinct_count('universities'),
+        'average_fees': round(stat.get('avg_fees') or 0, 2),
+        'fees': {
+            'colleges_with_fees': stat.get('colleges_with_fees', 0),
+            'lowest': stat.get('lowest_fee'),
+            'highest': stat.get('highest_fee'),
+            'average_min': round(stat.get('avg_fee_min') or 0, 2),
+            'average_max': round(stat.get('avg_fee_max') or 0, 2)
+        },
+        'by_division': list(by_division.values()),
+        'by_type': [
+            {'value': college_type, 'count': count}
+            for college_type, count in sorted(by_type.items(), key=lambda item: (-item[1], item[0]))
+        ],
+        'by_degree': [
+            {'degree': row['_id'], 'name': DEGREE_NAMES.get(row['_id'], row['_id']), 'count': row['count']}
+            for row in result.get('degrees', [])
+        ]
+    }
+
+def get_college_statistics() -> Dict[str, Any]:
+    """College statistics, materialized once per colleges data version"""
+    return get_materialized_view('college_statistics', COLLEGES_DATASET, compute_college_statistics)
+
 def load_college_data_to_mongodb():
     """Load college data from CSV to MongoDB"""
     try:
@@ -24,7 +405,6 @@ def load_college_data_to_mongodb():
             return
         
         df = pd.read_csv(csv_path)
-        df = df.dropna(subset=['College_ID']).reset_index(drop=True)
         
         colleges_collection = get_collection(COLLECTIONS['colleges'])
         
@@ -38,19 +418,14 @@ def load_college_data_to_mongodb():
             logger.warning(f"Could not check existing data: {e}")
             # Continue with loading
         
-        # Convert DataFrame to list of dictionaries
-        colleges = df.to_dict('records')
-        
-        # Add metadata to each college
-        for college in colleges:
-            college['_id'] = str(college.get('College_ID', ''))
-            college['created_at'] = pd.Timestamp.now()
-            college['updated_at'] = pd.Timestamp.now()
+        # Convert DataFrame to cleaned documents with search fields
+        colleges = prepare_college_documents(df)
         
         # Insert into MongoDB
         if colleges:
             colleges_collection.insert_many(colleges)
             logger.info(f"Loaded {len(colleges)} colleges into MongoDB")
+            bump_data_version(COLLEGES_DATASET)
         
     except Exception as e:
         logger.error(f"Error loading college data: {e}")
@@ -82,7 +457,7 @@ def get_all_colleges():
     """Get all colleges"""
     try:
         colleges_collection = get_collection(COLLECTIONS['colleges'])
-        colleges = list(colleges_collection.find({}, {'_id': 0}))
+        colleges = list(colleges_collection.find({}, COLLEGE_PUBLIC_PROJECTION))
         
         return jsonify({
             'success': True,
@@ -103,6 +478,74 @@ def search_alias():
     """Alias to maintain compatibility with /api/college/search"""
     return search_colleges()
 
+@college_finder_bp.route('/suggest', methods=['GET'])
+def suggest_colleges():
+    """Typeahead suggestions for college names"""
+    try:
+        prefix = request.args.get('q', '').strip()
+        try:
+            limit = max(1, min(int(request.args.get('limit', DEFAULT_SUGGEST_LIMIT)), MAX_SUGGEST_LIMIT))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'limit must be an integer'
+            }), 400
+        
+        suggestions = get_college_suggest_index().suggest(prefix, limit) if prefix else []
+        
+        return jsonify({
+            'success': True,
+            'query': prefix,
+            'suggestions': suggestions
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting college suggestions: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to get college suggestions',
+            'details': str(e)
+        }), 500
+
+@college_finder_bp.route('/fuzzy', methods=['GET'])
+def fuzzy_search_colleges():
+    """Typo-tolerant college search with spelling corrections"""
+    try:
+        search_term = request.args.get('q', '').strip()
+        
+        if not search_term:
+            return jsonify({
+                'success': False,
+                'error': 'Search term is required'
+            }), 400
+        
+        try:
+            limit = max(1, min(int(request.args.get('limit', DEFAULT_LIMIT)), MAX_SEARCH_LIMIT))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'limit must be an integer'
+            }), 400
+        
+        result = fuzzy_search(search_term, limit)
+        
+        return jsonify({
+            'success': True,
+            'search_term': search_term,
+            'corrected_query': result['corrected_query'],
+            'corrections': result['corrections'],
+            'total_results': len(result['colleges']),
+            'colleges': result['colleges']
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error in fuzzy college search: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to search colleges',
+            'details': str(e)
+        }), 500
+
 @college_finder_bp.route('/filter', methods=['POST'])
 def filter_alias():
     """Alias to maintain compatibility with /api/college/filter"""
@@ -112,13 +555,11 @@ def filter_alias():
 def statistics_alias():
     """Basic statistics endpoint"""
     try:
-        colleges_collection = get_collection(COLLECTIONS['colleges'])
-        total = colleges_collection.count_documents({})
-        states = colleges_collection.distinct('State')
+        statistics = get_college_statistics()
         return jsonify({
             'success': True,
-            'total_colleges': total,
-            'states_count': len(states)
+            'total_colleges': statistics['total_colleges'],
+            'divisions_count': statistics['total_divisions']
         }), 200
     except Exception as e:
         logger.error(f"Error getting statistics: {e}")
@@ -132,47 +573,92 @@ def filter_colleges():
         
         colleges_collection = get_collection(COLLECTIONS['colleges'])
         
+        try:
+            match_mode = parse_match_mode(filter_criteria.get('match'), 'exact')
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
         # Build MongoDB query
         query = {}
         
-        # State filter
-        if 'state' in filter_criteria and filter_criteria['state']:
-            query['State'] = {'$regex': filter_criteria['state'], '$options': 'i'}
-        
-        # City filter
-        if 'city' in filter_criteria and filter_criteria['city']:
-            query['City'] = {'$regex': filter_criteria['city'], '$options': 'i'}
+        for criterion, field in COLLEGE_FILTER_FIELDS.items():
+            value = filter_criteria.get(criterion)
+            if value:
+                # Degree lists are free text, so the course filter is always a contains match
+                mode = 'contains' if criterion == 'course' else match_mode
+                query.update(match_clause(field, value, mode))
         
-        # College type filter
-        if 'college_type' in filter_criteria and filter_criteria['college_type']:
-            query['College_Type'] = {'$regex': filter_criteria['college_type'], '$options': 'i'}
+        # Degree filter: canonical codes, every listed degree must be offered
+        degree_filter = filter_criteria.get('degree')
+        if degree_filter:
+            degree_values = degree_filter if isinstance(degree_filter, list) else [degree_filter]
+            codes = [degree_code(value) for value in degree_values]
+            if not all(codes):
+                return jsonify({
+                    'success': False,
+                    'error': f"Unknown degree in {degree_values}. Valid degrees: {list(DEGREE_NAMES.values())}"
+                }), 400
+            query['degrees'] = {'$all': codes}
         
-        # University filter
-        if 'university' in filter_criteria and filter_criteria['university']:
-            query['University'] = {'$regex': filter_criteria['university'], '$options': 'i'}
-        
-        # Course filter
-        if 'course' in filter_criteria and filter_criteria['course']:
-            query['Courses_Offered'] = {'$regex': filter_criteria['course'], '$options': 'i'}
+        # Fee range filter: colleges whose fee range overlaps the requested one
+        try:
+            min_fees = filter_criteria.get('min_fees')
+            max_fees = filter_criteria.get('max_fees')
+            min_fees = float(min_fees) if min_fees not in (None, '') else None
+            max_fees = float(max_fees) if max_fees not in (None, '') else None
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'min_fees and max_fees must be numbers'
+            }), 400
+        if min_fees is not None:
+            query['fee_max'] = {'$gte': min_fees}
+        if max_fees is not None:
+            query['fee_min'] = {'$lte': max_fees}
         
-        # Fees range filter
-        if 'min_fees' in filter_criteria or 'max_fees' in filter_criteria:
-            fees_query = {}
-            if 'min_fees' in filter_criteria:
-                fees_query['$gte'] = filter_criteria['min_fees']
-            if 'max_fees' in filter_criteria:
-                fees_query['$lte'] = filter_criteria['max_fees']
-            query['Fees'] = fees_query
+        # Facets and pagination
+        try:
+            facets = parse_facets(filter_criteria.get('facets'))
+            # Facet results share one $facet output document, so their hits are always paged
+            paginate = 'page' in filter_criteria or 'page_size' in filter_criteria or bool(facets)
+            page = max(1, int(filter_criteria.get('page', 1)))
+            page_size = max(1, min(int(filter_criteria.get('page_size', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE))
+        except (TypeError, ValueError) as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        # Execute query
-        colleges = list(colleges_collection.find(query, {'_id': 0}))
+        if paginate:
+            # A page of hits, the total and facet counts in a single pass
+            pipeline = facet_pipeline(query, facets, skip=(page - 1) * page_size, limit=page_size)
+            result = next(colleges_collection.aggregate(pipeline), {})
+            total = result['total'][0]['count'] if result.get('total') else 0
+            colleges = result.get('hits', [])
+        else:
+            # Every match, streamed from a cursor rather than packed into one $facet document
+            colleges = list(
+                colleges_collection.find(query, COLLEGE_PUBLIC_PROJECTION).sort([('College_Name', 1), ('_id', 1)])
+            )
+            total = len(colleges)
         
-        return jsonify({
+        response = {
             'success': True,
             'filter_criteria': filter_criteria,
-            'total_results': len(colleges),
+            'total_results': total,
             'colleges': colleges
-        }), 200
+        }
+        if paginate:
+            response['page'] = page
+            response['page_size'] = page_size
+            response['total_pages'] = (total + page_size - 1) // page_size
+        if facets:
+            response['facets'] = format_facets(result, facets)
+        
+        return jsonify(response), 200
         
     except Exception as e:
         logger.error(f"Error filtering colleges: {e}")
@@ -184,7 +670,7 @@ def filter_colleges():
 
 @college_finder_bp.route('/colleges/search', methods=['GET'])
 def search_colleges():
-    """Search colleges by name or keyword"""
+    """Search colleges by name or keyword, ranked by trigram similarity"""
     try:
         search_term = request.args.get('q', '').strip()
         
@@ -194,27 +680,46 @@ def search_colleges():
                 'error': 'Search term is required'
             }), 400
         
-        colleges_collection = get_collection(COLLECTIONS['colleges'])
+        try:
+            limit = max(1, min(int(request.args.get('limit', DEFAULT_LIMIT)), MAX_SEARCH_LIMIT))
+            match_mode = request.args.get('match')
+            if match_mode:
+                match_mode = parse_match_mode(match_mode, 'contains')
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        # Build search query
-        query = {
-            '$or': [
-                {'College_Name': {'$regex': search_term, '$options': 'i'}},
-                {'University': {'$regex': search_term, '$options': 'i'}},
-                {'City': {'$regex': search_term, '$options': 'i'}},
-                {'State': {'$regex': search_term, '$options': 'i'}},
-                {'Courses_Offered': {'$regex': search_term, '$options': 'i'}}
+        corrected_query = None
+        if match_mode:
+            # Explicit match modes keep the unranked MongoDB lookup
+            colleges_collection = get_collection(COLLECTIONS['colleges'])
+            query = any_field_clause(COLLEGE_SEARCH_FIELDS, search_term, match_mode)
+            colleges = list(colleges_collection.find(query, COLLEGE_PUBLIC_PROJECTION).limit(limit))
+        else:
+            hits = get_college_search_index().search(search_term, limit=limit)
+            colleges = [
+                dict(hit['document'], relevance_score=hit['score'], matched_field=hit['matched_field'])
+                for hit in hits
             ]
-        }
-        
-        colleges = list(colleges_collection.find(query, {'_id': 0}))
+            # Nothing close enough: retry with misspelled words corrected
+            if not colleges:
+                fuzzy = fuzzy_search(search_term, limit)
+                corrected_query = fuzzy['corrected_query']
+                colleges = fuzzy['colleges']
         
-        return jsonify({
+        response = {
             'success': True,
             'search_term': search_term,
+            'match': match_mode or 'ranked',
             'total_results': len(colleges),
             'colleges': colleges
-        }), 200
+        }
+        if corrected_query:
+            response['corrected_query'] = corrected_query
+        
+        return jsonify(response), 200
         
     except Exception as e:
         logger.error(f"Error searching colleges: {e}")
@@ -224,54 +729,115 @@ def search_colleges():
             'details': str(e)
         }), 500
 
-@college_finder_bp.route('/colleges/stats', methods=['GET'])
-def get_college_stats():
-    """Get college statistics"""
+@college_finder_bp.route('/nearby', methods=['GET'])
+def nearby_colleges():
+    """Nearest colleges to a point, optionally within a radius and offering a degree or course"""
     try:
-        colleges_collection = get_collection(COLLECTIONS['colleges'])
+        try:
+            latitude, longitude, k, radius_km = parse_geo_query(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        # Aggregation pipeline for statistics
-        pipeline = [
-            {
-                '$group': {
-                    '_id': None,
-                    'total_colleges': {'$sum': 1},
-                    'states': {'$addToSet': '$State'},
-                    'cities': {'$addToSet': '$City'},
-                    'college_types': {'$addToSet': '$College_Type'},
-                    'universities': {'$addToSet': '$University'},
-                    'avg_fees': {'$avg': '$Fees'}
-                }
-            }
-        ]
+        degree = request.args.get('degree', '').strip()
+        code = degree_code(degree) if degree else None
+        if degree and not code:
+            return jsonify({
+                'success': False,
+                'error': f"Unknown degree '{degree}'. Valid degrees: {list(DEGREE_NAMES.values())}"
+            }), 400
+        course = normalize_text(request.args.get('course', '')) or None
         
-        stats = list(colleges_collection.aggregate(pipeline))
+        def offers(college):
+            if code and code not in college.get('degrees', []):
+                return False
+            if course and not any(
+                course in (normalize_text(c.get('course_name')) or '') for c in college.get('courses', [])
+            ):
+                return False
+            return True
         
-        if stats:
-            stat = stats[0]
-            return jsonify({
-                'success': True,
-                'statistics': {
-                    'total_colleges': stat['total_colleges'],
-                    'total_states': len(stat['states']),
-                    'total_cities': len(stat['cities']),
-                    'total_college_types': len(stat['college_types']),
-                    'total_universities': len(stat['universities']),
-                    'average_fees': round(stat.get('avg_fees', 0), 2)
-                }
-            }), 200
-        else:
+        hits = get_college_geo_index().nearest(
+            latitude, longitude, k=k, radius_km=radius_km,
+            predicate=offers if (code or course) else None
+        )
+        colleges = [dict(hit['item'], distance_km=hit['distance_km']) for hit in hits]
+        
+        return jsonify({
+            'success': True,
+            'origin': {'lat': latitude, 'lon': longitude},
+            'radius_km': radius_km,
+            'total_results': len(colleges),
+            'colleges': colleges
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error finding nearby colleges: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to find nearby colleges',
+            'details': str(e)
+        }), 500
+
+@college_finder_bp.route('/degrees', methods=['GET'])
+def list_degrees():
+    """Canonical degrees with the number of colleges offering each"""
+    try:
+        return jsonify({
+            'success': True,
+            'degrees': get_college_statistics()['by_degree']
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error listing degrees: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to list degrees',
+            'details': str(e)
+        }), 500
+
+@college_finder_bp.route('/degrees/<degree>', methods=['GET'])
+def colleges_by_degree(degree):
+    """Colleges offering a degree, served from the multikey degree index"""
+    try:
+        code = degree_code(degree)
+        if not code:
             return jsonify({
-                'success': True,
-                'statistics': {
-                    'total_colleges': 0,
-                    'total_states': 0,
-                    'total_cities': 0,
-                    'total_college_types': 0,
-                    'total_universities': 0,
-                    'average_fees': 0
-                }
-            }), 200
+                'success': False,
+                'error': f"Unknown degree '{degree}'. Valid degrees: {list(DEGREE_NAMES.values())}"
+            }), 400
+        
+        colleges_collection = get_collection(COLLECTIONS['colleges'])
+        colleges = list(colleges_collection.find({'degrees': code}, COLLEGE_PUBLIC_PROJECTION).sort([
+            ('College_Name', 1), ('College_ID', 1)
+        ]))
+        
+        return jsonify({
+            'success': True,
+            'degree': code,
+            'degree_name': DEGREE_NAMES[code],
+            'total_results': len(colleges),
+            'colleges': colleges
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting colleges by degree: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to get colleges by degree',
+            'details': str(e)
+        }), 500
+
+@college_finder_bp.route('/colleges/stats', methods=['GET'])
+def get_college_stats():
+    """Get college statistics"""
+    try:
+        return jsonify({
+            'success': True,
+            'statistics': get_college_statistics()
+        }), 200
             
     except Exception as e:
         logger.error(f"Error getting college stats: {e}")
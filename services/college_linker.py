@@ -0,0 +1,221 @@
+"""
+College Linker
+Resolves course rows to college ids and denormalizes coordinates, ratings and course lists onto colleges
+"""
+
+import logging
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+from pymongo import UpdateMany, UpdateOne
+
+from database import get_collection, COLLECTIONS
+from services.college_finder import COLLEGES_DATASET, COLLEGE_NORMALIZED_FIELDS, college_derived_fields
+from services.course_suggestion import COURSES_DATASET
+from services.course_offerings import college_rating
+from services.data_version import bump_data_version
+from services.geo_index import most_common_point
+from services.query_builder import add_search_fields, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Abbreviations used by the course data, expanded before names are compared
+NAME_ABBREVIATIONS = {
+    'govt': 'government',
+    'gmc': 'government medical college',
+    'gcet': 'government college engineering technology',
+    'smvdu': 'shri mata vaishno devi university'
+}
+NAME_STOPWORDS = {'of', 'for', 'and', 'the', 'in', 'at'}
+
+# Course-data college names that token matching cannot resolve -> College_ID
+COLLEGE_NAME_ALIASES = {
+    'aiims jammu': 'J-MED-01'
+}
+
+# Share of a course-side name's tokens that must appear in a college's tokens
+MIN_NAME_COVERAGE = 1.0
+
+MINTED_ID_PREFIX = 'C-'
+
+_WORD = re.compile(r'[^\W_]+')
+_ACRONYM = re.compile(r'\(([^)]+)\)')
+
+
+def name_tokens(name: Any) -> Set[str]:
+    """Comparable tokens of a college name: normalized, abbreviations expanded, stopwords dropped"""
+    tokens = set()
+    for word in _WORD.findall(normalize_text(name) or ''):
+        expansion = NAME_ABBREVIATIONS.get(word, word)
+        tokens.update(expansion.split())
+    return tokens - NAME_STOPWORDS
+
+
+def college_tokens(college: Dict[str, Any]) -> Set[str]:
+    """Tokens a course-side name may use for a college: name, acronyms and place"""
+    name = college.get('College_Name') or ''
+    tokens = name_tokens(name)
+    for acronym in _ACRONYM.findall(name):
+        tokens |= name_tokens(acronym)
+    for field in ('Location_City', 'District'):
+        tokens |= name_tokens(college.get(field))
+    return tokens
+
+
+def minted_college_id(name: str) -> str:
+    """Stable id for a college known only from course data"""
+    slug = '-'.join(_WORD.findall(normalize_text(name) or '')).upper()
+    return f'{MINTED_ID_PREFIX}{slug}'
+
+
+class CollegeNameMatcher:
+    """Resolves free-form college names to College_IDs.
+
+    Names are tried as an exact normalized match, then an explicit alias, then
+    by token coverage: the college whose name, acronyms and city contain every
+    token of the course-side name wins, provided no other college ties.
+    """
+
+    def __init__(self, colleges: Iterable[Dict[str, Any]]):
+        self.by_name: Dict[str, str] = {}
+        self.tokens: Dict[str, Set[str]] = {}
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        for college in colleges:
+            college_id = college['College_ID']
+            self.by_name[normalize_text(college.get('College_Name'))] = college_id
+            self.tokens[college_id] = college_tokens(college)
+            for token in self.tokens[college_id]:
+                self.postings[token].add(college_id)
+
+    def resolve(self, name: str) -> Tuple[Optional[str], str]:
+        """(College_ID or None, how it was resolved)"""
+        normalized = normalize_text(name)
+        if normalized in self.by_name:
+            return self.by_name[normalized], 'exact'
+        if normalized in COLLEGE_NAME_ALIASES:
+            return COLLEGE_NAME_ALIASES[normalized], 'alias'
+
+        query = name_tokens(name)
+        if not query:
+            return None, 'unresolved'
+        overlaps = Counter()
+        for token in query:
+            overlaps.update(self.postings.get(token, ()))
+        if not overlaps:
+            return None, 'unresolved'
+
+        ranked = overlaps.most_common(2)
+        best_id, best_overlap = ranked[0]
+        tied = len(ranked) > 1 and ranked[1][1] == best_overlap
+        if best_overlap / len(query) >= MIN_NAME_COVERAGE and not tied:
+            return best_id, 'tokens'
+        return None, 'unresolved'
+
+
+def college_location(rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """GeoJSON point for a college: the most common valid coordinate pair among its course rows"""
+    point = most_common_point((row.get('Latitude'), row.get('Longitude')) for row in rows)
+    if point is None:
+        return None
+    latitude, longitude = point
+    return {'type': 'Point', 'coordinates': [longitude, latitude]}
+
+
+def course_summary(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Denormalized course entry stored on its college"""
+    return {
+        'course_id': str(row['_id']),
+        'course_name': row.get('Course_Name'),
+        'degree_level': row.get('Degree_Level'),
+        'riasec_trait': row.get('RIASEC_Trait'),
+        'potential_professions': row.get('Potential_Professions'),
+        'course_rating': row.get('Course_Rating_Placeholder')
+    }
+
+
+def link_courses_to_colleges(batch_size: int = 500) -> Dict[str, Any]:
+    """Attach every course row to a college id and write coordinates, ratings and course lists onto colleges"""
+    colleges_collection = get_collection(COLLECTIONS['colleges'])
+    courses_collection = get_collection(COLLECTIONS['courses'])
+
+    matcher = CollegeNameMatcher(colleges_collection.find(
+        {}, {'College_ID': 1, 'College_Name': 1, 'Location_City': 1, 'District': 1}
+    ))
+
+    rows_by_name = defaultdict(list)
+    for row in courses_collection.find({}, {'_search': 0}):
+        if row.get('College_Name'):
+            rows_by_name[row['College_Name']].append(row)
+
+    resolutions = {}
+    rows_by_college = defaultdict(list)
+    minted_names = {}
+    for name, rows in rows_by_name.items():
+        college_id, method = matcher.resolve(name)
+        if college_id is None:
+            # Known only from course data: mint a minimal college document
+            college_id, method = minted_college_id(name), 'minted'
+            minted_names[college_id] = name
+        resolutions[name] = {'college_id': college_id, 'method': method}
+        rows_by_college[college_id].extend(rows)
+
+    college_updates = []
+    course_updates = []
+    now = datetime.utcnow()
+    for college_id, rows in rows_by_college.items():
+        linked = {
+            'courses': [course_summary(row) for row in rows],
+            'course_data_names': sorted({row['College_Name'] for row in rows}),
+            'updated_at': now
+        }
+        location = college_location(rows)
+        if location:
+            linked['location'] = location
+        rating = college_rating(rows)
+        if rating is not None:
+            linked['college_rating'] = rating
+        update = {'$set': linked}
+        if college_id in minted_names:
+            # Known only from course data: the same upsert creates a minimal college document
+            minted = {
+                '_id': college_id, 'College_ID': college_id, 'College_Name': minted_names[college_id],
+                'source': 'courses', 'created_at': now
+            }
+            minted.update(college_derived_fields(minted))
+            add_search_fields(minted, COLLEGE_NORMALIZED_FIELDS)
+            update['$setOnInsert'] = minted
+        # Colleges loaded before ids were keyed by College_ID still carry ObjectId _ids
+        college_updates.append(UpdateOne({'College_ID': college_id}, update, upsert=college_id in minted_names))
+        course_updates.extend(
+            UpdateOne({'_id': row['_id']}, {'$set': {'college_id': college_id}}) for row in rows
+        )
+
+    # Colleges that no longer match any course row drop their stale course lists
+    college_updates.append(UpdateMany(
+        {'College_ID': {'$nin': list(rows_by_college)}, 'courses': {'$exists': True}},
+        {'$unset': {'courses': '', 'course_data_names': ''}, '$set': {'updated_at': now}}
+    ))
+
+    for collection, operations in (
+        (colleges_collection, college_updates),
+        (courses_collection, course_updates)
+    ):
+        for start in range(0, len(operations), batch_size):
+            collection.bulk_write(operations[start:start + batch_size], ordered=False)
+
+    ensure_link_indexes()
+    bump_data_version(COLLEGES_DATASET)
+    bump_data_version(COURSES_DATASET)
+
+    summary = Counter(resolution['method'] for resolution in resolutions.values())
+    logger.info(f"Linked {len(rows_by_name)} course-data colleges: {dict(summary)}")
+    return {'resolutions': resolutions, 'summary': dict(summary)}
+
+
+def ensure_link_indexes() -> None:
+    """Geo index on college locations, the College_ID link key and the course -> college reference"""
+    get_collection(COLLECTIONS['colleges']).create_index([('location', '2dsphere')])
+    get_collection(COLLECTIONS['colleges']).create_index('College_ID')
+    get_collection(COLLECTIONS['courses']).create_index('college_id')
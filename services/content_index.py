@@ -0,0 +1,229 @@
+"""
+Content Index
+TF-IDF vectors over document text for cosine-similarity ranking, persisted to MongoDB and extended incrementally
+"""
+
+import hashlib
+import logging
+import uuid
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from database import get_collection, COLLECTIONS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_FEATURES = 20000
+
+# Refit the vocabulary once documents added after the last fit reach this share of the fitted set;
+# until then new documents are vectorized with the fitted vocabulary and idf
+REFIT_RATIO = 0.25
+
+# Matrix rows are persisted in chunk documents of at most this many stored values (12 bytes each),
+# well under MongoDB's 16 MB document limit
+CHUNK_MAX_NONZEROS = 500000
+
+
+def _vectorizer(vocabulary: Optional[Dict[str, int]] = None) -> TfidfVectorizer:
+    return TfidfVectorizer(
+        stop_words='english', sublinear_tf=True, max_features=DEFAULT_MAX_FEATURES, vocabulary=vocabulary
+    )
+
+
+class ContentIndex:
+    """L2-normalized TF-IDF rows, one per document id, so cosine similarity is a sparse dot product.
+
+    ``fit`` learns the vocabulary and idf from a corpus. ``add`` appends rows for
+    new documents, or re-vectorizes documents whose text changed, without
+    refitting; ``needs_refit`` reports when enough were added that the idf no
+    longer reflects the corpus. A hash of each document's indexed text is kept
+    so ``changed`` can find rows that are out of date.
+    """
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = list(fields)
+        self.vectorizer: Optional[TfidfVectorizer] = None
+        self.ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.hashes: List[str] = []
+        self.matrix = sparse.csr_matrix((0, 0))
+        self.fitted_size = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def text(self, document: Dict[str, Any]) -> str:
+        """Indexed text of a document: its fields joined"""
+        return ' '.join(str(document.get(field) or '') for field in self.fields)
+
+    def text_hash(self, document: Dict[str, Any]) -> str:
+        """Digest of a document's indexed text"""
+        return hashlib.sha256(self.text(document).encode('utf-8')).hexdigest()[:32]
+
+    def changed(self, documents: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Indexed ids whose document text differs from when it was vectorized"""
+        return [
+            doc_id for doc_id, document in documents.items()
+            if doc_id in self.positions and self.hashes[self.positions[doc_id]] != self.text_hash(document)
+        ]
+
+    def fit(self, ids: Sequence[str], documents: Iterable[Dict[str, Any]]) -> 'ContentIndex':
+        """Learn vocabulary and idf from documents and index them"""
+        documents = list(documents)
+        texts = [self.text(document) for document in documents]
+        self.vectorizer = _vectorizer()
+        try:
+            self.matrix = self.vectorizer.fit_transform(texts).tocsr()
+        except ValueError:
+            # Nothing but stopwords or no documents: an empty vocabulary
+            self.vectorizer = None
+            self.matrix = sparse.csr_matrix((len(texts), 0))
+        self.ids = list(ids)
+        self.positions = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        self.hashes = [self.text_hash(document) for document in documents]
+        self.fitted_size = len(self.ids)
+        return self
+
+    def add(self, ids: Sequence[str], documents: Iterable[Dict[str, Any]]) -> 'ContentIndex':
+        """Vectorize documents with the fitted vocabulary and idf; rows of ids already indexed are replaced"""
+        documents = list(documents)
+        rows = self.vectorize([self.text(document) for document in documents])
+        replaced = [self.positions[doc_id] for doc_id in ids if doc_id in self.positions]
+        if replaced:
+            keep = np.ones(len(self.ids), dtype=bool)
+            keep[replaced] = False
+            self.matrix = self.matrix[keep]
+            self.ids = [doc_id for doc_id, kept in zip(self.ids, keep) if kept]
+            self.hashes = [digest for digest, kept in zip(self.hashes, keep) if kept]
+        self.matrix = sparse.vstack([self.matrix, rows], format='csr')
+        self.ids.extend(ids)
+        self.hashes.extend(self.text_hash(document) for document in documents)
+        self.positions = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        return self
+
+    def needs_refit(self, adding: int = 0) -> bool:
+        """Whether the idf is stale after ``adding`` more documents"""
+        added = len(self.ids) + adding - self.fitted_size
+        return self.vectorizer is None or added > REFIT_RATIO * max(self.fitted_size, 1)
+
+    def vectorize(self, texts: Sequence[str]) -> sparse.csr_matrix:
+        """TF-IDF rows for arbitrary texts in the index's term space"""
+        if self.vectorizer is None:
+            return sparse.csr_matrix((len(texts), self.matrix.shape[1]))
+        return self.vectorizer.transform(texts).tocsr()
+
+    def similarities(self, query: sparse.spmatrix, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of indexed rows (all, or ``rows``) to each query row, shaped (rows, queries)"""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        return np.asarray((matrix @ query.T).todense())
+
+    def to_document(self) -> Dict[str, Any]:
+        """Serializable vocabulary and idf; the rows are serialized by ``to_chunks``"""
+        vocabulary = self.vectorizer.vocabulary_ if self.vectorizer is not None else {}
+        terms = [None] * len(vocabulary)
+        for term, column in vocabulary.items():
+            terms[column] = term
+        return {
+            'fields': self.fields,
+            'terms': terms,
+            'idf': self.vectorizer.idf_.tolist() if self.vectorizer is not None else [],
+            'fitted_size': self.fitted_size,
+            'shape': list(self.matrix.shape)
+        }
+
+    def to_chunks(self, max_nonzeros: int = CHUNK_MAX_NONZEROS) -> Iterator[Dict[str, Any]]:
+        """Consecutive runs of rows, each holding at most ``max_nonzeros`` stored values (or one row)"""
+        indptr = self.matrix.indptr
+        start = 0
+        while start < len(self.ids):
+            end = max(start + 1, int(np.searchsorted(indptr, indptr[start] + max_nonzeros, side='right')) - 1)
+            end = min(end, len(self.ids))
+            values = slice(indptr[start], indptr[end])
+            yield {
+                'ids': self.ids[start:end],
+                'hashes': self.hashes[start:end],
+                'data': self.matrix.data[values].astype(np.float64).tobytes(),
+                'indices': self.matrix.indices[values].astype(np.int32).tobytes(),
+                'indptr': (indptr[start:end + 1] - indptr[start]).astype(np.int64).tobytes()
+            }
+            start = end
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any], chunks: Iterable[Dict[str, Any]]) -> 'ContentIndex':
+        """Restore an index saved with ``to_document`` and ``to_chunks``"""
+        index = cls(document['fields'])
+        if document['terms']:
+            index.vectorizer = _vectorizer({term: column for column, term in enumerate(document['terms'])})
+            index.vectorizer.idf_ = np.asarray(document['idf'], dtype=np.float64)
+        rows = []
+        for chunk in chunks:
+            index.ids.extend(chunk['ids'])
+            index.hashes.extend(chunk['hashes'])
+            indptr = np.frombuffer(chunk['indptr'], dtype=np.int64)
+            rows.append(sparse.csr_matrix(
+                (np.frombuffer(chunk['data'], dtype=np.float64), np.frombuffer(chunk['indices'], dtype=np.int32),
+                 indptr),
+                shape=(len(indptr) - 1, document['shape'][1])
+            ))
+        if len(index.ids) != document['shape'][0] or len(index.hashes) != len(index.ids):
+            raise ValueError(f"expected {document['shape'][0]} rows, found {len(index.ids)}")
+        index.positions = {doc_id: row for row, doc_id in enumerate(index.ids)}
+        index.fitted_size = document['fitted_size']
+        index.matrix = (
+            sparse.vstack(rows, format='csr') if rows else sparse.csr_matrix(tuple(document['shape']))
+        )
+        return index
+
+
+def save_content_index(name: str, index: ContentIndex, data_version: Optional[str]) -> None:
+    """Persist an index under ``name`` with the data version it reflects.
+
+    Rows go to chunk documents tagged with a fresh generation; the header is
+    switched to that generation once every chunk is written, then the chunks
+    of earlier generations are removed.
+    """
+    chunks_collection = get_collection(COLLECTIONS['content_index_chunks'])
+    generation = uuid.uuid4().hex
+    chunk_count = 0
+    for chunk_count, chunk in enumerate(index.to_chunks(), start=1):
+        chunk.update({'index': name, 'generation': generation, 'chunk': chunk_count - 1})
+        chunks_collection.insert_one(chunk)
+
+    document = index.to_document()
+    document.update({
+        'generation': generation,
+        'chunks': chunk_count,
+        'data_version': data_version,
+        'updated_at': datetime.utcnow()
+    })
+    get_collection(COLLECTIONS['content_indexes']).replace_one({'_id': name}, document, upsert=True)
+    chunks_collection.delete_many({'index': name, 'generation': {'$ne': generation}})
+    ensure_content_index_indexes()
+
+
+def load_content_index(name: str) -> Optional[ContentIndex]:
+    """Persisted index saved under ``name``, if any"""
+    document = get_collection(COLLECTIONS['content_indexes']).find_one({'_id': name})
+    if not document:
+        return None
+    try:
+        chunks = list(get_collection(COLLECTIONS['content_index_chunks']).find(
+            {'index': name, 'generation': document['generation']}
+        ).sort('chunk', 1))
+        if len(chunks) != document['chunks']:
+            raise ValueError(f"expected {document['chunks']} chunks, found {len(chunks)}")
+        return ContentIndex.from_document(document, chunks)
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Discarding unreadable content index {name}: {e}")
+        return None
+
+
+def ensure_content_index_indexes() -> None:
+    """Index used to read an index's chunks in order"""
+    get_collection(COLLECTIONS['content_index_chunks']).create_index(
+        [('index', 1), ('generation', 1), ('chunk', 1)]
+    )
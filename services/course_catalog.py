@@ -0,0 +1,183 @@
+"""
+Course Catalog
+Columnar NumPy view of the course collection for vectorized recommendation scoring
+"""
+
+import logging
+from typing import Callable, Dict, Iterable, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.geo_index import EARTH_RADIUS_KM
+from services.query_builder import normalize_text
+from services.question_bank import RIASEC_TYPES, TRAIT_INDEX, TRAIT_LETTERS, scores_to_vector
+
+logger = logging.getLogger(__name__)
+
+# Match score weights (see course_suggestion.calculate_match_score)
+TRAIT_WEIGHT = 0.6
+KEYWORD_WEIGHT = 0.15
+COURSE_RATING_WEIGHT = 25
+COLLEGE_RATING_WEIGHT = 15
+
+DEFAULT_TOP_K = 20
+
+# Similarity between two courses for diversity reranking, summed over shared features
+SAME_COLLEGE_SIMILARITY = 0.6
+SAME_COURSE_SIMILARITY = 0.3
+SAME_TRAIT_SIMILARITY = 0.1
+
+
+def _float_column(courses: List[Dict[str, Any]], field: str) -> np.ndarray:
+    column = np.zeros(len(courses), dtype=np.float64)
+    for i, course in enumerate(courses):
+        try:
+            column[i] = float(course.get(field) or 0)
+        except (TypeError, ValueError):
+            pass
+    return np.nan_to_num(column)
+
+
+def _codes(keys: List[str]) -> np.ndarray:
+    """Integer code per key, equal keys sharing a code; empty keys get -1"""
+    if not keys:
+        return np.empty(0, dtype=np.intp)
+    keys = np.array(keys, dtype=object)
+    codes = np.unique(keys, return_inverse=True)[1].astype(np.intp)
+    codes[keys == ''] = -1
+    return codes
+
+
+def _same_code(codes: np.ndarray, candidates: np.ndarray, course: int) -> np.ndarray:
+    """Whether each candidate shares the course's code; an unknown (-1) code matches nothing"""
+    return (codes[candidates] == codes[course]) & (codes[course] >= 0)
+
+
+def haversine_km(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distances from one point to arrays of points"""
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class CourseCatalog:
+    """Courses held as parallel arrays so a student is scored against all of them at once.
+
+    ``trait_matrix`` one-hot encodes each course's RIASEC_Trait and
+    ``keyword_matrix`` marks the other traits whose letters ``keyword_traits``
+    reports for the course, so the RIASEC part of the match score is two (n x 6) @ (6,) products.
+    """
+
+    def __init__(self, courses: List[Dict[str, Any]], points: Sequence[Optional[Tuple[float, float]]],
+                 keyword_traits: Callable[[Dict[str, Any]], Iterable[str]]):
+        if len(courses) != len(points):
+            raise ValueError("Courses and points must have the same length")
+        self.courses = courses
+        n = len(courses)
+
+        self.trait_matrix = np.zeros((n, len(RIASEC_TYPES)), dtype=np.float64)
+        self.keyword_matrix = np.zeros((n, len(RIASEC_TYPES)), dtype=np.float64)
+        for i, course in enumerate(courses):
+            own_trait = TRAIT_LETTERS.get(course.get('RIASEC_Trait'))
+            if own_trait:
+                self.trait_matrix[i, TRAIT_INDEX[own_trait]] = 1.0
+            for letter in keyword_traits(course):
+                trait = TRAIT_LETTERS.get(letter)
+                if trait and trait != own_trait:
+                    self.keyword_matrix[i, TRAIT_INDEX[trait]] = 1.0
+
+        self.course_rating = _float_column(courses, 'Course_Rating_Placeholder')
+        self.college_rating = _float_column(courses, 'College_Rating_Placeholder')
+        self.base_score = self.course_rating * COURSE_RATING_WEIGHT + self.college_rating * COLLEGE_RATING_WEIGHT
+        self.college_ids = np.array([c.get('college_id') or '' for c in courses], dtype=object)
+
+        self.latitudes = np.array([p[0] if p else np.nan for p in points], dtype=np.float64)
+        self.longitudes = np.array([p[1] if p else np.nan for p in points], dtype=np.float64)
+
+        # Similarity features for diversity reranking
+        self.college_codes = _codes([
+            c.get('college_id') or normalize_text(c.get('College_Name')) or '' for c in courses
+        ])
+        self.course_codes = _codes([normalize_text(c.get('Course_Name')) or '' for c in courses])
+        self.trait_codes = np.where(self.trait_matrix.any(axis=1), self.trait_matrix.argmax(axis=1), -1)
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    def riasec_weights(self, riasec_scores: Dict[str, Any]) -> np.ndarray:
+        """Trait score vector for a student's RIASEC scores"""
+        return scores_to_vector(riasec_scores)
+
+    def scores(self, weights: np.ndarray) -> np.ndarray:
+        """Match scores for one (6,) trait vector, or (m, n) scores for an (m, 6) matrix"""
+        riasec = weights @ self.trait_matrix.T * TRAIT_WEIGHT + weights @ self.keyword_matrix.T * KEYWORD_WEIGHT
+        return riasec + self.base_score
+
+    def in_colleges(self, college_ids: Iterable[str]) -> np.ndarray:
+        """Courses linked to any of the given colleges"""
+        return np.isin(self.college_ids, list(college_ids))
+
+    def distances_km(self, latitude: float, longitude: float) -> np.ndarray:
+        """Great-circle distance from a point to every course (NaN where unknown)"""
+        return haversine_km(latitude, longitude, self.latitudes, self.longitudes)
+
+    def top_k(self, scores: np.ndarray, mask: Optional[np.ndarray] = None, k: int = DEFAULT_TOP_K) -> np.ndarray:
+        """Indices of the k best eligible scores, best first"""
+        eligible = np.flatnonzero(mask) if mask is not None else np.arange(len(scores))
+        if len(eligible) == 0 or k <= 0:
+            return eligible[:0]
+        k = min(k, len(eligible))
+        top = eligible[np.argpartition(-scores[eligible], k - 1)[:k]]
+        return top[np.lexsort((top, -scores[top]))]
+
+    def top_k_rows(self, scores: np.ndarray, masks: np.ndarray, k: int = DEFAULT_TOP_K) -> List[np.ndarray]:
+        """Per-row indices of the k best eligible scores in an (m, n) score matrix, best first"""
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            return [np.empty(0, dtype=np.intp) for _ in range(scores.shape[0])]
+        masked = np.where(masks, scores, -np.inf)
+        top = np.argpartition(-masked, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(masked, top, axis=1)
+        top = np.take_along_axis(top, np.lexsort((top, -top_scores)), axis=1)
+        return [row[masks[r, row]] for r, row in enumerate(top)]
+
+    def similarity_to(self, candidates: np.ndarray, course: int) -> np.ndarray:
+        """Similarity of each candidate row to one course"""
+        return (
+            SAME_COLLEGE_SIMILARITY * _same_code(self.college_codes, candidates, course)
+            + SAME_COURSE_SIMILARITY * _same_code(self.course_codes, candidates, course)
+            + SAME_TRAIT_SIMILARITY * _same_code(self.trait_codes, candidates, course)
+        )
+
+    def diverse_top_k(self, scores: np.ndarray, mask: Optional[np.ndarray] = None, k: int = DEFAULT_TOP_K,
+                      diversity: float = 0.0) -> np.ndarray:
+        """Indices of k eligible courses chosen by maximal marginal relevance, in pick order.
+
+        Each step picks the candidate maximizing
+        ``(1 - diversity) * relevance - diversity * max similarity to those already picked``,
+        with relevance min-max scaled over the eligible courses. The running max
+        similarity is updated with one vector operation per pick, so the cost is O(k * n).
+        """
+        if diversity <= 0:
+            return self.top_k(scores, mask, k)
+        candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(scores))
+        k = min(k, len(candidates))
+        if k <= 0:
+            return candidates[:0]
+
+        relevance = scores[candidates]
+        span = relevance.max() - relevance.min()
+        relevance = (relevance - relevance.min()) / span if span > 0 else np.ones(len(candidates))
+        relevance *= 1 - diversity
+
+        max_similarity = np.zeros(len(candidates))
+        available = np.ones(len(candidates), dtype=bool)
+        picked = []
+        for _ in range(k):
+            marginal = np.where(available, relevance - diversity * max_similarity, -np.inf)
+            best = int(np.argmax(marginal))
+            picked.append(best)
+            available[best] = False
+            np.maximum(max_similarity, self.similarity_to(candidates, candidates[best]), out=max_similarity)
+        return candidates[picked]
@@ -0,0 +1,109 @@
+"""
+Course Offerings
+College join cache that fills linked course rows' college columns from the college documents at read time
+"""
+
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+from database import get_collection, COLLECTIONS
+from services.college_finder import COLLEGES_DATASET
+from services.data_version import get_data_version
+from services.query_builder import SEARCH_FIELD
+
+logger = logging.getLogger(__name__)
+
+# Course-row columns that describe the college; linked rows take them from the join
+COLLEGE_COLUMNS = ['College_Name', 'Latitude', 'Longitude', 'College_Rating_Placeholder']
+
+# Current college join table and the colleges data version it was built from
+_join: Optional[Dict[str, Any]] = None
+_join_lock = threading.Lock()
+
+
+def college_rating(rows: List[Dict[str, Any]]) -> Optional[float]:
+    """One rating for a college from the placeholder repeated on its course rows"""
+    ratings = []
+    for row in rows:
+        try:
+            ratings.append(float(row.get('College_Rating_Placeholder')))
+        except (TypeError, ValueError):
+            continue
+    ratings = [rating for rating in ratings if rating == rating]
+    return round(sum(ratings) / len(ratings), 1) if ratings else None
+
+
+def college_summary(college: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields shipped once per college alongside the courses that reference it"""
+    coordinates = (college.get('location') or {}).get('coordinates') or [None, None]
+    return {
+        'college_id': college.get('College_ID'),
+        'college_name': college.get('College_Name'),
+        'college_type': college.get('College_Type'),
+        'city': college.get('Location_City'),
+        'district': college.get('District'),
+        'latitude': coordinates[1],
+        'longitude': coordinates[0],
+        'college_rating': college.get('college_rating')
+    }
+
+
+def build_college_join() -> Dict[str, Any]:
+    """Load the college_id -> summary join table from MongoDB"""
+    global _join
+    version = get_data_version(COLLEGES_DATASET)
+    colleges = get_collection(COLLECTIONS['colleges']).find({}, {
+        'College_ID': 1, 'College_Name': 1, 'College_Type': 1, 'Location_City': 1, 'District': 1,
+        'location': 1, 'college_rating': 1
+    })
+    join = {
+        'version': version,
+        'colleges': {college['College_ID']: college_summary(college) for college in colleges if college.get('College_ID')}
+    }
+    with _join_lock:
+        _join = join
+    return join
+
+
+def get_college_join() -> Dict[str, Dict[str, Any]]:
+    """College summaries by id for the current colleges data version, rebuilt when it changes"""
+    join = _join
+    if join is None or join['version'] != get_data_version(COLLEGES_DATASET):
+        join = build_college_join()
+    return join['colleges']
+
+
+def hydrate_course(row: Dict[str, Any], colleges: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Linked course row with its college columns filled from the join"""
+    course = dict(row)
+    college = colleges.get(row.get('college_id')) or {}
+    course['College_Name'] = college.get('college_name')
+    course['Latitude'] = college.get('latitude')
+    course['Longitude'] = college.get('longitude')
+    course['College_Rating_Placeholder'] = college.get('college_rating')
+    return course
+
+
+def load_hydrated_courses() -> List[Dict[str, Any]]:
+    """Every course row, linked rows joined to their college by college_id"""
+    courses = list(get_collection(COLLECTIONS['courses']).find({}, {SEARCH_FIELD: 0}))
+    if not any(course.get('college_id') for course in courses):
+        return courses
+    colleges = get_college_join()
+    return [hydrate_course(course, colleges) if course.get('college_id') else course for course in courses]
+
+
+def split_colleges(courses: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Strip repeated college columns from linked courses and return them once per college"""
+    join = get_college_join()
+    colleges = {}
+    compact = []
+    for course in courses:
+        college_id = course.get('college_id')
+        if college_id not in join:
+            compact.append(course)
+            continue
+        colleges.setdefault(college_id, join[college_id])
+        compact.append({key: value for key, value in course.items() if key not in COLLEGE_COLUMNS})
+    return compact, colleges
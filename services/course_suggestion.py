@@ -3,18 +3,247 @@ Course Suggestion Service - NoSQL Version
 Provides course recommendations based on RIASEC traits with MongoDB storage
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, FrozenSet, Iterator, List, Any, Optional
 from database import get_collection, COLLECTIONS
+from cache import serialize_json
+from services.query_builder import (
+    add_search_fields, any_field_clause, parse_match_mode, normalize_text, public_projection
+)
+from services.data_version import bump_data_version, get_data_version
+from services.geo_index import GeoIndex, most_common_point, parse_geo_query
+from services.text_search import PrefixIndex, DEFAULT_SUGGEST_LIMIT
+from services.college_finder import COLLEGES_DATASET
+from services.course_offerings import get_college_join, load_hydrated_courses, split_colleges
+from services.keyword_matcher import KEYWORD_TRAITS_FIELD, KeywordMatcher, add_keyword_traits, cached_traits
+from services.course_catalog import (
+    CourseCatalog, DEFAULT_TOP_K, TRAIT_WEIGHT, KEYWORD_WEIGHT, COURSE_RATING_WEIGHT, COLLEGE_RATING_WEIGHT
+)
+from services.question_bank import RIASEC_TYPES
+from pymongo import UpdateOne
+import numpy as np
 import pandas as pd
 import os
+import re
+import threading
+import time
 from geopy.distance import geodesic
 
 logger = logging.getLogger(__name__)
 
 course_suggestion_bp = Blueprint('course_suggestion', __name__)
 
+# Fields searched by /courses/search
+COURSE_SEARCH_FIELDS = ['Course_Name', 'College_Name', 'Potential_Professions']
+
+# Every field with a normalized search copy
+COURSE_NORMALIZED_FIELDS = COURSE_SEARCH_FIELDS
+
+# /recommend location and preference filters, matched against the linked college's summary
+COURSE_COLLEGE_FILTERS = ['district', 'city', 'college_type']
+
+# Derived fields kept for queries and scoring only, hidden from responses
+COURSE_INTERNAL_FIELDS = [KEYWORD_TRAITS_FIELD, 'profession_keys']
+COURSE_PUBLIC_PROJECTION = public_projection(*COURSE_INTERNAL_FIELDS)
+
+# Data version key for the courses collection
+COURSES_DATASET = 'courses'
+
+MAX_SUGGEST_LIMIT = 20
+MAX_RECOMMEND_LIMIT = 100
+
+# Roster size accepted by /recommend/batch, and score matrix cells computed at once
+MAX_BATCH_STUDENTS = 1000
+BATCH_SCORE_CELLS = 4_000_000
+
+# Weight of diversity against relevance when reranking; 0 ranks purely by match score
+DEFAULT_DIVERSITY = 0.0
+
+# Potential_Professions is comma-joined; "Scientist (Physicist)" and "Writer/Author" also
+# answer to each of their alternatives
+_PARENTHETICAL = re.compile(r'^(.*?)\s*\(([^)]+)\)$')
+
+# Punctuation and spacing dropped from course names when grouping typeahead suggestions
+_NON_ALPHANUMERIC = re.compile(r'[\W_]+')
+
+def parse_professions(value: Any) -> List[str]:
+    """Distinct profession names in a Potential_Professions value"""
+    if not isinstance(value, str):
+        return []
+    names = {}
+    for part in value.split(','):
+        name = ' '.join(part.split())
+        if name:
+            names.setdefault(normalize_text(name), name)
+    return list(names.values())
+
+def profession_keys(name: str) -> List[str]:
+    """Normalized lookup keys for a profession: the full name plus its alternatives"""
+    key = normalize_text(name)
+    keys = [key]
+    match = _PARENTHETICAL.match(key)
+    if match:
+        keys.extend(match.groups())
+    elif '/' in key and ' ' not in key:
+        keys.extend(key.split('/'))
+    return list(dict.fromkeys(alternative.strip() for alternative in keys if alternative.strip()))
+
+def suggestion_key(name: str) -> str:
+    """Typeahead grouping key for a course name, ignoring case, punctuation and spacing"""
+    return _NON_ALPHANUMERIC.sub('', normalize_text(name))
+
+def course_derived_fields(course: Dict[str, Any]) -> Dict[str, Any]:
+    """Queryable fields computed from a course's raw CSV columns"""
+    professions = parse_professions(course.get('Potential_Professions'))
+    return {
+        'professions': professions,
+        'profession_keys': sorted({key for name in professions for key in profession_keys(name)})
+    }
+
+def backfill_course_fields(batch_size: int = 500) -> int:
+    """Recompute derived fields for courses loaded before they existed"""
+    courses_collection = get_collection(COLLECTIONS['courses'])
+    operations = []
+    updated = 0
+    for course in courses_collection.find({}, {'Potential_Professions': 1}):
+        operations.append(UpdateOne({'_id': course['_id']}, {'$set': course_derived_fields(course)}))
+        if len(operations) >= batch_size:
+            updated += courses_collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += courses_collection.bulk_write(operations, ordered=False).modified_count
+    logger.info(f"Backfilled derived fields for {updated} courses")
+    if updated:
+        bump_data_version(COURSES_DATASET)
+    return updated
+
+# Current in-memory indexes and the courses/colleges data versions they were built from
+_indexes: Optional[Dict[str, Any]] = None
+_index_lock = threading.Lock()
+
+def build_course_indexes() -> Dict[str, Any]:
+    """Build the course typeahead, geo, scoring and profession indexes from MongoDB"""
+    global _indexes
+    version = _indexes_version()
+    # Course rows joined to their colleges once linked, raw rows before that
+    courses = load_hydrated_courses()
+    
+    offerings = {}
+    rows_by_college = {}
+    for course in courses:
+        rows_by_college.setdefault(_college_key(course), []).append(course)
+        name = course.get('Course_Name')
+        if not name:
+            continue
+        # Spelling variants such as "B.COM", "B.Com" and "BCom" share one suggestion
+        entry = offerings.setdefault(suggestion_key(name), {'name': name, 'ids': [], 'colleges': set()})
+        entry['ids'].append(str(course['_id']))
+        entry['colleges'].add(course.get('College_Name'))
+    
+    # Every course is placed at its college's most common valid coordinates, for /nearby
+    # and recommendation distances alike
+    college_points = {}
+    located = []
+    points = []
+    for college, rows in rows_by_college.items():
+        point = most_common_point((row.get('Latitude'), row.get('Longitude')) for row in rows)
+        if point is None:
+            continue
+        college_points[college] = point
+        for row in rows:
+            located.append({key: value for key, value in row.items() if key != '_id'})
+            points.append(point)
+    
+    catalog_courses = [{key: value for key, value in course.items() if key != '_id'} for course in courses]
+    catalog_points = [college_points.get(_college_key(course)) for course in courses]
+    
+    # Inverted profession -> catalog rows index; names keep the first spelling seen
+    profession_rows = {}
+    profession_names = {}
+    for row, course in enumerate(catalog_courses):
+        for name in course.get('professions') or parse_professions(course.get('Potential_Professions')):
+            profession_names.setdefault(normalize_text(name), name)
+            for key in profession_keys(name):
+                rows = profession_rows.setdefault(key, [])
+                if not rows or rows[-1] != row:
+                    rows.append(row)
+    
+    catalog = CourseCatalog(catalog_courses, catalog_points, course_keyword_traits)
+    # The catalog holds keyword traits in its matrix; served documents drop the internal fields
+    for course in catalog_courses + located:
+        for field in COURSE_INTERNAL_FIELDS:
+            course.pop(field, None)
+    
+    indexes = {
+        'version': version,
+        'suggest': PrefixIndex().build(
+            (entry['name'], {'name': entry['name'], 'ids': entry['ids'], 'college_count': len(entry['colleges'])})
+            for entry in offerings.values()
+        ),
+        'geo': GeoIndex(located, (p[0] for p in points), (p[1] for p in points)),
+        'catalog': catalog,
+        'professions': {'rows': profession_rows, 'names': profession_names}
+    }
+    with _index_lock:
+        _indexes = indexes
+    return indexes
+
+def _college_key(course: Dict[str, Any]) -> Any:
+    """Groups the course rows of one college: its id once linked, its name before"""
+    return course.get('college_id') or course.get('College_Name')
+
+def _indexes_version() -> tuple:
+    """Courses and colleges data versions; college ratings and locations are joined into courses"""
+    return get_data_version(COURSES_DATASET), get_data_version(COLLEGES_DATASET)
+
+def _course_indexes() -> Dict[str, Any]:
+    """In-memory indexes for the current courses and colleges data versions, rebuilt when either changes"""
+    indexes = _indexes
+    if indexes is None or indexes['version'] != _indexes_version():
+        indexes = build_course_indexes()
+    return indexes
+
+def get_course_suggest_index() -> PrefixIndex:
+    """Get the course typeahead index"""
+    return _course_indexes()['suggest']
+
+def get_course_geo_index() -> GeoIndex:
+    """Get the geo index over courses"""
+    return _course_indexes()['geo']
+
+def get_course_catalog() -> CourseCatalog:
+    """Get the columnar course catalog used for recommendation scoring"""
+    return _course_indexes()['catalog']
+
+def courses_for_profession(profession: str) -> List[Dict[str, Any]]:
+    """Courses whose Potential_Professions lead to a profession, from the inverted index"""
+    indexes = _course_indexes()
+    rows = indexes['professions']['rows'].get(normalize_text(profession), [])
+    return [indexes['catalog'].courses[row] for row in rows]
+
+def profession_course_counts(professions: List[str]) -> Dict[str, int]:
+    """Number of courses leading to each profession"""
+    rows = _course_indexes()['professions']['rows']
+    return {name: len(rows.get(normalize_text(name), ())) for name in professions}
+
+def prepare_course_document(course: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a course CSV row and attach timestamps and search fields"""
+    trait = course.get('RIASEC_Trait')
+    course['RIASEC_Trait'] = trait.strip().upper()[:1] or None if isinstance(trait, str) else None
+    add_keyword_traits(course, COURSE_KEYWORD_MATCHER, 'Course_Name')
+    course.update(course_derived_fields(course))
+    now = pd.Timestamp.now()
+    course['created_at'] = now
+    course['updated_at'] = now
+    add_search_fields(course, COURSE_NORMALIZED_FIELDS)
+    return course
+
+# Trait-first candidate index from before recommendations were scored in memory
+def ensure_course_indexes() -> None:
+    """Multikey profession index; recommendations scan the in-memory catalog and need none"""
+    get_collection(COLLECTIONS['courses']).create_index('profession_keys')
+
 def load_course_data_to_mongodb():
     """Load course data from CSV to MongoDB"""
     try:
@@ -49,9 +278,7 @@ def load_course_data_to_mongodb():
                     row['Longitude'] = float(row['Longitude'])
                     row['College_Rating_Placeholder'] = float(row['College_Rating_Placeholder'])
                     row['Course_Rating_Placeholder'] = float(row['Course_Rating_Placeholder'])
-                    row['created_at'] = pd.Timestamp.now()
-                    row['updated_at'] = pd.Timestamp.now()
-                    data.append(row)
+                    data.append(prepare_course_document(row))
                 except (ValueError, KeyError) as e:
                     logger.warning(f"Skipping row due to error: {e}")
                     continue
@@ -59,6 +286,7 @@ def load_course_data_to_mongodb():
         if data:
             courses_collection.insert_many(data)
             logger.info(f"Loaded {len(data)} courses into MongoDB")
+            bump_data_version(COURSES_DATASET)
         
     except Exception as e:
         logger.error(f"Error loading course data: {e}")
@@ -97,6 +325,19 @@ RIASEC_COURSE_MAPPING = {
     ]
 }
 
+# Trait letter used by the RIASEC_Trait column
+TRAIT_CODES = {trait: trait[0].upper() for trait in RIASEC_TYPES}
+
+# Keyword mapping compiled once, keyed by trait letter like RIASEC_Trait and the scholarship mapping;
+# a course name hit is a secondary signal to RIASEC_Trait
+COURSE_KEYWORD_MATCHER = KeywordMatcher(
+    {TRAIT_CODES[trait]: keywords for trait, keywords in RIASEC_COURSE_MAPPING.items()}
+)
+
+def course_keyword_traits(course: Dict[str, Any]) -> FrozenSet[str]:
+    """RIASEC letters whose keywords appear in a course's name"""
+    return cached_traits(course, COURSE_KEYWORD_MATCHER, 'Course_Name')
+
 @course_suggestion_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -119,77 +360,264 @@ def health_check():
             'error': str(e)
         }), 500
 
+def parse_recommend_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate one student's riasec_scores, location and preferences for recommendation"""
+    # Free-text locations such as "Mumbai" carry no usable filter and are ignored
+    location = profile.get('location') if isinstance(profile.get('location'), dict) else {}
+    preferences = profile.get('preferences') if isinstance(profile.get('preferences'), dict) else {}
+    
+    # Optional origin point for distance ranking
+    origin = None
+    radius_km = None
+    if location.get('latitude') is not None and location.get('longitude') is not None:
+        try:
+            origin = (float(location['latitude']), float(location['longitude']))
+            radius_km = float(location['radius_km']) if location.get('radius_km') else None
+        except (TypeError, ValueError):
+            raise ValueError('latitude, longitude and radius_km must be numbers')
+    
+    # Every college is in one state, so the course data has no state to filter on
+    if location.get('state'):
+        raise ValueError('location.state is not supported; filter by location.district or location.city')
+    
+    try:
+        min_rating = float(preferences['min_rating']) if preferences.get('min_rating') is not None else None
+    except (TypeError, ValueError):
+        raise ValueError('min_rating must be a number')
+    
+    return {
+        'riasec_scores': profile.get('riasec_scores') or {},
+        'origin': origin,
+        'radius_km': radius_km,
+        'district': location.get('district') or None,
+        'city': location.get('city') or None,
+        'college_type': preferences.get('college_type') or None,
+        'min_rating': min_rating
+    }
+
+def parse_recommend_limit(data: Dict[str, Any]) -> int:
+    """Number of recommendations per student"""
+    try:
+        return max(1, min(int(data.get('limit', DEFAULT_TOP_K)), MAX_RECOMMEND_LIMIT))
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+
+def parse_recommend_diversity(data: Dict[str, Any]) -> float:
+    """Diversity weight for maximal marginal relevance reranking"""
+    try:
+        diversity = float(data.get('diversity', DEFAULT_DIVERSITY) or 0)
+    except (TypeError, ValueError):
+        raise ValueError('diversity must be a number between 0 and 1')
+    if not 0 <= diversity <= 1:
+        raise ValueError('diversity must be a number between 0 and 1')
+    return diversity
+
+def profile_filter_key(profile: Dict[str, Any]) -> tuple:
+    """Profiles with equal keys share one eligibility mask"""
+    return tuple(profile[key] for key in COURSE_COLLEGE_FILTERS + ['min_rating', 'origin', 'radius_km'])
+
+def matching_college_ids(filters: Dict[str, str]) -> List[str]:
+    """Ids of the colleges whose summary fields equal every filter value"""
+    wanted = {field: normalize_text(value) for field, value in filters.items()}
+    return [
+        college_id for college_id, college in get_college_join().items()
+        if all(normalize_text(college.get(field)) == value for field, value in wanted.items())
+    ]
+
+def eligible_courses(catalog: CourseCatalog, profile: Dict[str, Any]) -> np.ndarray:
+    """Boolean mask of the courses a profile's location and preference filters allow"""
+    eligible = np.ones(len(catalog), dtype=bool)
+    
+    # District, city and college type are properties of the course's linked college
+    college_filters = {field: profile[field] for field in COURSE_COLLEGE_FILTERS if profile[field]}
+    if college_filters:
+        eligible &= catalog.in_colleges(matching_college_ids(college_filters))
+    
+    if profile['min_rating'] is not None:
+        eligible &= catalog.course_rating >= profile['min_rating']
+    
+    if profile['origin'] and profile['radius_km']:
+        with np.errstate(invalid='ignore'):
+            eligible &= catalog.distances_km(*profile['origin']) <= profile['radius_km']
+    return eligible
+
+def recommended_courses(catalog: CourseCatalog, scores: np.ndarray, indices: np.ndarray,
+                        origin: Optional[tuple]) -> List[Dict[str, Any]]:
+    """Course documents for ranked catalog rows, with match score and distance"""
+    courses = []
+    for i in indices:
+        course = dict(catalog.courses[i], match_score=round(float(scores[i]), 2))
+        if origin:
+            point = (catalog.latitudes[i], catalog.longitudes[i])
+            course['distance_km'] = None if np.isnan(point[0]) else round(geodesic(origin, point).km, 3)
+        courses.append(course)
+    return courses
+
 @course_suggestion_bp.route('/recommend', methods=['POST'])
 def get_course_recommendations():
     """Get course recommendations based on RIASEC traits and preferences"""
     try:
         data = request.get_json() or {}
         
-        # Extract request parameters
-        riasec_scores = data.get('riasec_scores', {})
-        location = data.get('location', {})
-        preferences = data.get('preferences', {})
+        try:
+            profile = parse_recommend_profile(data)
+            limit = parse_recommend_limit(data)
+            diversity = parse_recommend_diversity(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        courses_collection = get_collection(COLLECTIONS['courses'])
+        # Every course is scored in one vectorized pass; filters become boolean masks
+        catalog = get_course_catalog()
+        scores = catalog.scores(catalog.riasec_weights(profile['riasec_scores']))
+        eligible = eligible_courses(catalog, profile)
+        # Optional MMR reranking spreads the list across colleges and courses
+        indices = catalog.diverse_top_k(scores, eligible, limit, diversity)
+        courses = recommended_courses(catalog, scores, indices, profile['origin'])
         
-        # Build query based on RIASEC scores
-        query = {}
-        course_fields = []
+        # Linked courses reference their college by id; each college is shipped once
+        colleges = {}
+        if not data.get('expand_colleges'):
+            courses, colleges = split_colleges(courses)
         
-        # Get relevant course fields based on top RIASEC traits
-        if riasec_scores:
-            sorted_traits = sorted(riasec_scores.items(), key=lambda x: x[1], reverse=True)
-            top_traits = [trait for trait, score in sorted_traits[:3] if score > 0]
-            
-            for trait in top_traits:
-                if trait in RIASEC_COURSE_MAPPING:
-                    course_fields.extend(RIASEC_COURSE_MAPPING[trait])
-        
-        # Build course field query
-        if course_fields:
-            field_patterns = [{'Course': {'$regex': field, '$options': 'i'}} for field in course_fields]
-            query['$or'] = field_patterns
-        
-        # Location preferences
-        if location:
-            if 'state' in location and location['state']:
-                query['State'] = {'$regex': location['state'], '$options': 'i'}
-            if 'city' in location and location['city']:
-                query['City'] = {'$regex': location['city'], '$options': 'i'}
-        
-        # Other preferences
-        if preferences:
-            if 'college_type' in preferences and preferences['college_type']:
-                query['College_Type'] = {'$regex': preferences['college_type'], '$options': 'i'}
-            
-            if 'min_rating' in preferences:
-                query['Course_Rating_Placeholder'] = {'$gte': preferences['min_rating']}
+        return jsonify({
+            'success': True,
+            'total_recommendations': int(eligible.sum()),
+            'riasec_scores': profile['riasec_scores'],
+            'diversity': diversity,
+            'recommendations': courses,
+            'colleges': colleges
+        }), 200
         
-        # Execute query with sorting
-        courses = list(courses_collection.find(query, {'_id': 0}).sort([
-            ('Course_Rating_Placeholder', -1),
-            ('College_Rating_Placeholder', -1)
-        ]).limit(50))
+    except Exception as e:
+        logger.error(f"Error getting course recommendations: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to get course recommendations',
+            'details': str(e)
+        }), 500
+
+def shared_eligibility(catalog: CourseCatalog, profiles: List[Dict[str, Any]],
+                       masks: Dict[tuple, np.ndarray]) -> np.ndarray:
+    """Stacked eligibility masks for profiles; each distinct filter key is computed once and kept in ``masks``"""
+    rows = []
+    for profile in profiles:
+        key = profile_filter_key(profile)
+        mask = masks.get(key)
+        if mask is None:
+            mask = masks[key] = eligible_courses(catalog, profile)
+        rows.append(mask)
+    return np.vstack(rows)
+
+def batch_recommendations(catalog: CourseCatalog, profiles: List[Dict[str, Any]], student_ids: List[Any],
+                          limit: int, diversity: float = DEFAULT_DIVERSITY) -> Iterator[Dict[str, Any]]:
+    """Recommendations for many students, scored against the catalog a chunk of students at a time"""
+    masks = {}
+    chunk_size = max(1, BATCH_SCORE_CELLS // max(1, len(catalog)))
+    for start in range(0, len(profiles), chunk_size):
+        chunk = profiles[start:start + chunk_size]
+        weights = np.vstack([catalog.riasec_weights(profile['riasec_scores']) for profile in chunk])
+        eligible = shared_eligibility(catalog, chunk, masks)
+        scores = catalog.scores(weights)
+        if diversity > 0:
+            ranked = [catalog.diverse_top_k(scores[row], eligible[row], limit, diversity) for row in range(len(chunk))]
+        else:
+            ranked = catalog.top_k_rows(scores, eligible, limit)
+        for offset, indices in enumerate(ranked):
+            profile = chunk[offset]
+            yield {
+                'student_id': student_ids[start + offset],
+                'total_recommendations': int(eligible[offset].sum()),
+                'recommendations': recommended_courses(catalog, scores[offset], indices, profile['origin'])
+            }
+
+@course_suggestion_bp.route('/recommend/batch', methods=['POST'])
+def get_batch_course_recommendations():
+    """Course recommendations for a roster of students in one request, optionally streamed as NDJSON"""
+    try:
+        data = request.get_json() or {}
+        students = data.get('students')
         
-        # Calculate match scores
-        for course in courses:
-            course['match_score'] = calculate_match_score(course, riasec_scores, preferences)
+        if not isinstance(students, list) or not students:
+            return jsonify({
+                'success': False,
+                'error': 'students must be a non-empty list of profiles'
+            }), 400
+        if len(students) > MAX_BATCH_STUDENTS:
+            return jsonify({
+                'success': False,
+                'error': f'At most {MAX_BATCH_STUDENTS} students per batch'
+            }), 400
         
-        # Sort by match score
-        courses.sort(key=lambda x: x['match_score'], reverse=True)
+        profiles = []
+        student_ids = []
+        try:
+            limit = parse_recommend_limit(data)
+            diversity = parse_recommend_diversity(data)
+            for position, student in enumerate(students):
+                if not isinstance(student, dict):
+                    raise ValueError(f'students[{position}] must be an object')
+                try:
+                    profiles.append(parse_recommend_profile(student))
+                except ValueError as e:
+                    raise ValueError(f'students[{position}]: {e}')
+                student_ids.append(student.get('student_id', position))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        catalog = get_course_catalog()
+        started = time.perf_counter()
+        
+        def throughput():
+            elapsed = time.perf_counter() - started
+            return {
+                'students': len(profiles),
+                'courses': len(catalog),
+                'elapsed_ms': round(elapsed * 1000, 3),
+                'students_per_second': round(len(profiles) / elapsed, 1) if elapsed > 0 else None
+            }
+        
+        expand_colleges = bool(data.get('expand_colleges'))
+        
+        if data.get('stream') or request.args.get('stream') == 'true':
+            def generate():
+                # Each line carries the colleges not already sent on an earlier line
+                sent = set()
+                for result in batch_recommendations(catalog, profiles, student_ids, limit, diversity):
+                    if not expand_colleges:
+                        result['recommendations'], colleges = split_colleges(result['recommendations'])
+                        result['colleges'] = {key: value for key, value in colleges.items() if key not in sent}
+                        sent.update(colleges)
+                    yield serialize_json(result) + '\n'
+                yield serialize_json({'summary': throughput()}) + '\n'
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        results = list(batch_recommendations(catalog, profiles, student_ids, limit, diversity))
+        colleges = {}
+        if not expand_colleges:
+            for result in results:
+                result['recommendations'], student_colleges = split_colleges(result['recommendations'])
+                colleges.update(student_colleges)
         
         return jsonify({
             'success': True,
-            'total_recommendations': len(courses),
-            'riasec_scores': riasec_scores,
-            'recommendations': courses[:20]  # Return top 20
+            'total_students': len(results),
+            'diversity': diversity,
+            'results': results,
+            'colleges': colleges,
+            'throughput': throughput()
         }), 200
         
     except Exception as e:
-        logger.error(f"Error getting course recommendations: {e}")
+        logger.error(f"Error getting batch course recommendations: {e}")
         return jsonify({
             'success': False,
-            'error': 'Failed to get course recommendations',
+            'error': 'Failed to get batch course recommendations',
             'details': str(e)
         }), 500
 
@@ -198,27 +626,173 @@ def search_alias():
     """Alias for /courses/search to maintain compatibility"""
     return search_courses()
 
+@course_suggestion_bp.route('/nearby', methods=['GET'])
+def nearby_courses():
+    """Nearest courses to a point, optionally within a radius, by RIASEC trait or name"""
+    try:
+        try:
+            latitude, longitude, k, radius_km = parse_geo_query(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        trait = request.args.get('trait', '').strip().upper()[:1] or None
+        name = normalize_text(request.args.get('q', '')) or None
+        
+        def matches(course):
+            if trait and course.get('RIASEC_Trait') != trait:
+                return False
+            if name and name not in (normalize_text(course.get('Course_Name')) or ''):
+                return False
+            return True
+        
+        hits = get_course_geo_index().nearest(
+            latitude, longitude, k=k, radius_km=radius_km,
+            predicate=matches if (trait or name) else None
+        )
+        courses = [dict(hit['item'], distance_km=hit['distance_km']) for hit in hits]
+        
+        return jsonify({
+            'success': True,
+            'origin': {'lat': latitude, 'lon': longitude},
+            'radius_km': radius_km,
+            'total_results': len(courses),
+            'courses': courses
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error finding nearby courses: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to find nearby courses',
+            'details': str(e)
+        }), 500
+
+@course_suggestion_bp.route('/suggest', methods=['GET'])
+def suggest_courses():
+    """Typeahead suggestions for course names"""
+    try:
+        prefix = request.args.get('q', '').strip()
+        try:
+            limit = max(1, min(int(request.args.get('limit', DEFAULT_SUGGEST_LIMIT)), MAX_SUGGEST_LIMIT))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'limit must be an integer'
+            }), 400
+        
+        suggestions = get_course_suggest_index().suggest(prefix, limit) if prefix else []
+        
+        return jsonify({
+            'success': True,
+            'query': prefix,
+            'suggestions': suggestions
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting course suggestions: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to get course suggestions',
+            'details': str(e)
+        }), 500
+
+@course_suggestion_bp.route('/professions', methods=['GET'])
+def list_professions():
+    """Professions named by course data with the number of courses leading to each"""
+    try:
+        professions = _course_indexes()['professions']
+        counts = [
+            {'profession': name, 'course_count': len(professions['rows'][key])}
+            for key, name in professions['names'].items()
+        ]
+        counts.sort(key=lambda item: (-item['course_count'], item['profession']))
+        
+        return jsonify({
+            'success': True,
+            'total_professions': len(counts),
+            'professions': counts
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error listing professions: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to list professions',
+            'details': str(e)
+        }), 500
+
+@course_suggestion_bp.route('/professions/<path:profession>', methods=['GET'])
+def courses_by_profession(profession):
+    """Courses and colleges leading to a profession, served from the inverted profession index"""
+    try:
+        courses = courses_for_profession(profession)
+        if not courses:
+            return jsonify({
+                'success': False,
+                'error': f"No courses lead to '{profession}'. See /api/course/professions for known professions"
+            }), 404
+        
+        colleges = {}
+        for course in courses:
+            key = course.get('college_id') or course.get('College_Name')
+            college = colleges.setdefault(key, {
+                'college_id': course.get('college_id'),
+                'college_name': course.get('College_Name'),
+                'college_rating': course.get('College_Rating_Placeholder'),
+                'courses': []
+            })
+            college['courses'].append({
+                'course_name': course.get('Course_Name'),
+                'degree_level': course.get('Degree_Level'),
+                'riasec_trait': course.get('RIASEC_Trait'),
+                'course_rating': course.get('Course_Rating_Placeholder'),
+                'professions': course.get('professions')
+            })
+        
+        colleges = sorted(colleges.values(), key=lambda c: (-(c['college_rating'] or 0), c['college_name'] or ''))
+        for college in colleges:
+            college['courses'].sort(key=lambda c: (-(c['course_rating'] or 0), c['course_name'] or ''))
+        
+        return jsonify({
+            'success': True,
+            'profession': profession,
+            'total_courses': len(courses),
+            'total_colleges': len(colleges),
+            'colleges': colleges
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting courses by profession: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to get courses by profession',
+            'details': str(e)
+        }), 500
+
 def calculate_match_score(course, riasec_scores, preferences):
     """Calculate match score for a course based on RIASEC and preferences"""
     score = 0
     
-    # RIASEC matching (60% weight)
+    # RIASEC matching (60% weight): the course's own trait, then keyword hits in its name
     if riasec_scores:
-        course_name = course.get('Course', '').lower()
+        course_trait = course.get('RIASEC_Trait')
+        keyword_traits = course_keyword_traits(course)
         for trait, trait_score in riasec_scores.items():
-            if trait in RIASEC_COURSE_MAPPING:
-                for field in RIASEC_COURSE_MAPPING[trait]:
-                    if field.lower() in course_name:
-                        score += trait_score * 0.6
-                        break
+            if TRAIT_CODES.get(trait) == course_trait:
+                score += trait_score * TRAIT_WEIGHT
+            elif TRAIT_CODES.get(trait) in keyword_traits:
+                score += trait_score * KEYWORD_WEIGHT
     
     # Course rating (25% weight)
     course_rating = course.get('Course_Rating_Placeholder', 0)
-    score += course_rating * 25
+    score += course_rating * COURSE_RATING_WEIGHT
     
     # College rating (15% weight)
     college_rating = course.get('College_Rating_Placeholder', 0)
-    score += college_rating * 15
+    score += college_rating * COLLEGE_RATING_WEIGHT
     
     return round(score, 2)
 
@@ -227,7 +801,7 @@ def get_all_courses():
     """Get all available courses"""
     try:
         courses_collection = get_collection(COLLECTIONS['courses'])
-        courses = list(courses_collection.find({}, {'_id': 0}))
+        courses = list(courses_collection.find({}, COURSE_PUBLIC_PROJECTION))
         
         return jsonify({
             'success': True,
@@ -255,17 +829,19 @@ def search_courses():
                 'error': 'Search term is required'
             }), 400
         
+        try:
+            match_mode = parse_match_mode(request.args.get('match'), 'contains')
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
         courses_collection = get_collection(COLLECTIONS['courses'])
         
-        query = {
-            '$or': [
-                {'Course': {'$regex': search_term, '$options': 'i'}},
-                {'College_Name': {'$regex': search_term, '$options': 'i'}},
-                {'Specialization': {'$regex': search_term, '$options': 'i'}}
-            ]
-        }
+        query = any_field_clause(COURSE_SEARCH_FIELDS, search_term, match_mode)
         
-        courses = list(courses_collection.find(query, {'_id': 0}))
+        courses = list(courses_collection.find(query, COURSE_PUBLIC_PROJECTION))
         
         return jsonify({
             'success': True,
@@ -0,0 +1,73 @@
+"""
+Data Versions
+Per-dataset version stamps used to invalidate materialized views and in-memory indexes
+"""
+
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from cache import LocalCache
+from database import get_collection, COLLECTIONS
+
+logger = logging.getLogger(__name__)
+
+# How long a worker trusts its last look at a dataset's version
+VERSION_CHECK_TTL = float(os.getenv('DATA_VERSION_CHECK_TTL', '30'))
+
+# Sentinel cached for datasets that have never been stamped
+_UNVERSIONED = ''
+
+_version_cache = LocalCache(maxsize=64, ttl=VERSION_CHECK_TTL)
+# view name -> (data version, view)
+_view_cache = LocalCache(maxsize=64)
+
+
+def bump_data_version(dataset: str) -> str:
+    """Stamp a dataset with a new version after its documents change"""
+    version = uuid.uuid4().hex
+    get_collection(COLLECTIONS['data_versions']).update_one(
+        {'_id': dataset},
+        {'$set': {'version': version, 'updated_at': datetime.utcnow()}},
+        upsert=True
+    )
+    _version_cache.set(dataset, version)
+    logger.info(f"Data version for {dataset} is now {version}")
+    return version
+
+
+def get_data_version(dataset: str) -> Optional[str]:
+    """Current version of a dataset, re-read from MongoDB at most every VERSION_CHECK_TTL seconds"""
+    version = _version_cache.get(dataset)
+    if version is None:
+        document = get_collection(COLLECTIONS['data_versions']).find_one({'_id': dataset})
+        version = document['version'] if document else _UNVERSIONED
+        _version_cache.set(dataset, version)
+    return version or None
+
+
+def get_materialized_view(name: str, dataset: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Serve a stored view of a dataset, recomputing it only when the dataset's version changes"""
+    version = get_data_version(dataset)
+    cached = _view_cache.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    views_collection = get_collection(COLLECTIONS['materialized_views'])
+    document = views_collection.find_one({'_id': name})
+    if document is None or document.get('data_version') != version:
+        document = {
+            '_id': name,
+            'dataset': dataset,
+            'data_version': version,
+            'computed_at': datetime.utcnow(),
+            'view': compute()
+        }
+        views_collection.replace_one({'_id': name}, document, upsert=True)
+        logger.info(f"Recomputed materialized view {name} for {dataset} version {version}")
+
+    _view_cache.set(name, (version, document['view']))
+    return document['view']
+
@@ -0,0 +1,117 @@
+"""
+Geo Index
+In-memory haversine BallTree for nearest-k and within-radius lookups
+"""
+
+import logging
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sklearn.neighbors import BallTree
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_K = 10
+MAX_K = 100
+MAX_RADIUS_KM = 1000
+
+
+def valid_point(latitude: Any, longitude: Any) -> bool:
+    """Whether a latitude/longitude pair is usable"""
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return False
+    # Some course rows repeat the latitude in the longitude column
+    return -90 <= latitude <= 90 and -180 <= longitude <= 180 and latitude != longitude
+
+
+def most_common_point(pairs: Iterable[Tuple[Any, Any]]) -> Optional[Tuple[float, float]]:
+    """Most frequent valid (latitude, longitude) pair, used to pick one location from repeated rows"""
+    points = Counter(
+        (round(float(latitude), 6), round(float(longitude), 6))
+        for latitude, longitude in pairs if valid_point(latitude, longitude)
+    )
+    return points.most_common(1)[0][0] if points else None
+
+
+def parse_geo_query(args: Dict[str, Any]) -> Tuple[float, float, int, Optional[float]]:
+    """Validate lat/lon/k/radius_km request parameters"""
+    try:
+        latitude = float(args['lat'])
+        longitude = float(args['lon'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('lat and lon are required numbers')
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError('lat must be within [-90, 90] and lon within [-180, 180]')
+
+    try:
+        k = max(1, min(int(args.get('k', DEFAULT_K)), MAX_K))
+        radius_km = args.get('radius_km')
+        radius_km = float(radius_km) if radius_km not in (None, '') else None
+    except (TypeError, ValueError):
+        raise ValueError('k must be an integer and radius_km a number')
+    if radius_km is not None and not 0 < radius_km <= MAX_RADIUS_KM:
+        raise ValueError(f'radius_km must be between 0 and {MAX_RADIUS_KM}')
+
+    return latitude, longitude, k, radius_km
+
+
+class GeoIndex:
+    """Points indexed on the sphere with a haversine BallTree.
+
+    Results are selected and reported by the same great-circle distance, so a
+    radius query never returns a point whose reported distance exceeds it.
+    """
+
+    def __init__(self, items: Iterable[Any], latitudes: Iterable[float], longitudes: Iterable[float]):
+        self.items = list(items)
+        self.points = np.column_stack([
+            np.asarray(list(latitudes), dtype=np.float64),
+            np.asarray(list(longitudes), dtype=np.float64)
+        ]).reshape(-1, 2)
+        if len(self.items) != len(self.points):
+            raise ValueError("Items and coordinates must have the same length")
+        self.tree = BallTree(np.radians(self.points), metric='haversine') if len(self.items) else None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _candidates(self, query: np.ndarray, fetch: int, radius_km: Optional[float]):
+        if radius_km is not None:
+            indices, distances = self.tree.query_radius(
+                query, r=radius_km / EARTH_RADIUS_KM, return_distance=True, sort_results=True
+            )
+            return indices[0], distances[0]
+        distances, indices = self.tree.query(query, k=fetch)
+        return indices[0], distances[0]
+
+    def nearest(self, latitude: float, longitude: float, k: int = DEFAULT_K,
+                radius_km: Optional[float] = None,
+                predicate: Optional[Callable[[Any], bool]] = None) -> List[Dict[str, Any]]:
+        """Up to ``k`` items closest to a point, optionally within a radius and matching a predicate"""
+        if self.tree is None or k <= 0:
+            return []
+
+        query = np.radians([[latitude, longitude]])
+        fetch = min(k, len(self.items))
+        while True:
+            indices, distances = self._candidates(query, fetch, radius_km)
+            matches = [
+                (i, distance) for i, distance in zip(indices, distances)
+                if predicate is None or predicate(self.items[i])
+            ]
+            # A radius query already saw every candidate; otherwise widen until k match
+            if radius_km is not None or len(matches) >= k or fetch >= len(self.items):
+                break
+            fetch = min(fetch * 4, len(self.items))
+
+        return [
+            {
+                'item': self.items[i],
+                'distance_km': round(float(distance) * EARTH_RADIUS_KM, 3)
+            }
+            for i, distance in matches[:k]
+        ]
@@ -0,0 +1,98 @@
+"""
+Keyword Matcher
+Single-pass matching of RIASEC keyword mappings against course and scholarship text
+"""
+
+import logging
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List
+
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+
+logger = logging.getLogger(__name__)
+
+# Document field holding the keyword traits matched when it was loaded
+KEYWORD_TRAITS_FIELD = 'keyword_traits'
+
+
+class KeywordMatcher:
+    """Case-insensitive substring matching of many keywords, each tagged with traits.
+
+    All keywords are compiled into one alternation inside a lookahead, so a
+    single scan tries every start position. Alternatives are ordered longest
+    first and each keyword also carries the traits of keywords that are its
+    prefixes, so the one match reported per position still yields every
+    keyword that occurs there.
+    """
+
+    def __init__(self, mapping: Dict[str, Iterable[str]]):
+        self.mapping = {trait: list(keywords) for trait, keywords in mapping.items()}
+        traits_by_keyword: Dict[str, set] = {}
+        for trait, keywords in self.mapping.items():
+            for keyword in keywords:
+                traits_by_keyword.setdefault(keyword.lower(), set()).add(trait)
+
+        self._traits: Dict[str, FrozenSet[str]] = {}
+        for keyword in traits_by_keyword:
+            traits = set()
+            for other, other_traits in traits_by_keyword.items():
+                if keyword.startswith(other):
+                    traits |= other_traits
+            self._traits[keyword] = frozenset(traits)
+
+        ordered = sorted(traits_by_keyword, key=lambda keyword: (-len(keyword), keyword))
+        self._pattern = re.compile(
+            '(?=(' + '|'.join(re.escape(keyword) for keyword in ordered) + '))', re.IGNORECASE
+        ) if ordered else None
+
+    def traits(self, text: Any) -> FrozenSet[str]:
+        """Traits with at least one keyword occurring in ``text``"""
+        if self._pattern is None or not isinstance(text, str) or not text:
+            return frozenset()
+        hits = set()
+        for match in self._pattern.finditer(text):
+            hits |= self._traits.get(match.group(1).lower(), frozenset())
+        return frozenset(hits)
+
+
+def field_text(document: Dict[str, Any], path: str) -> Any:
+    """Value at a dotted field path, with a list of strings joined into one text"""
+    value: Any = document
+    for key in path.split('.'):
+        value = value.get(key) if isinstance(value, dict) else None
+    if isinstance(value, list):
+        return ', '.join(item for item in value if isinstance(item, str))
+    return value
+
+
+def cached_traits(document: Dict[str, Any], matcher: KeywordMatcher, text_field: str) -> FrozenSet[str]:
+    """Keyword traits stored on a document at load, matched now for documents loaded before"""
+    if KEYWORD_TRAITS_FIELD in document:
+        return frozenset(document[KEYWORD_TRAITS_FIELD] or ())
+    return matcher.traits(field_text(document, text_field))
+
+
+def add_keyword_traits(document: Dict[str, Any], matcher: KeywordMatcher, text_field: str) -> Dict[str, Any]:
+    """Store the keyword traits matched in ``text_field`` on a document"""
+    document[KEYWORD_TRAITS_FIELD] = sorted(matcher.traits(field_text(document, text_field)))
+    return document
+
+
+def backfill_keyword_traits(collection: Collection, matcher: KeywordMatcher, text_field: str,
+                            batch_size: int = 500) -> int:
+    """Recompute keyword traits for documents already in a collection"""
+    operations: List[UpdateOne] = []
+    updated = 0
+    for document in collection.find({}, {text_field: 1}):
+        operations.append(UpdateOne(
+            {'_id': document['_id']},
+            {'$set': {KEYWORD_TRAITS_FIELD: sorted(matcher.traits(field_text(document, text_field)))}}
+        ))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    logger.info(f"Backfilled keyword traits for {updated} documents in {collection.name}")
+    return updated
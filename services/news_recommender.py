@@ -5,16 +5,82 @@ Provides news recommendations based on RIASEC traits with MongoDB storage
 
 from flask import Blueprint, request, jsonify
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from database import get_collection, COLLECTIONS
+from cache import make_etag, serialize_json, cached_json_response
+from services.query_builder import (
+    PUBLIC_PROJECTION, SEARCH_FIELD, add_search_fields, any_field_clause, parse_match_mode
+)
+from services.content_index import ContentIndex, load_content_index, save_content_index
+from services.course_suggestion import RIASEC_COURSE_MAPPING
+from services.data_version import bump_data_version, get_data_version
+from pymongo import UpdateOne
+import numpy as np
 import pandas as pd
+import hashlib
 import os
 import random
+import threading
+import time
+from heapq import merge
+from itertools import islice
 
 logger = logging.getLogger(__name__)
 
 news_recommender_bp = Blueprint('news_recommender', __name__)
 
+# Fields searched by /articles/search and vectorized by the content index
+NEWS_SEARCH_FIELDS = ['Headline', 'Description']
+NEWS_CONTENT_FIELDS = NEWS_SEARCH_FIELDS
+
+# Data version key for the news collection, also the persisted content index name
+NEWS_DATASET = 'news_articles'
+
+DEFAULT_NUM_RECOMMENDATIONS = 5
+MAX_NUM_RECOMMENDATIONS = 50
+
+# Personalized feeds rotate through the top ROTATION_POOL_FACTOR * num_recommendations
+# articles, moving once per window so a reader sees the same feed until it ends
+ROTATION_POOL_FACTOR = 3
+ROTATION_WINDOW_SECONDS = 3600
+
+# Unpersonalized rankings only change when articles are reloaded
+NEWS_CACHE_CONTROL = 'public, max-age=300'
+
+# Current in-memory content index and the news data version it reflects
+_index: Optional[Dict[str, Any]] = None
+_index_lock = threading.Lock()
+
+def prepare_news_document(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Map the CSV's RIASEC column to RIASEC_Type and attach search fields"""
+    trait = article.get('RIASEC_Type', article.get('RIASEC'))
+    article['RIASEC_Type'] = trait.strip().upper()[:1] or None if isinstance(trait, str) else None
+    add_search_fields(article, NEWS_SEARCH_FIELDS)
+    return article
+
+def backfill_news_fields(batch_size: int = 500) -> int:
+    """Set RIASEC_Type on articles loaded before it was mapped from the RIASEC column"""
+    news_collection = get_collection(COLLECTIONS['news_articles'])
+    operations = []
+    updated = 0
+    for article in news_collection.find({'RIASEC_Type': {'$exists': False}}, {'RIASEC': 1}):
+        trait = article.get('RIASEC')
+        trait = trait.strip().upper()[:1] or None if isinstance(trait, str) else None
+        operations.append(UpdateOne({'_id': article['_id']}, {'$set': {'RIASEC_Type': trait}}))
+        if len(operations) >= batch_size:
+            updated += news_collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += news_collection.bulk_write(operations, ordered=False).modified_count
+    logger.info(f"Backfilled RIASEC_Type for {updated} news articles")
+    if updated:
+        bump_data_version(NEWS_DATASET)
+    return updated
+
+def news_id(article: Dict[str, Any]) -> str:
+    """Stable article id: News_ID, or the Mongo id for articles without one"""
+    return str(article.get('News_ID') or article['_id'])
+
 def load_news_data_to_mongodb():
     """Load news data from CSV to MongoDB"""
     try:
@@ -45,10 +111,13 @@ def load_news_data_to_mongodb():
             article['updated_at'] = pd.Timestamp.now()
             article['views'] = random.randint(100, 5000)
             article['likes'] = random.randint(10, 500)
+            prepare_news_document(article)
         
         if news_articles:
             news_collection.insert_many(news_articles)
             logger.info(f"Loaded {len(news_articles)} news articles into MongoDB")
+            bump_data_version(NEWS_DATASET)
+            build_news_index()
         
     except Exception as e:
         logger.error(f"Error loading news data: {e}")
@@ -63,6 +132,148 @@ RIASEC_DESCRIPTIONS = {
     'C': 'Conventional - Organized, detail-oriented, systematic'
 }
 
+# Text each RIASEC type is matched against: its description plus its course-field keywords
+RIASEC_PROFILE_TEXTS = {
+    trait[0].upper(): f"{RIASEC_DESCRIPTIONS[trait[0].upper()]} {' '.join(keywords)}"
+    for trait, keywords in RIASEC_COURSE_MAPPING.items()
+}
+RIASEC_LETTERS = list(RIASEC_PROFILE_TEXTS)
+
+def build_news_index() -> Dict[str, Any]:
+    """Bring the persisted TF-IDF content index up to date with MongoDB and load it"""
+    with _index_lock:
+        return _build_news_index()
+
+def _build_news_index() -> Dict[str, Any]:
+    """Body of ``build_news_index``; callers hold ``_index_lock`` so builds don't delete each other's chunks"""
+    global _index
+    version = get_data_version(NEWS_DATASET)
+    articles = list(get_collection(COLLECTIONS['news_articles']).find({}, {SEARCH_FIELD: 0}))
+    by_id = {news_id(article): article for article in articles}
+    
+    content = load_content_index(NEWS_DATASET)
+    new_ids = [doc_id for doc_id in by_id if content is None or doc_id not in content.positions]
+    # Articles whose Headline or Description changed since they were vectorized
+    changed_ids = content.changed(by_id) if content is not None else []
+    stale = len(new_ids) + len(changed_ids)
+    if content is None or len(content) + len(new_ids) != len(by_id) or content.needs_refit(stale):
+        # First build, removed articles or a stale idf: refit over the whole collection
+        content = ContentIndex(NEWS_CONTENT_FIELDS).fit(list(by_id), by_id.values())
+        save_content_index(NEWS_DATASET, content, version)
+        logger.info(f"Fitted news content index over {len(content)} articles")
+    elif stale:
+        content.add(new_ids + changed_ids, (by_id[doc_id] for doc_id in new_ids + changed_ids))
+        save_content_index(NEWS_DATASET, content, version)
+        logger.info(f"Added {len(new_ids)} and re-vectorized {len(changed_ids)} articles in the news content index")
+    
+    ordered = [{key: value for key, value in by_id[doc_id].items() if key != '_id'} for doc_id in content.ids]
+    types = np.array([article.get('RIASEC_Type') for article in ordered], dtype=object)
+    profiles = content.vectorize([RIASEC_PROFILE_TEXTS[letter] for letter in RIASEC_LETTERS])
+    similarities = content.similarities(profiles)
+    
+    # Per type, (-similarity, row) pairs in rank order: the type's own articles, and every article
+    by_type = {}
+    by_profile = {}
+    for column, letter in enumerate(RIASEC_LETTERS):
+        ranked = sorted(zip((-similarities[:, column]).tolist(), range(len(ordered))))
+        by_profile[letter] = ranked
+        by_type[letter] = [(score, row) for score, row in ranked if types[row] == letter]
+    
+    index = {
+        'version': version,
+        'content': content,
+        'articles': ordered,
+        'types': types,
+        'by_type': by_type,
+        'by_profile': by_profile
+    }
+    _index = index
+    return index
+
+def get_news_index() -> Dict[str, Any]:
+    """Content index for the current news data version, updated when it changes"""
+    index = _index
+    if index is None or index['version'] != get_data_version(NEWS_DATASET):
+        with _index_lock:
+            # Another request may have built this version while we waited
+            index = _index
+            if index is None or index['version'] != get_data_version(NEWS_DATASET):
+                index = _build_news_index()
+    return index
+
+def rank_news(index: Dict[str, Any], riasec_list: List[str], limit: int,
+              seed_row: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Articles ranked by cosine similarity, those of the requested RIASEC types first.
+
+    Against a seed article every article is scored by similarity to it. Otherwise an
+    article of a requested type is scored against that type's keyword profile and
+    any other article by its best similarity to a requested profile; both come from
+    merging the precomputed per-type rankings, so the cost follows ``limit``
+    rather than the number of articles.
+    """
+    if seed_row is not None:
+        return _rank_news_by_seed(index, riasec_list, limit, seed_row)
+    
+    ranked = list(islice(merge(*(index['by_type'][letter] for letter in riasec_list)), limit))
+    if len(ranked) < limit:
+        # Too few articles of the requested types: fill with the closest others
+        seen = {row for _, row in ranked}
+        for score, row in merge(*(index['by_profile'][letter] for letter in riasec_list)):
+            if row not in seen and index['types'][row] not in riasec_list:
+                seen.add(row)
+                ranked.append((score, row))
+                if len(ranked) == limit:
+                    break
+    return [dict(index['articles'][row], relevance_score=round(-score, 4)) for score, row in ranked]
+
+def _rank_news_by_seed(index: Dict[str, Any], riasec_list: List[str], limit: int,
+                       seed_row: int) -> List[Dict[str, Any]]:
+    """Articles ranked by similarity to a seed article, those of the requested types first"""
+    content = index['content']
+    rows = np.arange(len(content))
+    relevance = content.similarities(content.matrix[seed_row])[:, 0]
+    order = np.lexsort((rows, -relevance, ~np.isin(index['types'], riasec_list)))
+    order = order[order != seed_row][:limit]
+    return [dict(index['articles'][row], relevance_score=round(float(relevance[row]), 4)) for row in order]
+
+def rotation_offset(key: str, size: int) -> int:
+    """Stable start position in a pool of ``size`` for a rotation key"""
+    digest = hashlib.sha256(key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % size if size else 0
+
+def rotate_news(pool: List[Dict[str, Any]], limit: int, key: Optional[str]) -> List[Dict[str, Any]]:
+    """``limit`` consecutive articles of a ranked pool starting at the key's offset, kept in rank order"""
+    if key is None or len(pool) <= limit:
+        return pool[:limit]
+    start = rotation_offset(key, len(pool))
+    rows = sorted((start + i) % len(pool) for i in range(limit))
+    return [pool[row] for row in rows]
+
+def rotation_key(data: Dict[str, Any], now: Optional[float] = None) -> Tuple[Optional[str], str]:
+    """Rotation key for a request and the Cache-Control its response allows.
+
+    An explicit ``seed`` is used as is. Otherwise a ``user_id`` or ``session_id``
+    is combined with the current time window, and the response may be cached
+    privately until the window ends. Without either the ranking is not rotated.
+    """
+    seed = data.get('seed')
+    if seed not in (None, ''):
+        return f'seed:{seed}', NEWS_CACHE_CONTROL
+    reader = data.get('user_id') or data.get('session_id')
+    if not reader:
+        return None, NEWS_CACHE_CONTROL
+    now = time.time() if now is None else now
+    window = int(now // ROTATION_WINDOW_SECONDS)
+    remaining = int((window + 1) * ROTATION_WINDOW_SECONDS - now)
+    return f'reader:{reader}:{window}', f'private, max-age={max(remaining, 1)}'
+
+def parse_num_recommendations(value: Any) -> int:
+    """Number of articles to return"""
+    try:
+        return max(1, min(int(value), MAX_NUM_RECOMMENDATIONS))
+    except (TypeError, ValueError):
+        raise ValueError('num_recommendations must be an integer')
+
 @news_recommender_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -85,14 +296,22 @@ def health_check():
             'error': str(e)
         }), 500
 
-@news_recommender_bp.route('/recommend', methods=['POST'])
+@news_recommender_bp.route('/recommend', methods=['GET', 'POST'])
 def get_news_recommendations():
     """Get news recommendations based on RIASEC traits"""
     try:
-        data = request.get_json() or {}
+        data = request.args.to_dict() if request.method == 'GET' else request.get_json() or {}
         
         riasec_types = data.get('riasec_types', '')
-        num_recommendations = data.get('num_recommendations', 5)
+        try:
+            num_recommendations = parse_num_recommendations(
+                data.get('num_recommendations', DEFAULT_NUM_RECOMMENDATIONS)
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
         if not riasec_types:
             return jsonify({
@@ -101,7 +320,7 @@ def get_news_recommendations():
             }), 400
         
         # Parse RIASEC types
-        riasec_list = [t.upper() for t in riasec_types if t.upper() in RIASEC_DESCRIPTIONS]
+        riasec_list = list(dict.fromkeys(t.upper() for t in riasec_types if t.upper() in RIASEC_DESCRIPTIONS))
         
         if not riasec_list:
             return jsonify({
@@ -109,44 +328,30 @@ def get_news_recommendations():
                 'error': 'Valid RIASEC types are required (R, I, A, S, E, C)'
             }), 400
         
-        news_collection = get_collection(COLLECTIONS['news_articles'])
-        
-        # Build query to match RIASEC types
-        query = {
-            'RIASEC_Type': {'$in': riasec_list}
-        }
-        
-        # Get articles matching RIASEC types
-        articles = list(news_collection.find(query, {'_id': 0}))
+        index = get_news_index()
         
-        # If not enough articles for specific types, get some general articles
-        if len(articles) < num_recommendations:
-            additional_articles = list(news_collection.find(
-                {'RIASEC_Type': {'$nin': riasec_list}}, 
-                {'_id': 0}
-            ).limit(num_recommendations - len(articles)))
-            articles.extend(additional_articles)
+        # "More like this" ranking around a seed article
+        seed_row = None
+        seed_news_id = data.get('seed_news_id')
+        if seed_news_id:
+            seed_row = index['content'].positions.get(str(seed_news_id))
+            if seed_row is None:
+                return jsonify({
+                    'success': False,
+                    'error': f'News article {seed_news_id} not found'
+                }), 404
         
-        # Shuffle and limit results
-        random.shuffle(articles)
-        recommendations = articles[:num_recommendations]
+        key, cache_control = rotation_key(data)
+        pool_size = num_recommendations * ROTATION_POOL_FACTOR if key else num_recommendations
+        recommendations = rotate_news(rank_news(index, riasec_list, pool_size, seed_row), num_recommendations, key)
         
-        # Add relevance scores
-        for article in recommendations:
-            if article.get('RIASEC_Type') in riasec_list:
-                article['relevance_score'] = 0.9 + random.uniform(0, 0.1)
-            else:
-                article['relevance_score'] = 0.5 + random.uniform(0, 0.3)
-        
-        # Sort by relevance score
-        recommendations.sort(key=lambda x: x['relevance_score'], reverse=True)
-        
-        return jsonify({
+        body = serialize_json({
             'success': True,
             'riasec_types': riasec_types,
             'total_recommendations': len(recommendations),
             'recommendations': recommendations
-        }), 200
+        })
+        return cached_json_response(body, make_etag(body), cache_control)
         
     except Exception as e:
         logger.error(f"Error getting news recommendations: {e}")
@@ -156,6 +361,45 @@ def get_news_recommendations():
             'details': str(e)
         }), 500
 
+@news_recommender_bp.route('/similar/<news_id>', methods=['GET'])
+def get_similar_news(news_id):
+    """Articles most similar in content to one article"""
+    try:
+        try:
+            limit = parse_num_recommendations(request.args.get('limit', DEFAULT_NUM_RECOMMENDATIONS))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'limit must be an integer'
+            }), 400
+        
+        index = get_news_index()
+        seed_row = index['content'].positions.get(news_id)
+        if seed_row is None:
+            return jsonify({
+                'success': False,
+                'error': f'News article {news_id} not found'
+            }), 404
+        
+        articles = rank_news(index, [], limit, seed_row)
+        
+        body = serialize_json({
+            'success': True,
+            'news_id': news_id,
+            'article': index['articles'][seed_row],
+            'total_results': len(articles),
+            'articles': articles
+        })
+        return cached_json_response(body, make_etag(body), NEWS_CACHE_CONTROL)
+        
+    except Exception as e:
+        logger.error(f"Error getting similar news: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to get similar news',
+            'details': str(e)
+        }), 500
+
 @news_recommender_bp.route('/articles/search', methods=['GET'])
 def articles_search_alias():
     """Alias to maintain compatibility with /api/news/articles/search"""
@@ -178,7 +422,7 @@ def get_news_by_type(riasec_type):
         # Get articles for specific RIASEC type
         articles = list(news_collection.find(
             {'RIASEC_Type': riasec_type},
-            {'_id': 0}
+            PUBLIC_PROJECTION
         ))
         
         return jsonify({
@@ -202,7 +446,7 @@ def get_all_articles():
     """Get all news articles"""
     try:
         news_collection = get_collection(COLLECTIONS['news_articles'])
-        articles = list(news_collection.find({}, {'_id': 0}))
+        articles = list(news_collection.find({}, PUBLIC_PROJECTION))
         
         return jsonify({
             'success': True,
@@ -230,18 +474,19 @@ def search_articles():
                 'error': 'Search term is required'
             }), 400
         
+        try:
+            match_mode = parse_match_mode(request.args.get('match'), 'contains')
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
         news_collection = get_collection(COLLECTIONS['news_articles'])
         
-        query = {
-            '$or': [
-                {'Title': {'$regex': search_term, '$options': 'i'}},
-                {'Summary': {'$regex': search_term, '$options': 'i'}},
-                {'Content': {'$regex': search_term, '$options': 'i'}},
-                {'Category': {'$regex': search_term, '$options': 'i'}}
-            ]
-        }
+        query = any_field_clause(NEWS_SEARCH_FIELDS, search_term, match_mode)
         
-        articles = list(news_collection.find(query, {'_id': 0}))
+        articles = list(news_collection.find(query, PUBLIC_PROJECTION))
         
         return jsonify({
             'success': True,
@@ -0,0 +1,126 @@
+"""
+Query Builder
+Escaped, index-friendly MongoDB text filters over stored normalized fields
+"""
+
+import logging
+import math
+import re
+from typing import Dict, List, Any, Iterable, Optional
+
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+
+logger = logging.getLogger(__name__)
+
+# Normalized (lowercased, whitespace-collapsed) copies of searchable fields live
+# under this sub-document so exact and prefix matches can use a plain index
+SEARCH_FIELD = '_search'
+
+# Projection that hides internal fields from API responses
+PUBLIC_PROJECTION = {'_id': 0, SEARCH_FIELD: 0}
+
+MATCH_MODES = ('exact', 'prefix', 'contains')
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(value: Any) -> Any:
+    """Case-fold and collapse whitespace; lists are normalized element-wise"""
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (list, tuple)):
+        normalized = [normalize_text(item) for item in value]
+        return [item for item in normalized if item]
+    return _WHITESPACE.sub(' ', str(value)).strip().casefold()
+
+
+def public_projection(*internal_fields: str) -> Dict[str, int]:
+    """PUBLIC_PROJECTION that also hides a collection's internal derived fields"""
+    return {**PUBLIC_PROJECTION, **{field: 0 for field in internal_fields}}
+
+
+def search_path(field: str) -> str:
+    """Path of the normalized copy of ``field`` (nested fields are flattened)"""
+    return f"{SEARCH_FIELD}.{field.replace('.', '__')}"
+
+
+def _get_path(document: Dict[str, Any], field: str) -> Any:
+    value = document
+    for part in field.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def search_fields_for(document: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Build the normalized search sub-document for a document"""
+    return {
+        field.replace('.', '__'): normalize_text(_get_path(document, field))
+        for field in fields
+    }
+
+
+def add_search_fields(document: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Attach normalized search fields to a document before it is inserted"""
+    document[SEARCH_FIELD] = search_fields_for(document, fields)
+    return document
+
+
+def parse_match_mode(value: Optional[str], default: str) -> str:
+    """Validate a user-supplied match mode"""
+    mode = (value or default).lower()
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Invalid match mode '{value}'. Valid modes: {list(MATCH_MODES)}")
+    return mode
+
+
+def match_clause(field: str, term: Any, mode: str = 'contains') -> Dict[str, Any]:
+    """Filter for one field. User input is always escaped.
+
+    ``exact`` and ``prefix`` become equality and anchored-regex lookups on the
+    normalized copy, which MongoDB answers with tight index bounds. ``contains``
+    stays an (escaped) unanchored regex and scans index keys rather than documents.
+    """
+    term = normalize_text(term)
+    path = search_path(field)
+    if mode == 'exact':
+        return {path: term}
+    if mode == 'prefix':
+        return {path: {'$regex': '^' + re.escape(term)}}
+    if mode == 'contains':
+        return {path: {'$regex': re.escape(term)}}
+    raise ValueError(f"Invalid match mode '{mode}'")
+
+
+def any_field_clause(fields: Iterable[str], term: Any, mode: str = 'contains') -> Dict[str, Any]:
+    """Filter matching ``term`` in any of ``fields``"""
+    return {'$or': [match_clause(field, term, mode) for field in fields]}
+
+
+def ensure_search_indexes(collection: Collection, fields: Iterable[str]) -> None:
+    """Create one index per normalized search field"""
+    for field in fields:
+        collection.create_index(search_path(field))
+
+
+def backfill_search_fields(collection: Collection, fields: List[str], batch_size: int = 500) -> int:
+    """Recompute normalized search fields for documents already in a collection"""
+    projection = {field.split('.')[0]: 1 for field in fields}
+    operations = []
+    updated = 0
+    for document in collection.find({}, projection):
+        operations.append(UpdateOne(
+            {'_id': document['_id']},
+            {'$set': {SEARCH_FIELD: search_fields_for(document, fields)}}
+        ))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    logger.info(f"Backfilled search fields for {updated} documents in {collection.name}")
+    return updated
@@ -0,0 +1,166 @@
+"""
+Question Bank Loader
+Versioned RIASEC question banks with precompiled NumPy scoring matrices
+"""
+
+import glob
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Column order of every scoring matrix
+RIASEC_TYPES = ['realistic', 'investigative', 'artistic', 'social', 'enterprising', 'conventional']
+TRAIT_INDEX = {trait: i for i, trait in enumerate(RIASEC_TYPES)}
+TRAIT_LETTERS = {trait[0].upper(): trait for trait in RIASEC_TYPES}
+
+QUESTION_BANK_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'question_banks')
+DEFAULT_BANK_VERSION = os.getenv('CAREER_QUESTION_BANK', 'v1')
+
+# Sessions created before banks were versioned were scored with v1
+LEGACY_BANK_VERSION = 'v1'
+
+
+class QuestionBank:
+    """A single immutable version of the assessment.
+
+    ``weights`` is an (n_questions x 6) matrix; row ``i`` holds the trait
+    loadings of question ``i`` so items can load on more than one trait.
+    Reverse-scored items are flipped on the answer scale before the multiply.
+    """
+
+    def __init__(self, definition: Dict[str, Any]):
+        self.version = definition['version']
+        self.name = definition.get('name', self.version)
+
+        scale = definition.get('scale', {})
+        self.scale_min = int(scale.get('min', 1))
+        self.scale_max = int(scale.get('max', 5))
+
+        items = definition.get('questions', [])
+        if not items:
+            raise ValueError(f"Question bank {self.version} has no questions")
+
+        weights = np.zeros((len(items), len(RIASEC_TYPES)), dtype=np.float64)
+        reverse = np.zeros(len(items), dtype=bool)
+        self.questions: List[Dict[str, Any]] = []
+
+        for i, item in enumerate(items):
+            item_weights = item.get('weights') or {item['riasec_type']: 1.0}
+            for trait, weight in item_weights.items():
+                if trait not in TRAIT_INDEX:
+                    raise ValueError(f"Unknown RIASEC trait '{trait}' in question bank {self.version}")
+                weights[i, TRAIT_INDEX[trait]] = float(weight)
+            reverse[i] = bool(item.get('reverse', False))
+
+            # Primary trait is reported with the question for display purposes
+            primary_trait = max(item_weights, key=lambda t: abs(item_weights[t]))
+            self.questions.append({
+                'id': item.get('id', f'Q{i + 1}'),
+                'question': item['question'],
+                'riasec_type': primary_trait,
+                'reverse': bool(reverse[i])
+            })
+
+        weights.flags.writeable = False
+        reverse.flags.writeable = False
+        self.weights = weights
+        self.reverse = reverse
+        self.career_recommendations: Dict[str, List[str]] = definition.get('career_recommendations', {})
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def response_vector(self, answers: List[Dict[str, Any]]) -> np.ndarray:
+        """Convert stored answer documents into a dense response vector (0 = unanswered)"""
+        responses = np.zeros(len(self.questions), dtype=np.float64)
+        for answer in answers:
+            responses[answer['question_number'] - 1] = answer['answer_value']
+        return responses
+
+    def score_matrix(self, responses: np.ndarray) -> np.ndarray:
+        """Score a batch of sessions.
+
+        ``responses`` is an (m x n_questions) array of raw answers with 0 for
+        unanswered items; the result is an (m x 6) array of trait scores.
+        """
+        responses = np.atleast_2d(np.asarray(responses, dtype=np.float64))
+        flip = (responses > 0) & self.reverse
+        effective = np.where(flip, (self.scale_min + self.scale_max) - responses, responses)
+        return effective @ self.weights
+
+    def score(self, answers: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Score a single session from its answer documents"""
+        row = self.score_matrix(self.response_vector(answers))[0]
+        return scores_to_dict(row)
+
+    def describe(self) -> Dict[str, Any]:
+        """Public summary of the bank"""
+        return {
+            'version': self.version,
+            'name': self.name,
+            'total_questions': len(self.questions),
+            'scale': {'min': self.scale_min, 'max': self.scale_max}
+        }
+
+
+def scores_to_vector(scores: Dict[str, Any]) -> np.ndarray:
+    """Convert a trait score mapping (full names or R/I/A/S/E/C letters) into a vector"""
+    vector = np.zeros(len(RIASEC_TYPES), dtype=np.float64)
+    for key, value in (scores or {}).items():
+        trait = TRAIT_LETTERS.get(key.upper(), key.lower()) if isinstance(key, str) else None
+        if trait in TRAIT_INDEX:
+            vector[TRAIT_INDEX[trait]] = float(value or 0)
+    return vector
+
+
+def scores_to_dict(row: np.ndarray) -> Dict[str, float]:
+    """Map a score row back to trait names, keeping whole numbers as ints"""
+    scores = {}
+    for trait, value in zip(RIASEC_TYPES, row):
+        value = round(float(value), 2)
+        scores[trait] = int(value) if value.is_integer() else value
+    return scores
+
+
+_question_banks: Dict[str, QuestionBank] = {}
+_load_lock = threading.Lock()
+
+
+def load_question_banks(directory: str = QUESTION_BANK_DIR) -> Dict[str, QuestionBank]:
+    """Load every question bank definition found in ``directory``"""
+    banks = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        with open(path, 'r') as f:
+            bank = QuestionBank(json.load(f))
+        if bank.version in banks:
+            raise ValueError(f"Duplicate question bank version '{bank.version}' in {path}")
+        banks[bank.version] = bank
+        logger.info(f"Loaded question bank {bank.version} ({len(bank)} questions)")
+
+    with _load_lock:
+        _question_banks.clear()
+        _question_banks.update(banks)
+    return banks
+
+
+def get_question_bank(version: Optional[str] = None) -> QuestionBank:
+    """Get a question bank by version (default bank when version is None)"""
+    if not _question_banks:
+        load_question_banks()
+    version = version or DEFAULT_BANK_VERSION
+    if version not in _question_banks:
+        raise KeyError(f"Unknown question bank version '{version}'")
+    return _question_banks[version]
+
+
+def available_versions() -> List[str]:
+    """List loaded question bank versions"""
+    if not _question_banks:
+        load_question_banks()
+    return sorted(_question_banks)
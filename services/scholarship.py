@@ -5,8 +5,12 @@ Provides scholarship recommendations based on RIASEC traits with MongoDB storage
 
 from flask import Blueprint, request, jsonify
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, FrozenSet, List, Any, Optional
 from database import get_collection, COLLECTIONS
+from services.query_builder import PUBLIC_PROJECTION, add_search_fields, match_clause, public_projection
+from services.keyword_matcher import (
+    KEYWORD_TRAITS_FIELD, KeywordMatcher, add_keyword_traits, cached_traits, field_text
+)
 import pandas as pd
 import json
 import os
@@ -15,6 +19,21 @@ logger = logging.getLogger(__name__)
 
 scholarship_bp = Blueprint('scholarship', __name__)
 
+# /search parameters -> scholarship fields
+SCHOLARSHIP_SEARCH_FIELDS = {
+    'field': 'eligibility_criteria.course_stream',
+    'location': 'eligibility_criteria.domicile'
+}
+
+# Course streams a scholarship is open to, matched against the RIASEC keyword mapping
+SCHOLARSHIP_KEYWORD_FIELD = SCHOLARSHIP_SEARCH_FIELDS['field']
+
+# Data version key for the scholarships collection
+SCHOLARSHIPS_DATASET = 'scholarships'
+
+# Stored keyword traits are read for scoring only, and hidden from responses
+SCHOLARSHIP_PUBLIC_PROJECTION = public_projection(KEYWORD_TRAITS_FIELD)
+
 def load_scholarship_data_to_mongodb():
     """Load scholarship data from JSON to MongoDB"""
     try:
@@ -49,6 +68,8 @@ def load_scholarship_data_to_mongodb():
             scholarship['updated_at'] = pd.Timestamp.now()
             scholarship['views'] = 0
             scholarship['applications'] = 0
+            add_search_fields(scholarship, SCHOLARSHIP_SEARCH_FIELDS.values())
+            add_keyword_traits(scholarship, SCHOLARSHIP_KEYWORD_MATCHER, SCHOLARSHIP_KEYWORD_FIELD)
         
         if scholarships:
             scholarship_collection.insert_many(scholarships)
@@ -57,16 +78,29 @@ def load_scholarship_data_to_mongodb():
     except Exception as e:
         logger.error(f"Error loading scholarship data: {e}")
 
-# RIASEC type to scholarship mapping
+# RIASEC type to scholarship mapping; the last entries of a list name course streams used by scholarship.json
 RIASEC_SCHOLARSHIP_MAPPING = {
     'R': ['Engineering', 'Technology', 'Construction', 'Automotive', 'Manufacturing', 'Agriculture'],
-    'I': ['Science', 'Research', 'Mathematics', 'Medicine', 'Laboratory', 'Environmental'],
-    'A': ['Art', 'Design', 'Music', 'Creative', 'Media', 'Fashion', 'Film'],
+    'I': ['Science', 'Research', 'Mathematics', 'Medicine', 'Laboratory', 'Environmental', 'Medical', 'Pharmacy'],
+    'A': ['Art', 'Design', 'Music', 'Creative', 'Media', 'Fashion', 'Film', 'Journalism', 'Humanities'],
     'S': ['Education', 'Social Work', 'Healthcare', 'Psychology', 'Community Service', 'Counseling'],
-    'E': ['Business', 'Entrepreneurship', 'Management', 'Leadership', 'Marketing', 'Finance'],
+    'E': ['Business', 'Entrepreneurship', 'Management', 'Leadership', 'Marketing', 'Finance', 'Law'],
     'C': ['Accounting', 'Administration', 'Data Management', 'Office', 'Clerical', 'Organization']
 }
 
+# Keyword mapping compiled once; traits matched in a scholarship's course streams are stored at load
+SCHOLARSHIP_KEYWORD_MATCHER = KeywordMatcher(RIASEC_SCHOLARSHIP_MAPPING)
+
+def scholarship_keyword_traits(scholarship: Dict[str, Any]) -> FrozenSet[str]:
+    """RIASEC letters whose keywords appear in a scholarship's course streams"""
+    return cached_traits(scholarship, SCHOLARSHIP_KEYWORD_MATCHER, SCHOLARSHIP_KEYWORD_FIELD)
+
+def pop_keyword_traits(scholarship: Dict[str, Any]) -> FrozenSet[str]:
+    """Keyword traits of a scholarship read with PUBLIC_PROJECTION, removed so it can be served"""
+    traits = scholarship_keyword_traits(scholarship)
+    scholarship.pop(KEYWORD_TRAITS_FIELD, None)
+    return traits
+
 @scholarship_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -118,16 +152,10 @@ def get_scholarship_recommendations():
         
         scholarship_collection = get_collection(COLLECTIONS['scholarships'])
         
-        # Build query based on RIASEC and criteria
-        query = {}
-        
-        # Get relevant fields for RIASEC types
-        relevant_fields = []
-        for riasec_type in riasec_list:
-            relevant_fields.extend(RIASEC_SCHOLARSHIP_MAPPING[riasec_type])
+        riasec_set = set(riasec_list)
         
         # Query scholarships
-        all_scholarships = list(scholarship_collection.find({}, {'_id': 0}))
+        all_scholarships = list(scholarship_collection.find({}, PUBLIC_PROJECTION))
         
         # Filter and score scholarships
         recommendations = []
@@ -136,11 +164,9 @@ def get_scholarship_recommendations():
             score = 0
             
             # Check field relevance
-            scholarship_field = scholarship.get('field', '').lower()
-            for field in relevant_fields:
-                if field.lower() in scholarship_field:
-                    score += 30
-                    break
+            field_matches = bool(pop_keyword_traits(scholarship) & riasec_set)
+            if field_matches:
+                score += 30
             
             # Check CGPA eligibility
             min_cgpa = scholarship.get('min_cgpa', 0.0)
@@ -165,7 +191,8 @@ def get_scholarship_recommendations():
             
             # Check field of study
             if field_of_study:
-                if field_of_study.lower() in scholarship_field:
+                scholarship_field = str(field_text(scholarship, SCHOLARSHIP_KEYWORD_FIELD) or '').lower()
+                if str(field_of_study).lower() in scholarship_field:
                     score += 20
             
             # Add scholarship with score if it has some relevance
@@ -174,7 +201,7 @@ def get_scholarship_recommendations():
                 scholarship['match_reasons'] = []
                 
                 # Add match reasons
-                if any(field.lower() in scholarship_field for field in relevant_fields):
+                if field_matches:
                     scholarship['match_reasons'].append('Field matches your interests')
                 
                 if cgpa >= scholarship.get('min_cgpa', 0):
@@ -231,10 +258,10 @@ def search_scholarships():
         query = {}
         
         if field:
-            query['field'] = {'$regex': field, '$options': 'i'}
+            query.update(match_clause(SCHOLARSHIP_SEARCH_FIELDS['field'], field, 'prefix'))
         
         if location:
-            query['location'] = {'$regex': location, '$options': 'i'}
+            query.update(match_clause(SCHOLARSHIP_SEARCH_FIELDS['location'], location, 'prefix'))
         
         # Amount filtering (if amount field exists)
         if min_amount is not None or max_amount is not None:
@@ -246,7 +273,7 @@ def search_scholarships():
             if amount_query:
                 query['amount'] = amount_query
         
-        scholarships = list(scholarship_collection.find(query, {'_id': 0}))
+        scholarships = list(scholarship_collection.find(query, SCHOLARSHIP_PUBLIC_PROJECTION))
         
         return jsonify({
             'success': True,
@@ -273,7 +300,7 @@ def get_all_scholarships():
     """Get all scholarships"""
     try:
         scholarship_collection = get_collection(COLLECTIONS['scholarships'])
-        scholarships = list(scholarship_collection.find({}, {'_id': 0}))
+        scholarships = list(scholarship_collection.find({}, SCHOLARSHIP_PUBLIC_PROJECTION))
         
         return jsonify({
             'success': True,
@@ -336,14 +363,11 @@ def get_scholarships_by_riasec(riasec_type):
         
         # Find scholarships that match any of the relevant fields
         scholarships = []
-        all_scholarships = list(scholarship_collection.find({}, {'_id': 0}))
+        all_scholarships = list(scholarship_collection.find({}, PUBLIC_PROJECTION))
         
         for scholarship in all_scholarships:
-            scholarship_field = scholarship.get('field', '').lower()
-            for field in relevant_fields:
-                if field.lower() in scholarship_field:
-                    scholarships.append(scholarship)
-                    break
+            if riasec_type in pop_keyword_traits(scholarship):
+                scholarships.append(scholarship)
         
         return jsonify({
             'success': True,
@@ -0,0 +1,330 @@
+"""
+Text Search
+In-memory trigram, prefix and spelling indexes for ranked, typeahead and fuzzy search
+"""
+
+import logging
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+from services.query_builder import normalize_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 20
+DEFAULT_MIN_SCORE = 0.25
+DEFAULT_SUGGEST_LIMIT = 10
+DEFAULT_MAX_EDIT_DISTANCE = 2
+MIN_FUZZY_WORD_LENGTH = 3
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def trigrams(text: Any) -> Set[str]:
+    """Trigrams of normalized text; each word is padded like pg_trgm ('  word ')"""
+    normalized = normalize_text(text)
+    if not normalized:
+        return set()
+    if isinstance(normalized, list):
+        normalized = ' '.join(normalized)
+    grams = set()
+    for word in _TOKEN.findall(normalized):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _field_value(document: Dict[str, Any], field: str) -> Any:
+    value = document
+    for part in field.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class TrigramIndex:
+    """Trigram inverted index over several weighted text fields.
+
+    Each (document, field) pair is a slot. The similarity of a query to a slot
+    is the cosine of their binary trigram sets, |Q & T| / sqrt(|Q| * |T|), and a
+    document scores the best weighted similarity across its fields. Postings are
+    walked rarest-first; once no unseen document can reach the current k-th best
+    score, the remaining postings only update documents already in play. Only
+    slots that appear in a walked posting list are counted and scored, so a
+    query costs time in the postings it touches rather than the collection size.
+    """
+
+    def __init__(self, field_weights: Dict[str, float]):
+        self.fields = list(field_weights)
+        self.weights = np.array([field_weights[f] for f in self.fields], dtype=np.float64)
+        self.documents: List[Dict[str, Any]] = []
+        self.postings: Dict[str, np.ndarray] = {}
+        self.lengths = np.zeros((0, len(self.fields)), dtype=np.float64)
+        self.min_lengths = np.ones(len(self.fields), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def build(self, documents: Iterable[Dict[str, Any]]) -> 'TrigramIndex':
+        """Index documents; the documents themselves are kept for serving hits"""
+        field_count = len(self.fields)
+        self.documents = list(documents)
+        self.lengths = np.zeros((len(self.documents), field_count), dtype=np.float64)
+        postings = defaultdict(list)
+
+        for d, document in enumerate(self.documents):
+            for f, field in enumerate(self.fields):
+                grams = trigrams(_field_value(document, field))
+                self.lengths[d, f] = len(grams)
+                slot = d * field_count + f
+                for gram in grams:
+                    postings[gram].append(slot)
+
+        self.postings = {gram: np.array(slots, dtype=np.int64) for gram, slots in postings.items()}
+        populated = np.where(self.lengths > 0, self.lengths, np.inf)
+        self.min_lengths = populated.min(axis=0) if len(self.documents) else np.ones(field_count)
+        self.min_lengths[~np.isfinite(self.min_lengths)] = 1.0
+        logger.info(f"Built trigram index over {len(self.documents)} documents "
+                    f"({len(self.postings)} distinct trigrams)")
+        return self
+
+    def _score_upper_bound(self, overlap: int, query_size: int) -> float:
+        """Best score any slot could reach sharing ``overlap`` trigrams with the query"""
+        if overlap <= 0:
+            return 0.0
+        similarity = np.minimum(1.0, overlap / np.sqrt(query_size * self.min_lengths))
+        return float((self.weights * similarity).max())
+
+    def _scores(self, slots: List[np.ndarray], query_size: int):
+        """Touched documents in index order, their best weighted similarity and the field it came from"""
+        touched, counts = np.unique(np.concatenate(slots), return_counts=True)
+        docs, fields = np.divmod(touched, len(self.fields))
+        denominator = np.sqrt(query_size * np.maximum(self.lengths[docs, fields], 1.0))
+        weighted = self.weights[fields] * (counts / denominator)
+        # Best field first within each document; the stable sort keeps the earlier field on ties
+        order = np.lexsort((-weighted, docs))
+        docs, fields, weighted = docs[order], fields[order], weighted[order]
+        first = np.ones(len(docs), dtype=bool)
+        first[1:] = docs[1:] != docs[:-1]
+        return docs[first], weighted[first], fields[first]
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT,
+               min_score: float = DEFAULT_MIN_SCORE) -> List[Dict[str, Any]]:
+        """Top ``limit`` documents for a free-text query, best first"""
+        query_grams = trigrams(query)
+        if not query_grams or not self.documents or limit <= 0:
+            return []
+
+        query_size = len(query_grams)
+        field_count = len(self.fields)
+        posting_lists = sorted(
+            (self.postings[g] for g in query_grams if g in self.postings), key=len
+        )
+
+        if not posting_lists:
+            return []
+
+        # Admission: walk postings until no unseen document can make the top ``limit``
+        walked = []
+        for i, slots in enumerate(posting_lists):
+            walked.append(slots)
+            # An unseen document can only match the posting lists not yet walked
+            bound = self._score_upper_bound(len(posting_lists) - i - 1, query_size)
+            if bound < min_score:
+                break
+            docs, scores, _ = self._scores(walked, query_size)
+            if len(docs) >= limit and bound < np.partition(scores, -limit)[-limit]:
+                break
+        admitted = np.unique(np.concatenate(walked) // field_count)
+
+        # The remaining postings only update admitted documents
+        for slots in posting_lists[len(walked):]:
+            walked.append(slots[np.isin(slots // field_count, admitted)])
+
+        docs, scores, best_field = self._scores(walked, query_size)
+        keep = scores >= min_score
+        docs, scores, best_field = docs[keep], scores[keep], best_field[keep]
+        # Best first; documents are in index order, so ties keep their position
+        top = np.argsort(-scores, kind='stable')[:limit]
+
+        return [
+            {
+                'document': self.documents[docs[j]],
+                'score': round(float(scores[j]), 4),
+                'matched_field': self.fields[best_field[j]]
+            }
+            for j in top
+        ]
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over normalized names for typeahead.
+
+    Whole names and every later word start are kept in two sorted key arrays,
+    so a lookup is a binary search plus a walk over at most ``limit`` matches.
+    Names that start with the prefix are returned before mid-name word matches.
+    """
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._name_keys: List[str] = []
+        self._name_refs: List[int] = []
+        self._word_keys: List[str] = []
+        self._word_refs: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def build(self, items: Iterable[Tuple[str, Any]]) -> 'PrefixIndex':
+        """Index (name, value) pairs; lookups return the values"""
+        names = []
+        words = []
+        self.values = []
+        for text, value in items:
+            key = normalize_text(text)
+            if not key:
+                continue
+            ref = len(self.values)
+            self.values.append(value)
+            names.append((key, ref))
+            for match in _TOKEN.finditer(key):
+                if match.start() > 0:
+                    words.append((key[match.start():], ref))
+
+        names.sort()
+        words.sort()
+        self._name_keys = [key for key, _ in names]
+        self._name_refs = [ref for _, ref in names]
+        self._word_keys = [key for key, _ in words]
+        self._word_refs = [ref for _, ref in words]
+        return self
+
+    def suggest(self, prefix: str, limit: int = DEFAULT_SUGGEST_LIMIT) -> List[Any]:
+        """Values whose name, or a word within it, starts with ``prefix``"""
+        prefix = normalize_text(prefix)
+        if not prefix or limit <= 0:
+            return []
+
+        results = []
+        seen = set()
+        for keys, refs in ((self._name_keys, self._name_refs), (self._word_keys, self._word_refs)):
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and len(results) < limit and keys[i].startswith(prefix):
+                if refs[i] not in seen:
+                    seen.add(refs[i])
+                    results.append(self.values[refs[i]])
+                i += 1
+        return results
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, or max_distance + 1 once it is exceeded"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_row = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before_previous, previous_row = previous_row, row
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], before_previous[j - 2] + 1)
+        if min(row) > max_distance:
+            return max_distance + 1
+    return row[-1]
+
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    """Every string reachable from ``word`` by deleting up to ``distance`` characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+class DeletionDictionary:
+    """Symmetric-delete (SymSpell-style) spelling dictionary.
+
+    Every vocabulary word's deletes, up to ``max_distance`` characters of its
+    first ``prefix_length`` letters, are precomputed into a hash map. A lookup
+    generates the query's deletes the same way and only verifies words sharing
+    one, so its cost does not grow with the vocabulary.
+    """
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_EDIT_DISTANCE, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.counts: Dict[str, int] = {}
+        self.deletes: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def build(self, texts: Iterable[Any]) -> 'DeletionDictionary':
+        """Index every word of ``texts``, counting how often each occurs"""
+        counts = defaultdict(int)
+        for text in texts:
+            normalized = normalize_text(text)
+            if isinstance(normalized, list):
+                normalized = ' '.join(normalized)
+            for word in _TOKEN.findall(normalized or ''):
+                if len(word) >= MIN_FUZZY_WORD_LENGTH and not word.isdigit():
+                    counts[word] += 1
+
+        deletes = defaultdict(list)
+        for word in counts:
+            for deleted in _deletes(word[:self.prefix_length], self.max_distance):
+                deletes[deleted].append(word)
+        self.counts = dict(counts)
+        self.deletes = dict(deletes)
+        return self
+
+    def allowed_distance(self, word: str) -> int:
+        """Edit budget for a word; short words get fewer edits"""
+        return min(self.max_distance, max(0, (len(word) - 1) // 3))
+
+    def lookup(self, word: str, max_distance: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Vocabulary words within the edit budget of ``word``, closest and most frequent first"""
+        word = normalize_text(word) or ''
+        if max_distance is None:
+            max_distance = self.allowed_distance(word)
+        if word in self.counts:
+            return [{'word': word, 'distance': 0, 'count': self.counts[word]}]
+
+        candidates = set()
+        for deleted in _deletes(word[:self.prefix_length], max_distance):
+            candidates.update(self.deletes.get(deleted, ()))
+
+        matches = []
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append({'word': candidate, 'distance': distance, 'count': self.counts[candidate]})
+        matches.sort(key=lambda m: (m['distance'], -m['count'], m['word']))
+        return matches
+
+    def correct(self, text: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """Replace unknown words with their best match; returns the text and the corrections made"""
+        corrected = []
+        corrections = []
+        for word in _TOKEN.findall(normalize_text(text) or ''):
+            matches = self.lookup(word) if len(word) >= MIN_FUZZY_WORD_LENGTH else []
+            if matches and matches[0]['distance'] > 0:
+                corrections.append({
+                    'term': word,
+                    'suggestion': matches[0]['word'],
+                    'distance': matches[0]['distance']
+                })
+                corrected.append(matches[0]['word'])
+            else:
+                corrected.append(word)
+        return ' '.join(corrected), corrections
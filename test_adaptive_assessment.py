@@ -0,0 +1,61 @@
+"""
+Adaptive assessment tests
+Separation confidence, early stopping and next-item selection
+"""
+
+import numpy as np
+import pytest
+
+from services.adaptive_assessment import adaptive_settings, next_question, separation_confidence, should_stop
+from services.question_bank import RIASEC_TYPES, QuestionBank
+
+
+# Two single-trait items per type, in RIASEC order: R, R, I, I, ...
+BANK = QuestionBank({
+    'version': 't1',
+    'questions': [
+        {'question': f'{trait} item {n}', 'riasec_type': trait}
+        for trait in RIASEC_TYPES for n in range(2)
+    ]
+})
+SETTINGS = {'confidence': 0.9, 'min_items_per_trait': 2}
+
+
+def test_separation_confidence_needs_every_trait_answered():
+    responses = np.zeros(12)
+    responses[:10] = 3
+
+    assert separation_confidence(BANK, responses) == 0.0
+
+
+def test_separation_confidence_grows_with_the_gap():
+    close = np.array([4, 4, 3, 4, 1, 1, 1, 1, 1, 1, 1, 1])
+    clear = np.array([5, 5, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1])
+
+    assert 0.5 <= separation_confidence(BANK, close) < separation_confidence(BANK, clear) <= 1.0
+
+
+def test_should_stop_waits_for_coverage_and_confidence():
+    clear = np.array([5, 5, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1])
+    partial = clear.copy()
+    partial[11] = 0
+
+    assert should_stop(BANK, clear, SETTINGS)
+    assert not should_stop(BANK, partial, SETTINGS)
+    assert not should_stop(BANK, np.full(12, 3), SETTINGS)
+
+
+def test_next_question_covers_unseen_traits_first():
+    responses = np.zeros(12)
+    responses[[0, 1, 2, 3]] = 5
+
+    assert next_question(BANK, responses, SETTINGS) >= 4
+    assert next_question(BANK, np.full(12, 3), SETTINGS) is None
+
+
+def test_adaptive_settings_validates_options():
+    assert adaptive_settings({}) == SETTINGS
+    with pytest.raises(ValueError):
+        adaptive_settings({'confidence': 1.0})
+    with pytest.raises(ValueError):
+        adaptive_settings({'min_items_per_trait': 0})
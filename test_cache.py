@@ -0,0 +1,54 @@
+"""
+Cache tests
+In-process LRU cache and conditional JSON responses
+"""
+
+from flask import Flask
+
+from cache import LocalCache, cached_json_response, make_etag, serialize_json
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('cache.time.monotonic', lambda: now[0])
+    cache = LocalCache(ttl=10)
+    cache.set('a', 1)
+
+    now[0] = 110.0
+    assert cache.get('a') == 1
+    now[0] = 110.5
+    assert cache.get('a', 'gone') == 'gone'
+    assert len(cache) == 0
+
+
+def test_make_etag_is_stable_per_body():
+    assert make_etag('{"a": 1}') == make_etag(b'{"a": 1}')
+    assert make_etag('{"a": 1}') != make_etag('{"a": 2}')
+    assert len(make_etag('')) == 32
+
+
+def test_cached_json_response_answers_if_none_match():
+    app = Flask(__name__)
+    with app.test_request_context():
+        body = serialize_json({'a': 1})
+    etag = make_etag(body)
+
+    with app.test_request_context():
+        response = cached_json_response(body, etag)
+        assert response.status_code == 200
+        assert response.get_etag() == (etag, False)
+        assert 'immutable' in response.headers['Cache-Control']
+    with app.test_request_context(headers={'If-None-Match': f'"{etag}"'}):
+        assert cached_json_response(body, etag).status_code == 304
@@ -0,0 +1,32 @@
+"""
+Career analytics tests
+Session tags and the rollup keys a completed session contributes to
+"""
+
+from datetime import datetime
+
+from services.career_analytics import _rebuild_pipeline, rollup_keys, school_cohort_value, session_tags
+
+
+def test_session_tags_keep_non_empty_strings():
+    assert session_tags({'school': ' GHS Jammu ', 'cohort': '', 'grade': '12'}) == {'school': 'GHS Jammu'}
+    assert session_tags({'school': 7, 'cohort': '2026'}) == {'cohort': '2026'}
+
+
+def test_rollup_keys_cover_each_tag_and_the_pair():
+    assert rollup_keys({}) == [('all', 'all')]
+    assert rollup_keys({'school': 'A/B', 'cohort': 'C'}) == [
+        ('all', 'all'), ('school', 'A/B'), ('cohort', 'C'), ('school_cohort', {'school': 'A/B', 'cohort': 'C'})
+    ]
+
+
+def test_school_cohort_pairs_with_slashes_stay_distinct():
+    assert school_cohort_value('A/B', 'C') != school_cohort_value('A', 'B/C')
+
+
+def test_rebuild_only_counts_sessions_before_the_cutoff():
+    cutoff = datetime(2026, 1, 1)
+    match = _rebuild_pipeline('school_cohort', cutoff)[0]['$match']
+
+    assert match['results.completed_at'] == {'$lt': cutoff}
+    assert match['tags.school'] == match['tags.cohort'] == {'$exists': True}
@@ -0,0 +1,56 @@
+"""
+Career catalog tests
+Profile correlation matching against the occupation catalog
+"""
+
+import numpy as np
+import pytest
+
+from services.career_catalog import CareerCatalog, load_career_catalog, match_careers
+
+
+CATALOG = CareerCatalog(
+    ['Mechanic', 'Painter', 'Accountant'],
+    np.array([
+        [7.0, 4.0, 1.0, 2.0, 3.0, 4.0],
+        [2.0, 3.0, 7.0, 4.0, 3.0, 1.0],
+        [2.0, 4.0, 1.0, 3.0, 5.0, 7.0]
+    ])
+)
+
+
+def test_match_ranks_by_profile_correlation():
+    matches = CATALOG.match({'R': 20, 'I': 11, 'A': 2, 'S': 5, 'E': 8, 'C': 11}, top_k=2)
+
+    assert [m['career'] for m in matches] == ['Mechanic', 'Accountant']
+    assert matches[0]['holland_code'] == 'RIC'
+    assert matches[0]['similarity'] == pytest.approx(1.0, abs=1e-4)
+    assert matches[0]['similarity'] > matches[1]['similarity']
+
+
+def test_match_ignores_score_scale_and_flat_profiles():
+    scores = {'artistic': 7, 'social': 4, 'realistic': 2, 'investigative': 3, 'enterprising': 3, 'conventional': 1}
+    doubled = {trait: 2 * value for trait, value in scores.items()}
+
+    assert CATALOG.match(scores, top_k=1) == CATALOG.match(doubled, top_k=1)
+    assert CATALOG.match(scores, top_k=1)[0]['career'] == 'Painter'
+    assert CATALOG.match({trait: 3 for trait in 'RIASEC'}) == []
+    assert len(CATALOG.match(scores, top_k=0)) == 1
+
+
+def test_catalog_rejects_mismatched_lengths():
+    with pytest.raises(ValueError):
+        CareerCatalog(['Mechanic'], np.zeros((2, 6)))
+
+
+def test_match_careers_uses_the_loaded_catalog(tmp_path, monkeypatch):
+    path = tmp_path / 'careers.csv'
+    path.write_text(
+        'Career,Realistic,Investigative,Artistic,Social,Enterprising,Conventional\n'
+        'Nurse,2,5,2,7,3,4\n'
+        'Lawyer,1,4,3,4,7,5\n'
+    )
+    monkeypatch.setattr('services.career_catalog._catalog', None)
+    load_career_catalog(str(path))
+
+    assert [m['career'] for m in match_careers({'S': 7, 'I': 5, 'C': 4, 'E': 3, 'R': 2, 'A': 2})] == ['Nurse', 'Lawyer']
@@ -0,0 +1,53 @@
+"""
+Career guidance tests
+Stale answer detection and career match links
+"""
+
+from flask import Flask
+
+import services.career_guidance as career_guidance
+from services.career_guidance import _is_stale_answer
+from services.question_bank import QuestionBank
+
+
+BANK = QuestionBank({
+    'version': 't1',
+    'questions': [
+        {'id': 'R1', 'question': 'Build things', 'riasec_type': 'realistic'},
+        {'id': 'I1', 'question': 'Solve puzzles', 'riasec_type': 'investigative'}
+    ]
+})
+
+
+def test_answer_without_question_reference_is_accepted():
+    session = {'current_question': 1, 'completed': False}
+
+    assert not _is_stale_answer({'answer': 3}, session, BANK, 1)
+
+
+def test_retried_answer_is_stale():
+    session = {'current_question': 1, 'completed': False}
+
+    assert _is_stale_answer({'question_number': 1}, session, BANK, 1)
+    assert _is_stale_answer({'question_id': 'R1'}, session, BANK, 1)
+    assert not _is_stale_answer({'question_number': 2, 'question_id': 'I1'}, session, BANK, 1)
+
+
+def test_answer_to_completed_session_naming_a_question_is_stale():
+    session = {'current_question': 2, 'completed': True}
+
+    assert _is_stale_answer({'question_id': 'I1'}, session, BANK, 2)
+    assert _is_stale_answer({'question_number': 2}, session, BANK, 2)
+
+
+def test_courses_url_is_percent_encoded(monkeypatch):
+    monkeypatch.setattr(career_guidance, 'profession_course_counts', lambda careers: {career: 2 for career in careers})
+    app = Flask(__name__)
+    app.register_blueprint(career_guidance.career_guidance_bp, url_prefix='/api/career')
+    response = app.test_client().post('/api/career/careers/match', json={
+        'riasec_scores': {'R': 2, 'I': 7, 'A': 2.5, 'S': 1.5, 'E': 2, 'C': 4}, 'top_k': 100
+    })
+
+    urls = {match['career']: match['courses_url'] for match in response.get_json()['matches']}
+    assert ' ' not in ''.join(urls.values())
+    assert urls['AI/ML Engineer'] == '/api/course/professions/AI/ML%20Engineer'
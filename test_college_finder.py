@@ -0,0 +1,67 @@
+"""
+College finder tests
+Parsing of raw college CSV columns into typed query fields, degree codes and filter facets
+"""
+
+import pytest
+
+from services.college_finder import (
+    COLLEGE_FACETS, degree_code, facet_pipeline, format_facets, parse_degrees, parse_facets, parse_fee_range
+)
+
+
+def test_parse_fee_range_reads_ranges_and_totals():
+    assert parse_fee_range('10,000 - 12,500') == {'fee_min': 10000, 'fee_max': 12500, 'fee_is_total': False}
+    assert parse_fee_range('1,65,000') == {'fee_min': 165000, 'fee_max': 165000, 'fee_is_total': False}
+    assert parse_fee_range('46,000 - 67,000 (Total)') == {'fee_min': 46000, 'fee_max': 67000, 'fee_is_total': True}
+
+
+def test_parse_fee_range_skips_missing_and_implausible_amounts():
+    empty = {'fee_min': None, 'fee_max': None, 'fee_is_total': False}
+
+    assert parse_fee_range(None) == empty
+    assert parse_fee_range(float('nan')) == empty
+    assert parse_fee_range('Not disclosed') == empty
+    assert parse_fee_range('5 - 20,000') == {'fee_min': 20000, 'fee_max': 20000, 'fee_is_total': False}
+
+
+def test_degree_code_ignores_punctuation_and_specialization():
+    assert degree_code('B.Sc IT') == degree_code('BSc') == degree_code('Bsc') == 'BSC'
+    assert degree_code('Ph.D.') == 'PHD'
+    assert degree_code('Certificate') is None
+    assert degree_code('  ') is None
+
+
+def test_parse_degrees_splits_outside_parentheses():
+    assert parse_degrees('B.E. (Civil, Mech), BCA, B.Sc, BSc (Hons)') == ['BE', 'BCA', 'BSC']
+    assert parse_degrees('MBBS, MD, Fellowship') == ['MBBS', 'MD']
+    assert parse_degrees(None) == []
+
+
+def test_parse_facets_accepts_all_one_or_a_list():
+    assert parse_facets(True) == list(COLLEGE_FACETS)
+    assert parse_facets(None) == parse_facets(False) == []
+    assert parse_facets('district') == ['district']
+    assert parse_facets(['division', 'review_score']) == ['division', 'review_score']
+    with pytest.raises(ValueError):
+        parse_facets(['division', 'State'])
+
+
+def test_facet_pipeline_pages_hits_and_buckets_review_scores():
+    pipeline = facet_pipeline({'District': 'Srinagar'}, ['division', 'review_score'], skip=20, limit=10)
+    branches = pipeline[1]['$facet']
+
+    assert pipeline[0] == {'$match': {'District': 'Srinagar'}}
+    assert branches['hits'][1:3] == [{'$skip': 20}, {'$limit': 10}]
+    assert branches['division'][0] == {'$group': {'_id': '$Division', 'count': {'$sum': 1}}}
+    assert branches['review_score'][0]['$bucket']['default'] == 'unrated'
+
+
+def test_format_facets_labels_review_buckets():
+    result = {'review_score': [{'_id': 4.5, 'count': 2}, {'_id': 'unrated', 'count': 1}],
+              'division': [{'_id': 'Kashmir', 'count': 3}]}
+
+    assert format_facets(result, ['review_score', 'division']) == {
+        'review_score': [{'value': '4.5-5', 'count': 2}, {'value': 'unrated', 'count': 1}],
+        'division': [{'value': 'Kashmir', 'count': 3}]
+    }
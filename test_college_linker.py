@@ -0,0 +1,45 @@
+"""
+College linker tests
+Resolving course-side college names to College_IDs
+"""
+
+from services.college_linker import CollegeNameMatcher, college_location, minted_college_id, name_tokens
+
+
+COLLEGES = [
+    {'College_ID': 'K-MED-01', 'College_Name': 'Government Medical College Srinagar', 'Location_City': 'Srinagar'},
+    {'College_ID': 'J-MED-02', 'College_Name': 'Government Medical College Jammu', 'Location_City': 'Jammu'},
+    {'College_ID': 'K-ENGG-01', 'College_Name': 'National Institute of Technology (NIT) Srinagar',
+     'Location_City': 'Srinagar'},
+    {'College_ID': 'J-UNI-01', 'College_Name': 'Shri Mata Vaishno Devi University', 'Location_City': 'Katra'}
+]
+
+
+def test_name_tokens_expand_abbreviations_and_drop_stopwords():
+    assert name_tokens('GMC Srinagar') == {'government', 'medical', 'college', 'srinagar'}
+    assert name_tokens('Institute of Technology') == {'institute', 'technology'}
+
+
+def test_matcher_resolves_exact_alias_and_token_names():
+    matcher = CollegeNameMatcher(COLLEGES)
+
+    assert matcher.resolve(' government medical college  JAMMU ') == ('J-MED-02', 'exact')
+    assert matcher.resolve('AIIMS Jammu') == ('J-MED-01', 'alias')
+    assert matcher.resolve('GMC Srinagar') == ('K-MED-01', 'tokens')
+    assert matcher.resolve('NIT Srinagar') == ('K-ENGG-01', 'tokens')
+    assert matcher.resolve('SMVDU') == ('J-UNI-01', 'tokens')
+
+
+def test_matcher_leaves_partial_and_ambiguous_names_unresolved():
+    matcher = CollegeNameMatcher(COLLEGES)
+
+    assert matcher.resolve('Government Medical College') == (None, 'unresolved')
+    assert matcher.resolve('NIT Jammu') == (None, 'unresolved')
+    assert matcher.resolve('') == (None, 'unresolved')
+
+
+def test_minted_ids_and_locations():
+    assert minted_college_id('SKUAST-K (Srinagar)') == 'C-SKUAST-K-SRINAGAR'
+    rows = [{'Latitude': 34.08, 'Longitude': 74.79}, {'Latitude': 34.08, 'Longitude': 74.79}, {'Latitude': None}]
+    assert college_location(rows) == {'type': 'Point', 'coordinates': [74.79, 34.08]}
+    assert college_location([{'Latitude': 'x', 'Longitude': 1}]) is None
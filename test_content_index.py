@@ -0,0 +1,74 @@
+"""
+Content index tests
+TF-IDF rows, incremental updates and chunked persistence
+"""
+
+import numpy as np
+import pytest
+
+from services.content_index import ContentIndex
+
+
+ARTICLES = {
+    'a': {'Headline': 'Flood closes Jammu colleges', 'Description': 'Heavy rain floods college campuses'},
+    'b': {'Headline': 'New medical seats', 'Description': 'Medical colleges add MBBS seats'},
+    'c': {'Headline': 'Engineering exam dates', 'Description': 'Entrance exam for engineering colleges announced'}
+}
+
+
+def make_index():
+    return ContentIndex(['Headline', 'Description']).fit(list(ARTICLES), ARTICLES.values())
+
+
+def test_rows_are_normalized_for_cosine_similarity():
+    index = make_index()
+    similarities = index.similarities(index.matrix)
+
+    assert similarities.shape == (3, 3)
+    assert np.allclose(np.diag(similarities), 1.0)
+    query = index.vectorize(['medical seats'])
+    assert int(index.similarities(query)[:, 0].argmax()) == index.positions['b']
+
+
+def test_add_appends_new_and_replaces_changed_rows():
+    index = make_index()
+    edited = dict(ARTICLES['a'], Headline='Medical seats added')
+    new = {'Headline': 'Exam results', 'Description': 'Engineering exam results out'}
+
+    assert index.changed({'a': edited, 'b': ARTICLES['b']}) == ['a']
+    index.add(['a', 'd'], [edited, new])
+
+    assert sorted(index.ids) == ['a', 'b', 'c', 'd']
+    assert index.changed(dict(ARTICLES, a=edited, d=new)) == []
+    row = index.matrix[index.positions['a']]
+    assert abs(row - index.vectorize([index.text(edited)])).sum() == pytest.approx(0)
+
+
+def test_refit_after_enough_additions():
+    index = make_index()
+
+    assert not index.needs_refit()
+    assert index.needs_refit(adding=1)
+    assert ContentIndex(['Headline']).needs_refit()
+
+
+@pytest.mark.parametrize('max_nonzeros', [1, 5, 1000])
+def test_chunks_round_trip(max_nonzeros):
+    index = make_index()
+    chunks = list(index.to_chunks(max_nonzeros))
+    restored = ContentIndex.from_document(index.to_document(), chunks)
+
+    assert sum(len(chunk['ids']) for chunk in chunks) == len(index)
+    assert len(chunks) == (1 if max_nonzeros == 1000 else 3)
+    assert restored.ids == index.ids and restored.hashes == index.hashes
+    assert (restored.matrix != index.matrix).nnz == 0
+    texts = ['flood rain']
+    assert (restored.vectorize(texts) != index.vectorize(texts)).nnz == 0
+
+
+def test_missing_chunks_are_rejected():
+    index = make_index()
+    chunks = list(index.to_chunks(1))
+
+    with pytest.raises(ValueError):
+        ContentIndex.from_document(index.to_document(), chunks[:-1])
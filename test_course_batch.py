@@ -0,0 +1,59 @@
+"""
+Batch course recommendation tests
+Eligibility masks are shared between students with equal filters
+"""
+
+import numpy as np
+
+import services.course_suggestion as course_suggestion
+from services.course_catalog import CourseCatalog
+
+
+def make_catalog():
+    courses = [
+        {'Course_Name': 'B.Tech', 'RIASEC_Trait': 'R', 'Course_Rating_Placeholder': 4.0},
+        {'Course_Name': 'MBBS', 'RIASEC_Trait': 'I', 'Course_Rating_Placeholder': 4.5},
+        {'Course_Name': 'BA English', 'RIASEC_Trait': 'A', 'Course_Rating_Placeholder': 3.0}
+    ]
+    return CourseCatalog(courses, [None] * len(courses), lambda course: ())
+
+
+def test_shared_eligibility_computes_each_filter_once(monkeypatch):
+    catalog = make_catalog()
+    calls = []
+    original = course_suggestion.eligible_courses
+
+    def counting(catalog, profile):
+        calls.append(course_suggestion.profile_filter_key(profile))
+        return original(catalog, profile)
+
+    monkeypatch.setattr(course_suggestion, 'eligible_courses', counting)
+    profiles = [
+        course_suggestion.parse_recommend_profile({'riasec_scores': {'R': i}, 'preferences': {'min_rating': rating}})
+        for i, rating in enumerate([4, 4, None, 4, None])
+    ]
+    masks = {}
+    eligible = course_suggestion.shared_eligibility(catalog, profiles, masks)
+
+    assert len(calls) == 2
+    assert eligible.shape == (5, 3)
+    assert eligible[0].tolist() == [True, True, False]
+    assert eligible[2].all()
+
+    course_suggestion.shared_eligibility(catalog, profiles, masks)
+    assert len(calls) == 2
+
+
+def test_batch_matches_single_recommendations():
+    catalog = make_catalog()
+    profiles = [
+        course_suggestion.parse_recommend_profile({'riasec_scores': scores})
+        for scores in ({'R': 10}, {'I': 10}, {'A': 30})
+    ]
+    results = list(course_suggestion.batch_recommendations(catalog, profiles, ['a', 'b', 'c'], limit=2))
+
+    for profile, result in zip(profiles, results):
+        scores = catalog.scores(catalog.riasec_weights(profile['riasec_scores']))
+        expected = catalog.top_k(scores, np.ones(len(catalog), dtype=bool), 2)
+        assert [course['Course_Name'] for course in result['recommendations']] == \
+            [catalog.courses[i]['Course_Name'] for i in expected]
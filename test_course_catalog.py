@@ -0,0 +1,51 @@
+"""
+Course catalog tests
+Diversity reranking by maximal marginal relevance
+"""
+
+import numpy as np
+
+from services.course_catalog import CourseCatalog
+
+
+def make_catalog(courses):
+    return CourseCatalog(courses, [None] * len(courses), lambda course: ())
+
+
+def test_diverse_top_k_without_diversity_is_top_k():
+    catalog = make_catalog([{'Course_Name': name, 'college_id': 'a'} for name in 'ABCD'])
+    scores = np.array([1.0, 4.0, 3.0, 2.0])
+
+    assert catalog.diverse_top_k(scores, k=3).tolist() == catalog.top_k(scores, k=3).tolist() == [1, 2, 3]
+
+
+def test_diverse_top_k_spreads_picks_across_colleges():
+    catalog = make_catalog([
+        {'Course_Name': 'B.Tech', 'college_id': 'a', 'RIASEC_Trait': 'R'},
+        {'Course_Name': 'B.Sc', 'college_id': 'a', 'RIASEC_Trait': 'I'},
+        {'Course_Name': 'BA', 'college_id': 'b', 'RIASEC_Trait': 'A'}
+    ])
+    scores = np.array([10.0, 9.5, 9.0])
+
+    assert catalog.diverse_top_k(scores, k=2).tolist() == [0, 1]
+    assert catalog.diverse_top_k(scores, k=2, diversity=0.5).tolist() == [0, 2]
+
+
+def test_diverse_top_k_respects_mask_and_k():
+    catalog = make_catalog([{'Course_Name': name} for name in 'ABC'])
+    scores = np.array([3.0, 2.0, 1.0])
+    mask = np.array([False, True, True])
+
+    assert catalog.diverse_top_k(scores, mask, k=5, diversity=0.5).tolist() == [1, 2]
+    assert catalog.diverse_top_k(scores, np.zeros(3, dtype=bool), diversity=0.5).tolist() == []
+
+
+def test_unknown_features_are_not_shared():
+    catalog = make_catalog([
+        {'Course_Name': 'B.Tech', 'college_id': 'a', 'RIASEC_Trait': 'R'},
+        {},
+        {}
+    ])
+
+    assert catalog.similarity_to(np.arange(3), 1).tolist() == [0.0, 0.0, 0.0]
+    assert catalog.similarity_to(np.arange(3), 0)[0] > 0
@@ -0,0 +1,46 @@
+"""
+Course offerings tests
+Read-time join of linked course rows to their colleges
+"""
+
+from services import course_offerings
+from services.course_offerings import college_rating, college_summary, hydrate_course, split_colleges
+
+
+COLLEGE = {
+    'College_ID': 'K-ENGG-01', 'College_Name': 'NIT Srinagar', 'College_Type': 'Government',
+    'Location_City': 'Srinagar', 'District': 'Srinagar',
+    'location': {'type': 'Point', 'coordinates': [74.84, 34.12]}, 'college_rating': 4.4
+}
+JOIN = {'K-ENGG-01': college_summary(COLLEGE)}
+
+
+def test_college_rating_averages_valid_placeholders():
+    rows = [{'College_Rating_Placeholder': '4.2'}, {'College_Rating_Placeholder': 4.5},
+            {'College_Rating_Placeholder': float('nan')}, {'College_Rating_Placeholder': 'n/a'}, {}]
+
+    assert college_rating(rows) == 4.3
+    assert college_rating([{}]) is None
+
+
+def test_hydrate_course_fills_college_columns():
+    row = {'Course_Name': 'B.Tech', 'college_id': 'K-ENGG-01', 'College_Name': 'N.I.T. Sgr', 'Latitude': 0}
+    course = hydrate_course(row, JOIN)
+
+    assert course['College_Name'] == 'NIT Srinagar'
+    assert (course['Latitude'], course['Longitude']) == (34.12, 74.84)
+    assert course['College_Rating_Placeholder'] == 4.4
+    assert row['College_Name'] == 'N.I.T. Sgr'
+
+
+def test_split_colleges_ships_each_college_once(monkeypatch):
+    monkeypatch.setattr(course_offerings, 'get_college_join', lambda: JOIN)
+    linked = [hydrate_course({'Course_Name': name, 'college_id': 'K-ENGG-01'}, JOIN) for name in ('B.Tech', 'M.Tech')]
+    unlinked = {'Course_Name': 'BA', 'College_Name': 'Unknown College', 'Latitude': 33.0}
+
+    compact, colleges = split_colleges(linked + [unlinked])
+
+    assert colleges == JOIN
+    assert compact[:2] == [{'Course_Name': 'B.Tech', 'college_id': 'K-ENGG-01'},
+                           {'Course_Name': 'M.Tech', 'college_id': 'K-ENGG-01'}]
+    assert compact[2] is unlinked
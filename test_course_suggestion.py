@@ -0,0 +1,34 @@
+"""
+Course suggestion tests
+Potential_Professions parsing, profession lookup keys, suggestion keys and keyword traits
+"""
+
+from services.course_suggestion import (
+    COURSE_PUBLIC_PROJECTION, course_keyword_traits, parse_professions, profession_keys, suggestion_key
+)
+
+
+def test_parse_professions_splits_and_dedupes():
+    assert parse_professions('Doctor,  Surgeon , doctor,,Medical  Officer') == ['Doctor', 'Surgeon', 'Medical Officer']
+    assert parse_professions(None) == []
+    assert parse_professions(3.0) == []
+
+
+def test_profession_keys_include_alternatives():
+    assert profession_keys('Scientist (Physicist)') == ['scientist (physicist)', 'scientist', 'physicist']
+    assert profession_keys('Writer/Author') == ['writer/author', 'writer', 'author']
+    assert profession_keys('AI/ML Engineer') == ['ai/ml engineer']
+
+
+def test_suggestion_key_ignores_punctuation_and_spacing():
+    assert suggestion_key('B.COM') == suggestion_key('B.Com') == suggestion_key('BCom') == suggestion_key('B. Com')
+    assert suggestion_key('B.Sc Physics') != suggestion_key('B.Sc Chemistry')
+
+
+def test_course_keyword_traits_use_trait_letters():
+    assert course_keyword_traits({'Course_Name': 'B.Sc Computer Science'}) == {'R', 'I'}
+    assert course_keyword_traits({'Course_Name': 'MBA', 'keyword_traits': ['E']}) == {'E'}
+
+
+def test_public_projection_hides_internal_fields():
+    assert COURSE_PUBLIC_PROJECTION['keyword_traits'] == COURSE_PUBLIC_PROJECTION['profession_keys'] == 0
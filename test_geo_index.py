@@ -0,0 +1,63 @@
+"""
+Geo index tests
+Nearest-k and within-radius lookups, point validation and query parsing
+"""
+
+import pytest
+
+from services.geo_index import GeoIndex, most_common_point, parse_geo_query, valid_point
+
+
+# Srinagar, Sopore and Jammu
+PLACES = ['Srinagar', 'Sopore', 'Jammu']
+LATITUDES = [34.0837, 34.3000, 32.7266]
+LONGITUDES = [74.7973, 74.4667, 74.8570]
+
+
+def make_index():
+    return GeoIndex(PLACES, LATITUDES, LONGITUDES)
+
+
+def test_nearest_orders_by_distance():
+    hits = make_index().nearest(34.08, 74.79, k=2)
+
+    assert [hit['item'] for hit in hits] == ['Srinagar', 'Sopore']
+    assert hits[0]['distance_km'] < 1 < hits[1]['distance_km']
+
+
+def test_radius_distances_stay_within_radius():
+    index = make_index()
+    radius_km = index.nearest(34.08, 74.79, k=3)[-1]['distance_km'] + 0.001
+    hits = index.nearest(34.08, 74.79, k=3, radius_km=radius_km)
+
+    assert [hit['item'] for hit in hits] == PLACES
+    assert all(hit['distance_km'] <= radius_km for hit in hits)
+    assert [hit['item'] for hit in index.nearest(34.08, 74.79, k=3, radius_km=50)] == ['Srinagar', 'Sopore']
+
+
+def test_predicate_widens_the_search():
+    hits = make_index().nearest(34.08, 74.79, k=1, predicate=lambda place: place == 'Jammu')
+
+    assert [hit['item'] for hit in hits] == ['Jammu']
+
+
+def test_empty_index_returns_nothing():
+    assert GeoIndex([], [], []).nearest(34.08, 74.79) == []
+    with pytest.raises(ValueError):
+        GeoIndex(PLACES, LATITUDES[:2], LONGITUDES[:2])
+
+
+def test_valid_and_most_common_point():
+    assert valid_point('34.08', 74.79)
+    assert not valid_point(34.08, 34.08)
+    assert not valid_point(None, 74.79)
+    assert most_common_point([(34.08, 74.79), (1, 1), (34.08, 74.79), (32.7, 74.8)]) == (34.08, 74.79)
+    assert most_common_point([('x', None)]) is None
+
+
+def test_parse_geo_query_validates_parameters():
+    assert parse_geo_query({'lat': '34.08', 'lon': '74.79', 'k': '500', 'radius_km': ''}) == (34.08, 74.79, 100, None)
+    for args in ({'lat': 34.08}, {'lat': 91, 'lon': 0}, {'lat': 0, 'lon': 0, 'k': 'x'},
+                 {'lat': 0, 'lon': 0, 'radius_km': 5000}):
+        with pytest.raises(ValueError):
+            parse_geo_query(args)
@@ -0,0 +1,45 @@
+"""
+Keyword matcher tests
+Single-pass trait matching over plain and nested document text
+"""
+
+from services.keyword_matcher import KEYWORD_TRAITS_FIELD, KeywordMatcher, add_keyword_traits, cached_traits, field_text
+
+
+MATCHER = KeywordMatcher({
+    'I': ['Science', 'Medical'],
+    'R': ['Engineering', 'Engineer'],
+    'A': ['Arts'],
+    'E': ['Management']
+})
+
+
+def test_traits_are_case_insensitive_substrings():
+    assert MATCHER.traits('B.Tech in mechanical ENGINEERING') == {'R'}
+    assert MATCHER.traits('Medical science and fine arts') == {'I', 'A'}
+    assert MATCHER.traits('History') == frozenset()
+    assert MATCHER.traits(None) == frozenset()
+
+
+def test_overlapping_keywords_report_every_trait():
+    matcher = KeywordMatcher({'R': ['Engineering'], 'I': ['Engineer'], 'E': ['ring']})
+
+    assert matcher.traits('engineering') == {'R', 'I', 'E'}
+
+
+def test_field_text_walks_paths_and_joins_lists():
+    document = {'eligibility': {'course_streams': ['Engineering', 3, 'Management']}, 'name': 'Merit award'}
+
+    assert field_text(document, 'eligibility.course_streams') == 'Engineering, Management'
+    assert field_text(document, 'name') == 'Merit award'
+    assert field_text(document, 'eligibility.missing.path') is None
+    assert field_text(document, 'name.first') is None
+
+
+def test_stored_traits_take_precedence():
+    document = add_keyword_traits({'eligibility': {'course_streams': ['Arts', 'Science']}}, MATCHER,
+                                  'eligibility.course_streams')
+
+    assert document[KEYWORD_TRAITS_FIELD] == ['A', 'I']
+    assert cached_traits({KEYWORD_TRAITS_FIELD: ['E'], 'text': 'Arts'}, MATCHER, 'text') == {'E'}
+    assert cached_traits({'text': 'Arts'}, MATCHER, 'text') == {'A'}
@@ -0,0 +1,61 @@
+"""
+News recommender tests
+Rotation of ranked article pools per reader
+"""
+
+import threading
+
+from services import news_recommender
+from services.news_recommender import NEWS_CACHE_CONTROL, ROTATION_WINDOW_SECONDS, rotate_news, rotation_key
+
+
+POOL = [{'News_ID': f'JK-{i:02d}'} for i in range(9)]
+
+
+def test_rotate_news_without_key_keeps_ranking():
+    assert rotate_news(POOL, 3, None) == POOL[:3]
+    assert rotate_news(POOL[:2], 3, 'seed:1') == POOL[:2]
+
+
+def test_rotate_news_is_stable_and_keeps_rank_order():
+    rotated = rotate_news(POOL, 3, 'seed:1')
+
+    assert rotated == rotate_news(POOL, 3, 'seed:1')
+    assert len(rotated) == 3
+    positions = [POOL.index(article) for article in rotated]
+    assert positions == sorted(positions)
+    assert len({tuple(a['News_ID'] for a in rotate_news(POOL, 3, f'seed:{i}')) for i in range(20)}) > 1
+
+
+def test_rotation_key_windows_readers():
+    assert rotation_key({}) == (None, NEWS_CACHE_CONTROL)
+    assert rotation_key({'seed': 7}) == ('seed:7', NEWS_CACHE_CONTROL)
+
+    start = 100 * ROTATION_WINDOW_SECONDS
+    key, cache_control = rotation_key({'user_id': 'u1'}, now=start + 60)
+    assert key == rotation_key({'user_id': 'u1'}, now=start + ROTATION_WINDOW_SECONDS - 1)[0]
+    assert key != rotation_key({'user_id': 'u1'}, now=start + ROTATION_WINDOW_SECONDS)[0]
+    assert cache_control == f'private, max-age={ROTATION_WINDOW_SECONDS - 60}'
+
+
+def test_concurrent_get_news_index_builds_once(monkeypatch):
+    builds = []
+    started = threading.Event()
+
+    def build():
+        builds.append(1)
+        started.wait(1)
+        news_recommender._index = {'version': 'v1'}
+        return news_recommender._index
+
+    monkeypatch.setattr(news_recommender, '_index', None)
+    monkeypatch.setattr(news_recommender, '_build_news_index', build)
+    monkeypatch.setattr(news_recommender, 'get_data_version', lambda name: 'v1')
+    threads = [threading.Thread(target=news_recommender.get_news_index) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    started.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
@@ -0,0 +1,45 @@
+"""
+Query builder tests
+Normalized search fields and escaped match clauses
+"""
+
+import re
+
+import pytest
+
+from services.query_builder import (
+    any_field_clause, match_clause, normalize_text, parse_match_mode, search_fields_for
+)
+
+
+def test_normalize_text_folds_case_and_whitespace():
+    assert normalize_text('  Computer\tScience  ') == 'computer science'
+    assert normalize_text(['B.Tech ', '', None]) == ['b.tech']
+    assert normalize_text(float('nan')) is None
+
+
+def test_match_clause_escapes_user_input():
+    contains = match_clause('College_Name', 'B.Sc (Hons)+')
+    prefix = match_clause('College_Name', ' Govt. ', 'prefix')
+
+    assert contains == {'_search.College_Name': {'$regex': re.escape('b.sc (hons)+')}}
+    assert re.search(contains['_search.College_Name']['$regex'], 'a b.sc (hons)+ course')
+    assert not re.search(contains['_search.College_Name']['$regex'], 'bxsc hons')
+    assert prefix == {'_search.College_Name': {'$regex': '^govt\\.'}}
+    assert match_clause('location.city', 'Srinagar', 'exact') == {'_search.location__city': 'srinagar'}
+
+
+def test_match_modes_are_validated():
+    assert parse_match_mode(None, 'prefix') == 'prefix'
+    assert parse_match_mode('EXACT', 'prefix') == 'exact'
+    with pytest.raises(ValueError):
+        parse_match_mode('$where', 'prefix')
+    with pytest.raises(ValueError):
+        match_clause('College_Name', 'x', 'fuzzy')
+
+
+def test_any_field_clause_and_search_fields():
+    clause = any_field_clause(['a', 'b'], 'X', 'exact')
+
+    assert clause == {'$or': [{'_search.a': 'x'}, {'_search.b': 'x'}]}
+    assert search_fields_for({'a': ' X ', 'n': {'c': 'Y'}}, ['a', 'n.c', 'm']) == {'a': 'x', 'n__c': 'y', 'm': None}
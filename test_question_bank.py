@@ -0,0 +1,71 @@
+"""
+Question bank tests
+Bank loading and matrix scoring with multi-trait and reverse-scored items
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from services.question_bank import QuestionBank, load_question_banks, scores_to_dict, scores_to_vector
+
+
+DEFINITION = {
+    'version': 't1',
+    'scale': {'min': 1, 'max': 5},
+    'questions': [
+        {'id': 'R1', 'question': 'Build things', 'riasec_type': 'realistic'},
+        {'id': 'I1', 'question': 'Avoid puzzles', 'weights': {'investigative': 1.0}, 'reverse': True},
+        {'id': 'AS1', 'question': 'Perform for people', 'weights': {'artistic': 1.0, 'social': 0.5}}
+    ]
+}
+
+
+def test_score_matrix_applies_weights_and_reverse_items():
+    bank = QuestionBank(DEFINITION)
+    scores = bank.score_matrix(np.array([[5, 1, 4], [2, 5, 0]]))
+
+    assert scores[0].tolist() == [5.0, 5.0, 4.0, 2.0, 0.0, 0.0]
+    assert scores[1].tolist() == [2.0, 1.0, 0.0, 0.0, 0.0, 0.0]
+
+
+def test_unanswered_reverse_items_score_zero():
+    bank = QuestionBank(DEFINITION)
+
+    assert bank.score_matrix(np.zeros(3))[0].sum() == 0
+    assert bank.score([{'question_number': 2, 'answer_value': 2}])['investigative'] == 4
+
+
+def test_bank_rejects_empty_and_unknown_traits():
+    with pytest.raises(ValueError):
+        QuestionBank({'version': 'empty', 'questions': []})
+    with pytest.raises(ValueError):
+        QuestionBank({'version': 'bad', 'questions': [{'question': 'q', 'weights': {'curious': 1}}]})
+
+
+@pytest.fixture
+def restore_banks():
+    yield
+    load_question_banks()
+
+
+def test_load_question_banks_reads_every_version(tmp_path, restore_banks):
+    (tmp_path / 'a.json').write_text(json.dumps(DEFINITION))
+    (tmp_path / 'b.json').write_text(json.dumps(dict(DEFINITION, version='t2')))
+    banks = load_question_banks(str(tmp_path))
+
+    assert sorted(banks) == ['t1', 't2']
+    assert [q['id'] for q in banks['t1'].questions] == ['R1', 'I1', 'AS1']
+    assert banks['t1'].questions[2]['riasec_type'] == 'artistic'
+
+    (tmp_path / 'c.json').write_text(json.dumps(DEFINITION))
+    with pytest.raises(ValueError):
+        load_question_banks(str(tmp_path))
+
+
+def test_score_vectors_accept_letters_and_names():
+    vector = scores_to_vector({'R': 3, 'investigative': '2', 'X': 9})
+
+    assert vector.tolist() == [3.0, 2.0, 0.0, 0.0, 0.0, 0.0]
+    assert scores_to_dict(np.array([3.0, 2.5, 0, 0, 0, 0]))['investigative'] == 2.5
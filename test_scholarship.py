@@ -0,0 +1,69 @@
+"""
+Scholarship route tests
+Recommendations scored against eligibility course streams
+"""
+
+import copy
+
+from flask import Flask
+
+import services.scholarship as scholarship
+
+
+SCHOLARSHIPS = [
+    {
+        'scholarship_id': 'ENG-1',
+        'scholarship_name': 'Engineering Merit Award',
+        'min_cgpa': 3.0,
+        'eligibility_criteria': {'course_stream': ['Engineering', 'Technology']},
+        'keyword_traits': ['R']
+    },
+    {
+        'scholarship_id': 'OPEN-1',
+        'scholarship_name': 'Open Award',
+        'eligibility_criteria': {'course_stream': None}
+    }
+]
+
+
+class FakeCollection:
+    def find(self, query=None, projection=None):
+        return copy.deepcopy(SCHOLARSHIPS)
+
+
+def make_client(monkeypatch):
+    monkeypatch.setattr(scholarship, 'get_collection', lambda name: FakeCollection())
+    app = Flask(__name__)
+    app.register_blueprint(scholarship.scholarship_bp, url_prefix='/api/scholarship')
+    return app.test_client()
+
+
+def test_recommend_scores_field_of_study(monkeypatch):
+    client = make_client(monkeypatch)
+    response = client.post('/api/scholarship/recommend', json={
+        'riasec_types': 'IE',
+        'cgpa': 3.5,
+        'income_level': 'low',
+        'location': 'India',
+        'field_of_study': 'Engineering'
+    })
+
+    assert response.status_code == 200
+    recommendations = {r['scholarship_id']: r['relevance_score'] for r in response.get_json()['recommendations']}
+    assert recommendations['ENG-1'] == recommendations['OPEN-1'] + 20
+
+
+def test_recommend_accepts_missing_field_of_study(monkeypatch):
+    client = make_client(monkeypatch)
+    response = client.post('/api/scholarship/recommend', json={'riasec_types': 'R', 'field_of_study': None})
+
+    assert response.status_code == 200
+
+
+def test_recommend_hides_keyword_traits(monkeypatch):
+    client = make_client(monkeypatch)
+    recommendations = client.post('/api/scholarship/recommend', json={'riasec_types': 'R'}).get_json()['recommendations']
+
+    assert recommendations[0]['scholarship_id'] == 'ENG-1'
+    assert recommendations[0]['match_reasons'][0] == 'Field matches your interests'
+    assert all('keyword_traits' not in r for r in recommendations)
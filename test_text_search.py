@@ -0,0 +1,86 @@
+"""
+Text search tests
+Trigram ranking, prefix typeahead and spelling correction
+"""
+
+from services.text_search import DeletionDictionary, PrefixIndex, TrigramIndex, edit_distance, trigrams
+
+
+COLLEGES = [
+    {'College_Name': 'Government Medical College Jammu', 'Location_City': 'Jammu'},
+    {'College_Name': 'University of Kashmir', 'Location_City': 'Srinagar'},
+    {'College_Name': 'Government College of Engineering', 'Location_City': 'Jammu'},
+    {'College_Name': 'Islamic University of Science', 'Location_City': 'Awantipora'}
+]
+
+
+def make_trigram_index():
+    return TrigramIndex({'College_Name': 1.0, 'Location_City': 0.5}).build(COLLEGES)
+
+
+def test_trigrams_pad_each_word():
+    assert trigrams('Ab') == {'  a', ' ab', 'ab '}
+    assert trigrams('') == set()
+
+
+def test_trigram_search_ranks_best_match_first():
+    results = make_trigram_index().search('kashmir universty', limit=2)
+
+    assert results[0]['document'] is COLLEGES[1]
+    assert results[0]['matched_field'] == 'College_Name'
+    assert len(results) <= 2
+    assert [r['score'] for r in results] == sorted((r['score'] for r in results), reverse=True)
+
+
+def test_trigram_search_reports_best_field_and_min_score():
+    index = make_trigram_index()
+    results = index.search('srinagar', min_score=0.1)
+
+    assert [r['document'] for r in results] == [COLLEGES[1]]
+    assert results[0]['matched_field'] == 'Location_City'
+    assert index.search('zzzz') == []
+    assert index.search('kashmir', limit=0) == []
+
+
+def test_trigram_search_breaks_ties_by_position():
+    documents = [{'College_Name': 'Degree College'} for _ in range(3)]
+    results = TrigramIndex({'College_Name': 1.0}).build(documents).search('degree college', limit=2)
+
+    assert [r['document'] for r in results] == documents[:2]
+    assert results[0]['score'] == results[1]['score'] == 1.0
+
+
+def test_prefix_index_prefers_name_starts():
+    index = PrefixIndex().build((college['College_Name'], i) for i, college in enumerate(COLLEGES))
+
+    assert index.suggest('gov') == [2, 0]
+    assert index.suggest('uni') == [1, 3]
+    assert index.suggest('kash') == [1]
+    assert index.suggest('gov', limit=1) == [2]
+    assert index.suggest('') == []
+
+
+def test_edit_distance_counts_transpositions_and_stops_early():
+    assert edit_distance('kashmir', 'kashmir', 2) == 0
+    assert edit_distance('kahsmir', 'kashmir', 2) == 1
+    assert edit_distance('kashmr', 'kashmir', 2) == 1
+    assert edit_distance('jammu', 'srinagar', 2) == 3
+    assert edit_distance('ab', 'abcdef', 2) == 3
+
+
+def test_deletion_dictionary_finds_closest_frequent_words():
+    dictionary = DeletionDictionary().build(college['College_Name'] for college in COLLEGES)
+
+    assert dictionary.lookup('Kashmir') == [{'word': 'kashmir', 'distance': 0, 'count': 1}]
+    assert dictionary.lookup('goverment')[0] == {'word': 'government', 'distance': 1, 'count': 2}
+    assert dictionary.lookup('unversity')[0]['word'] == 'university'
+    assert dictionary.lookup('xyzzy') == []
+    assert dictionary.allowed_distance('med') == 0
+
+
+def test_deletion_dictionary_corrects_only_unknown_words():
+    dictionary = DeletionDictionary().build(college['College_Name'] for college in COLLEGES)
+    corrected, corrections = dictionary.correct('Goverment Medcal college')
+
+    assert corrected == 'government medical college'
+    assert [c['term'] for c in corrections] == ['goverment', 'medcal']